@@ -1,15 +1,25 @@
 import streamlit as st
-from page_coach import page_coach
-from page_athlete import page_athlete
-import pandas as pd
 import os
 import sys
-from utils.calculs import generer_identifiant
+from utils.auth import authentifier, creer_compte_coach, IDENTIFIANT_COACH, VARIABLE_MDP_COACH
+from utils.profilage import nouvelle_execution, enregistrer
+import time
 
 sys.path.append(os.path.abspath(os.path.dirname(__file__)))
 
 st.set_page_config(page_title="Plateforme Entraînement", layout="wide")
 
+# Mesures de temps rattachées à ce rerun (voir utils.profilage)
+nouvelle_execution()
+debut_rerun = time.perf_counter()
+
+# --- Démarrage : compte coach créé une seule fois par processus serveur ---
+@st.cache_resource
+def initialiser_compte_coach():
+    return creer_compte_coach()
+
+compte_coach = initialiser_compte_coach()
+
 # --- fonction accueil ---
 def afficher_page_accueil():
     st.title("🏃🏽 Plateforme d'entraînement personnalisée 🚴🏼")
@@ -32,17 +42,19 @@ def afficher_page_accueil():
     """)
     st.info("🔐 Toutes les données sont confidentielles et accessibles uniquement via ID et mot de passe.")
 
-# --- Chargement des utilisateurs
-USERS_FILE = "data/users.csv"
+# --- Session : l'utilisateur connecté est mémorisé, les reruns suivants ne relisent pas users.csv
+def connexion(role):
+    """Nom de l'utilisateur connecté avec ce rôle dans la session, sinon None"""
+    session = st.session_state.get("connexion")
+    return session["nom"] if session and session["role"] == role else None
 
-@st.cache_data
-def load_users():
-    if os.path.exists(USERS_FILE):
-        return pd.read_csv(USERS_FILE)
-    return pd.DataFrame(columns=["Nom", "Mot de passe"])
+def ouvrir_session(nom, role):
+    st.session_state["connexion"] = {"nom": nom, "role": role}
 
-users_df = load_users()
-usernames = users_df["Nom"].tolist()
+def bouton_deconnexion():
+    if st.sidebar.button("🚪 Se déconnecter"):
+        del st.session_state["connexion"]
+        st.rerun()
 
 # --- Sidebar avec sélection espace ---
 espace = st.sidebar.selectbox("🔐 Choisir un espace :", ["Accueil", "Athlète", "Coach"])
@@ -50,9 +62,20 @@ if espace == "Accueil":
     afficher_page_accueil()
 
 if espace == "Coach":
-    mdp = st.sidebar.text_input("Mot de passe coach", type="password")
-    if mdp == "coach123":  # 🔒 À personnaliser ou sécuriser via fichier
+    if connexion("coach") is None and not compte_coach:
+        st.sidebar.error(f"Aucun compte coach : définir {VARIABLE_MDP_COACH} puis relancer l'application")
+    elif connexion("coach") is None:
+        mdp = st.sidebar.text_input("Mot de passe coach", type="password")
+        if mdp != "":
+            nom = authentifier(IDENTIFIANT_COACH, mdp, role="coach")
+            if nom is not None:
+                ouvrir_session(nom, "coach")
+            else:
+                st.sidebar.error("Mot de passe incorrect")
+
+    if connexion("coach") is not None:
         st.sidebar.success("Accès coach validé ✅")
+        bouton_deconnexion()
         # Choix du profil athlète à afficher (optionnel)
         st.sidebar.markdown("---")
         #st.sidebar.markdown("👁️ Voir l'espace d'un athlète :")
@@ -60,28 +83,29 @@ if espace == "Coach":
         #athlète_choisi = st.sidebar.selectbox("Athlète à consulter", athlètes)
         #Page_athlete(nom_athlete=athlète_choisi)
         st.header("👨‍🏫 Espace Coach")
+        # Pages importées à la demande : l'accueil ne charge pas les bibliothèques de graphiques
+        from page_coach import page_coach
         page_coach()
-    elif mdp != "":
-        st.sidebar.error("Mot de passe incorrect")
 
 elif espace == "Athlète":
-    st.sidebar.subheader("Connexion Athlète")
-    identifiant = st.sidebar.text_input("Identifiant (ex : prenomnom)")
-    mdp = st.sidebar.text_input("Mot de passe", type="password")
-
-    # Normalisation (au cas où l'utilisateur met des majuscules ou accents)
-    identifiant = generer_identifiant(identifiant)
-
-    if identifiant and mdp:
-        utilisateur = users_df[
-            (users_df["Identifiant"] == identifiant) &
-            (users_df["Mot de passe"] == mdp) &
-            (users_df["Role"] == "athlete")
-        ]
-
-        if not utilisateur.empty:
-            nom_affiché = utilisateur["Nom"].values[0]
-            st.sidebar.success(f"Bienvenue {nom_affiché} !")
-            page_athlete(nom_athlete=nom_affiché)
-        else:
-            st.sidebar.error("Identifiant ou mot de passe incorrect")
+    if connexion("athlete") is None:
+        st.sidebar.subheader("Connexion Athlète")
+        identifiant = st.sidebar.text_input("Identifiant (ex : prenomnom)")
+        mdp = st.sidebar.text_input("Mot de passe", type="password")
+
+        if identifiant and mdp:
+            # Identifiant normalisé (majuscules, accents) dans authentifier
+            nom = authentifier(identifiant, mdp, role="athlete")
+            if nom is not None:
+                ouvrir_session(nom, "athlete")
+            else:
+                st.sidebar.error("Identifiant ou mot de passe incorrect")
+
+    nom_affiché = connexion("athlete")
+    if nom_affiché is not None:
+        st.sidebar.success(f"Bienvenue {nom_affiché} !")
+        bouton_deconnexion()
+        from page_athlete import page_athlete
+        page_athlete(nom_athlete=nom_affiché)
+
+enregistrer(f"rerun {espace}", (time.perf_counter() - debut_rerun) * 1000)
@@ -0,0 +1,22 @@
+import io
+
+import pytest
+
+from generer_donnees import generer_activite
+from utils.activites import FORMATS, analyser_activite
+from utils.zones import seuils_athlete
+
+ATHLETE = {"Date de naissance": "1990-01-01", "Allure 10km": 4.5}
+
+
+@pytest.mark.parametrize("format_fichier", FORMATS)
+def bench_analyser_activite_4h(benchmark, format_fichier):
+    """Fichier de 4 h à 1 Hz : lecture en flux et temps par zone"""
+    contenu = generer_activite(format_fichier)
+    seuils_fc, seuils_vitesse = seuils_athlete(ATHLETE)
+    minutes = benchmark.pedantic(
+        lambda: analyser_activite(io.BytesIO(contenu), f"activite.{format_fichier}", seuils_fc, seuils_vitesse),
+        rounds=3,
+    )
+    assert minutes.sum() == pytest.approx(240, abs=0.1)
+
@@ -0,0 +1,48 @@
+from utils.agregats import mettre_a_jour_agregats, reconstruire_agregats
+from generer_donnees import mot_de_passe
+from utils.auth import authentifier, index_identifiants
+from utils.io import load_csv
+from utils.journal import journaliser_feedback
+from utils.vue_athlete import charger_vue_athlete
+
+
+def bench_connexion_athlete(benchmark, donnees):
+    """Recherche dans l'index puis vérification de l'empreinte (itérations réduites)"""
+    users = load_csv(donnees["users"])
+    i = len(users) - 1
+    nom = benchmark(authentifier, users["Identifiant"].iloc[i], mot_de_passe(i), "athlete", donnees["users"])
+    assert nom == users["Nom"].iloc[i]
+
+
+def bench_index_identifiants(benchmark, donnees):
+    index_identifiants(donnees["users"])
+    index = benchmark(index_identifiants, donnees["users"])
+    assert len(index) > 1
+
+
+def bench_enregistrer_feedback(benchmark, donnees):
+    """Journalisation d'un feedback puis mise à jour de la semaine dans la vue"""
+    reconstruire_agregats(donnees)
+    ligne = load_csv(donnees["feedbacks"]).iloc[-1].to_dict()
+
+    def enregistrer():
+        journaliser_feedback(ligne, donnees["journal"])
+        mettre_a_jour_agregats(ligne["Athlete"], [ligne["Semaine"]], donnees)
+
+    benchmark.pedantic(enregistrer, rounds=20)
+
+
+def bench_vue_athlete_semaine(benchmark, donnees):
+    """Séances et feedbacks d'une semaine lus dans le modèle de vue (index déjà construits)"""
+    fichiers = {"athletes": donnees["athletes"], "assignations": donnees["assignations"],
+                "seances": donnees["seances"], "feedbacks": donnees["feedbacks"], "journal": donnees["journal"]}
+    nom = load_csv(donnees["athletes"])["Nom"].iloc[-1]
+    charger_vue_athlete(nom, fichiers)
+
+    def afficher_semaine():
+        vue = charger_vue_athlete(nom, fichiers)
+        lundi = vue.semaines[-1]
+        return [(vue.seances.get(s), vue.feedback(s, lundi)) for s in vue.seances_par_semaine[lundi]]
+
+    seances = benchmark(afficher_semaine)
+    assert seances and all(s is not None for s, _ in seances)
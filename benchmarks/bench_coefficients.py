@@ -0,0 +1,16 @@
+from generer_donnees import generer_seances
+from utils.modele import construire_seances
+from utils.calculs import table_blocs
+from utils.coefficients import recalculer_charges
+
+COEFFICIENTS = {1: 1, 2: 1.5, 3: 3, 4: 5, 5: 7, 6: 9, 7: 12}
+
+
+def bench_recalculer_charges_10k(benchmark):
+    """Re-chiffrage d'une bibliothèque d'environ 10 000 séances avec de nouveaux coefficients"""
+    seances = generer_seances(nb_variantes=1700)
+    blocs = table_blocs(construire_seances(seances))
+    recalculees = benchmark(recalculer_charges, seances, blocs, COEFFICIENTS)
+    assert len(recalculees) == len(seances)
+    assert (recalculees["Charge totale"] != seances["Charge totale"]).any()
+
@@ -0,0 +1,67 @@
+"""
+Temps de démarrage de app.py, mesuré avec `python -X importtime` dans un
+processus neuf : seuls les imports de premier niveau d'app.py sont chargés,
+comme lors de l'affichage de la page d'accueil.
+"""
+import ast
+import os
+import subprocess
+import sys
+
+RACINE = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Modules qui ne doivent être chargés qu'à l'ouverture d'un espace (sauf si
+# streamlit lui-même les importe déjà)
+IMPORTS_DIFFERES = [
+    "page_coach", "page_athlete", "plotly.express", "plotly.graph_objects", "altair", "streamlit.components.v1",
+]
+# Budget optionnel (ms) pour les imports de démarrage, ex. PLATEFORME_BUDGET_DEMARRAGE_MS=1500
+BUDGET_MS = os.environ.get("PLATEFORME_BUDGET_DEMARRAGE_MS")
+
+
+def imports_premier_niveau(chemin):
+    """Instructions d'import au niveau module d'un script (hors fonctions et branches)"""
+    with open(chemin, encoding="utf-8") as f:
+        arbre = ast.parse(f.read())
+    return [ast.unparse(n) for n in arbre.body if isinstance(n, (ast.Import, ast.ImportFrom))]
+
+
+def importtime(code):
+    """Exécute `code` avec -X importtime ; renvoie {module: cumul en µs}"""
+    sortie = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=RACINE, capture_output=True, text=True, check=True,
+    ).stderr
+    modules = {}
+    for ligne in sortie.splitlines():
+        if not ligne.startswith("import time:") or "|" not in ligne:
+            continue
+        _, cumul, nom = (p.strip() for p in ligne[len("import time:"):].split("|"))
+        if cumul.isdigit():
+            modules[nom] = int(cumul)
+    return modules
+
+
+def _charge(modules, prefixe):
+    return any(m == prefixe or m.startswith(prefixe + ".") for m in modules)
+
+
+def bench_demarrage_accueil(benchmark):
+    code = "\n".join(imports_premier_niveau(os.path.join(RACINE, "app.py")))
+    modules = benchmark.pedantic(importtime, args=(code,), rounds=3, warmup_rounds=1)
+
+    deja_streamlit = importtime("import streamlit")
+    charges = [m for m in IMPORTS_DIFFERES if _charge(modules, m) and not _charge(deja_streamlit, m)]
+    assert not charges, f"Imports chargés au démarrage alors qu'ils devraient être différés : {charges}"
+    if BUDGET_MS:
+        total_ms = sum(us for nom, us in modules.items() if "." not in nom) / 1000
+        assert total_ms <= float(BUDGET_MS), f"Démarrage : {total_ms:.0f} ms > budget {BUDGET_MS} ms"
+
+
+def bench_import_espace_coach(benchmark):
+    """Coût différé payé à l'ouverture de l'espace coach (premier graphique compris)"""
+    modules = benchmark.pedantic(
+        importtime, args=("import streamlit\nimport page_coach\nimport altair\nimport plotly.express",),
+        rounds=3, warmup_rounds=1,
+    )
+    assert "page_coach" in modules
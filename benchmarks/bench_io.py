@@ -0,0 +1,17 @@
+from utils.io import load_csv, save_csv
+
+
+def bench_load_csv_froid(benchmark, donnees, cache_vide):
+    df = benchmark.pedantic(load_csv, args=(donnees["feedbacks"],), setup=cache_vide, rounds=5)
+    assert not df.empty
+
+
+def bench_load_csv_cache(benchmark, donnees):
+    load_csv(donnees["assignations"])
+    df = benchmark(load_csv, donnees["assignations"])
+    assert not df.empty
+
+
+def bench_save_csv(benchmark, donnees, tmp_path):
+    df = load_csv(donnees["assignations"])
+    benchmark.pedantic(save_csv, args=(df, str(tmp_path / "assignments.csv")), rounds=5)
@@ -0,0 +1,56 @@
+import itertools
+
+import pandas as pd
+
+from generer_donnees import generer_seances
+from utils.agregats import reconstruire_agregats
+from utils.io import load_csv
+from utils.modele import construire_seances
+from utils.periodisation import courbe_charge, generer_periodisation
+from utils.calculs import charger_assignations
+from utils.plans import appliquer_modele, editer_assignations
+
+
+def bench_appliquer_plan(benchmark, donnees):
+    """Plan de 12 semaines (4 séances/semaine) appliqué à 40 athlètes, sur une période libre à chaque tour"""
+    reconstruire_agregats(donnees)
+    athletes = load_csv(donnees["athletes"])["Nom"].head(40).tolist()
+    noms = load_csv(donnees["seances"])["Nom"].tolist()
+    modele = pd.DataFrame({
+        "Modele": "Prépa",
+        "Decalage semaine": [s for s in range(12) for _ in range(4)],
+        "Seance": [noms[(s + k) % len(noms)] for s in range(12) for k in range(4)],
+    })
+    departs = itertools.count(1)
+
+    def prochain_depart():
+        return (modele, athletes, pd.Timestamp.today() + pd.Timedelta(weeks=12 * next(departs)),
+                donnees["assignations"], donnees), {}
+
+    ajoutees, ignorees = benchmark.pedantic(appliquer_modele, setup=prochain_depart, rounds=5)
+    assert (ajoutees, ignorees) == (12 * 4 * len(athletes), 0)
+
+
+def bench_periodisation_16_semaines(benchmark):
+    """Plan de 16 semaines (3 montées, 1 décharge), 5 séances par semaine, bibliothèque de 300 séances"""
+    seances = construire_seances(generer_seances(nb_variantes=50))
+    cibles = courbe_charge(1500, 16)
+    jours = ["Lundi", "Mercredi", "Jeudi", "Samedi", "Dimanche"]
+    plan = benchmark(generer_periodisation, seances, cibles, jours)
+    assert (plan.groupby("Decalage semaine").size() == len(jours)).all()
+    assert plan["Decalage semaine"].nunique() == 16
+
+
+def bench_dupliquer_selection(benchmark, donnees):
+    """200 assignations d'un athlète dupliquées vers une nouvelle semaine à chaque tour, en un lot"""
+    reconstruire_agregats(donnees)
+    assignations = charger_assignations(donnees["assignations"])
+    selection = assignations[assignations["Athlete"] == assignations["Athlete"].iloc[0]].head(200)
+    cibles = itertools.count(1)
+
+    def prochaine_cible():
+        return (selection, "Dupliquer", pd.Timestamp.today() - pd.Timedelta(weeks=300 + next(cibles)),
+                donnees["assignations"], donnees), {}
+
+    supprimees, ajoutees = benchmark.pedantic(editer_assignations, setup=prochaine_cible, rounds=5)
+    assert supprimees == 0 and ajoutees == selection["Seance"].nunique()
@@ -0,0 +1,25 @@
+import pytest
+
+from generer_donnees import generer_seances
+from utils.modele import construire_seances
+from utils.recherche import IndexSeances
+
+
+@pytest.fixture(scope="module")
+def index_10k():
+    """Bibliothèque d'environ 10 000 séances"""
+    return IndexSeances(construire_seances(generer_seances(nb_variantes=1700)))
+
+
+def bench_construire_index(benchmark):
+    seances = construire_seances(generer_seances(nb_variantes=1700))
+    index = benchmark.pedantic(IndexSeances, args=(seances,), rounds=3)
+    assert len(index.noms) == len(seances)
+
+
+@pytest.mark.parametrize("requete", ["seu", "allure seuil", "échauf", "fractionne vite"],
+                         ids=["prefixe", "deux mots", "accents", "sans accents"])
+def bench_rechercher(benchmark, index_10k, requete):
+    """Recherche par préfixes combinée aux bornes de durée et de charge"""
+    trouvees = benchmark(index_10k.rechercher, requete, (30, 240), (100, 1500))
+    assert len(trouvees) > 0
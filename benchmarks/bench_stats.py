@@ -0,0 +1,22 @@
+from utils.agregats import calculer_agregats, lire_agregats, reconstruire_agregats
+from utils.calculs import charger_assignations
+from utils.journal import lire_feedbacks
+from utils.modele import charger_tableau_seances
+
+
+def bench_calculer_agregats(benchmark, donnees):
+    entrees = (
+        charger_assignations(donnees["assignations"]),
+        lire_feedbacks(donnees["feedbacks"], donnees["journal"]),
+        charger_tableau_seances(donnees["seances"]),
+    )
+    agregats = benchmark(calculer_agregats, *entrees)
+    assert not agregats.empty
+
+
+def bench_lire_agregats_athlete(benchmark, donnees):
+    """Statistiques hebdomadaires d'un athlète, lues dans la vue matérialisée"""
+    reconstruire_agregats(donnees)
+    athlete = charger_assignations(donnees["assignations"])["Athlete"].iloc[0]
+    agregats = benchmark(lire_agregats, athlete, donnees)
+    assert not agregats.empty
@@ -0,0 +1,31 @@
+from datetime import date
+
+from utils.io import load_csv
+from utils.calculs import charger_assignations, charger_blocs_long, semaines_glissantes, temps_par_zone
+from utils.zones import calculer_tables_allures
+
+
+def _entrees(donnees):
+    assignations = charger_assignations(donnees["assignations"])
+    blocs_long = charger_blocs_long(donnees["seances"])
+    return assignations, blocs_long, semaines_glissantes(date.today(), 6)
+
+
+def bench_temps_par_zone_athlete(benchmark, donnees):
+    assignations, blocs_long, semaines = _entrees(donnees)
+    athlete = assignations["Athlete"].iloc[0]
+    durees = benchmark(temps_par_zone, assignations, blocs_long, semaines, [athlete])
+    assert len(durees) == 6
+
+
+def bench_temps_par_zone_tous(benchmark, donnees):
+    assignations, blocs_long, semaines = _entrees(donnees)
+    durees = benchmark(temps_par_zone, assignations, blocs_long, semaines)
+    assert not durees.empty
+
+
+def bench_tables_allures(benchmark, donnees):
+    """Prédictions de Riegel et plages d'allure des 7 zones, tous les athlètes d'un coup"""
+    athletes = load_csv(donnees["athletes"])
+    table = benchmark(calculer_tables_allures, athletes)
+    assert table["Zone 4"].str.endswith("/km").all()
@@ -0,0 +1,45 @@
+"""
+Données synthétiques partagées par les benchmarks.
+
+    pip install -r requirements-dev.txt
+    pytest benchmarks
+    PLATEFORME_BENCH_ATHLETES=1000 PLATEFORME_BENCH_SEMAINES=104 pytest benchmarks
+
+Pour comparer deux versions : --benchmark-autosave puis --benchmark-compare.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from generer_donnees import generer  # noqa: E402
+from utils.io import vider_cache  # noqa: E402
+
+NB_ATHLETES = int(os.environ.get("PLATEFORME_BENCH_ATHLETES", "200"))
+NB_SEMAINES = int(os.environ.get("PLATEFORME_BENCH_SEMAINES", "52"))
+SEANCES_PAR_SEMAINE = int(os.environ.get("PLATEFORME_BENCH_SEANCES", "5"))
+
+
+@pytest.fixture(scope="session")
+def donnees(tmp_path_factory):
+    """Chemins des fichiers générés (mêmes clés que utils.agregats.FICHIERS, plus athletes et users)"""
+    dossier = tmp_path_factory.mktemp("donnees")
+    fichiers = generer(str(dossier), NB_ATHLETES, NB_SEMAINES, SEANCES_PAR_SEMAINE)
+    return {
+        "athletes": fichiers["athletes"],
+        "users": fichiers["users"],
+        "seances": fichiers["seances_struct"],
+        "assignations": fichiers["assignments"],
+        "feedbacks": fichiers["feedbacks"],
+        "journal": str(dossier / "feedbacks_journal.csv"),
+        "agregats": str(dossier / "charges_hebdo.csv"),
+    }
+
+
+@pytest.fixture
+def cache_vide():
+    """Mesure à froid : vide le cache mémoire partagé avant chaque tour"""
+    vider_cache()
+    return vider_cache
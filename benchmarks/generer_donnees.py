@@ -0,0 +1,213 @@
+"""
+Génère un jeu de données synthétique au format de data/ pour les benchmarks.
+
+    python benchmarks/generer_donnees.py --sortie /tmp/donnees --athletes 1000 --semaines 104
+
+Produit athletes.csv, users.csv, seances_struct.csv, assignments.csv et
+feedbacks.csv. Avec les valeurs par défaut (1000 athlètes, 104 semaines,
+5 séances par semaine, 90 % réalisées), on obtient environ 470k feedbacks ;
+--seances-par-semaine 10 en donne environ 940k.
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.calculs import generer_identifiant, formater_semaine  # noqa: E402
+from utils.modele import COEFFICIENTS_ZONE  # noqa: E402
+from utils.auth import hacher_mot_de_passe  # noqa: E402
+
+PRENOMS = ["Camille", "Antoine", "Léa", "Hugo", "Chloé", "Lucas", "Manon", "Théo", "Inès", "Jules",
+           "Élodie", "Mathis", "Zoé", "Nathan", "Jade", "Louis", "Clara", "Gabriel", "Anaïs", "Raphaël"]
+NOMS = ["Gosset", "Aurousseau", "Martin", "Bernard", "Dubois", "Thomas", "Robert", "Richard", "Petit",
+        "Durand", "Leroy", "Moreau", "Simon", "Laurent", "Lefèvre", "Michel", "Garcia", "David", "Bertrand"]
+
+# Itérations PBKDF2 réduites : générer 1000 comptes doit rester rapide
+ITERATIONS_BENCH = 1000
+
+
+def mot_de_passe(i):
+    """Mot de passe en clair du i-ème athlète généré"""
+    return f"mdp{i:06d}"
+
+
+# (type, durée min, répétitions, zone, description) : gabarits de séances
+GABARITS = {
+    "Sortie longue": [("Allure continue", None, 1, 2, "Respiration nasale ou discussion facile")],
+    "Footing": [("Allure continue", None, 1, 1, "Très facile")],
+    "Seuil": [("Echauffement", 20, 1, 2, ""), ("Intervalle", None, 3, 4, "Allure seuil"),
+              ("Retour au calme", 10, 1, 1, "")],
+    "Fractionné court": [("Echauffement", 20, 1, 2, ""), ("Intervalle", 1, None, 6, "Vite"),
+                         ("Récupération", 1, None, 1, "Trot"), ("Retour au calme", 10, 1, 1, "")],
+    "VMA": [("Echauffement", 20, 1, 2, ""), ("Intervalle", 3, None, 5, "Allure VMA"),
+            ("Retour au calme", 10, 1, 1, "")],
+    "Tempo": [("Echauffement", 15, 1, 2, ""), ("Allure continue", None, 1, 3, "Allure marathon"),
+              ("Retour au calme", 10, 1, 1, "")],
+}
+
+
+def generer_seances(nb_variantes=10):
+    """Bibliothèque de séances structurées (Nom, Blocs, Charge totale, Volume total)"""
+    lignes = []
+    for base, gabarit in GABARITS.items():
+        for v in range(1, nb_variantes + 1):
+            nom = f"{base} {v}"
+            blocs = []
+            for type_, duree, reps, zone, description in gabarit:
+                duree = duree if duree is not None else 5 * (v + 3)
+                reps = reps if reps is not None else 4 + v
+                blocs.append({
+                    "Nom de la seance": nom, "Type": type_, "Durée": duree, "Répétitions": reps,
+                    "Zone": f"Zone {zone}", "Description": description, "Zone_num": zone,
+                    "Coeff zone": f"{COEFFICIENTS_ZONE[zone]:.2f}",
+                    "Charge": duree * reps * COEFFICIENTS_ZONE[zone], "Volume total": duree * reps,
+                })
+            lignes.append({
+                "Nom": nom,
+                "Blocs": json.dumps(blocs),
+                "Charge totale": sum(b["Charge"] for b in blocs),
+                "Volume total": sum(b["Volume total"] for b in blocs),
+            })
+    return pd.DataFrame(lignes)
+
+
+def generer_athletes(nb_athletes, rng):
+    """athletes.csv et users.csv (noms uniques, identifiants dérivés du nom)"""
+    prenoms = rng.choice(PRENOMS, nb_athletes)
+    noms = rng.choice(NOMS, nb_athletes)
+    noms_complets = [f"{p} {n.upper()} {i}" for i, (p, n) in enumerate(zip(prenoms, noms))]
+    allure_10 = np.round(rng.uniform(3.5, 7.0, nb_athletes), 2)
+    naissance = pd.Timestamp("1965-01-01") + pd.to_timedelta(rng.integers(0, 40 * 365, nb_athletes), unit="D")
+    athletes = pd.DataFrame({
+        "Nom": noms_complets,
+        "Sexe": rng.choice(["Femme", "Homme"], nb_athletes),
+        "Amenorrhee": False,
+        "Date de naissance": naissance.strftime("%Y-%m-%d"),
+        "Sports": rng.choice(["Course à pied", "Trail", "Triathlon", "Course à pied, Musculation"], nb_athletes),
+        "Objectif": rng.choice(["10 km", "Semi-marathon", "Marathon", "Trail long"], nb_athletes),
+        "Record 5km": np.round(allure_10 * 5 * 0.96),
+        "Record 10km": np.round(allure_10 * 10),
+        "Record Semi": np.round(allure_10 * 21.1 * 1.05),
+        "Record Marathon": np.round(allure_10 * 42.195 * 1.1),
+        "Allure 5km": np.round(allure_10 * 0.96, 2),
+        "Allure 10km": allure_10,
+        "Allure Semi": np.round(allure_10 * 1.05, 2),
+        "Allure Marathon": np.round(allure_10 * 1.1, 2),
+    })
+    users = pd.DataFrame({
+        "Nom": noms_complets,
+        "Mot de passe": [hacher_mot_de_passe(mot_de_passe(i), ITERATIONS_BENCH) for i in range(nb_athletes)],
+        "Role": "athlete",
+        "Identifiant": [generer_identifiant(n) for n in noms_complets],
+    })
+    return athletes, users
+
+
+def generer_plan(athletes, seances, nb_semaines, seances_par_semaine, taux_realisation, rng, fin=None):
+    """assignments.csv et feedbacks.csv sur les `nb_semaines` semaines précédant `fin`"""
+    fin = fin or date.today()
+    dernier_lundi = pd.Timestamp(fin - timedelta(days=fin.weekday()))
+    lundis = pd.DatetimeIndex([dernier_lundi - pd.Timedelta(weeks=k) for k in range(nb_semaines - 1, -1, -1)])
+
+    n = len(athletes) * nb_semaines * seances_par_semaine
+    idx_athlete = np.repeat(np.arange(len(athletes)), nb_semaines * seances_par_semaine)
+    idx_semaine = np.tile(np.repeat(np.arange(nb_semaines), seances_par_semaine), len(athletes))
+    lundi = lundis[idx_semaine]
+    libelles = pd.Series(lundis.map(formater_semaine), index=lundis)
+    assignations = pd.DataFrame({
+        "Athlete": athletes["Nom"].to_numpy()[idx_athlete],
+        "Seance": rng.choice(seances["Nom"].to_numpy(), n),
+        "Semaine": libelles.reindex(lundi).to_numpy(),
+        "Lundi": lundi.strftime("%Y-%m-%d"),
+    })
+
+    faits = rng.random(n) < taux_realisation
+    jour = lundi[faits] + pd.to_timedelta(rng.integers(0, 7, faits.sum()), unit="D") \
+        + pd.to_timedelta(rng.integers(6 * 3600, 21 * 3600, faits.sum()), unit="s")
+    fb = assignations[faits].reset_index(drop=True)
+    feedbacks = pd.DataFrame({
+        "Athlete": fb["Athlete"],
+        "Seance": fb["Seance"],
+        "Semaine": fb["Lundi"],
+        "Date seance": jour.strftime("%Y-%m-%d %H:%M:%S"),
+        "Effectuee": np.where(rng.random(len(fb)) < 0.95, "Oui", "Non"),
+        "RPE": rng.integers(1, 11, len(fb)),
+        "Commentaire": rng.choice(["", "RAS", "Bonnes sensations", "Jambes lourdes", "Chaud"], len(fb)),
+        "Phase menstruelle": "",
+        "Symptomes": "",
+        "Glucides (g/h)": 0.0,
+    })
+    return assignations, feedbacks
+
+
+def generer_activite(format_fichier, duree_s=4 * 3600, graine=0):
+    """Fichier d'activité à 1 Hz (octets) : FC et vitesse ondulantes, au format gpx, tcx ou csv"""
+    rng = np.random.default_rng(graine)
+    t = np.arange(duree_s)
+    fc = np.clip(135 + 35 * np.sin(t / 900) + rng.normal(0, 3, duree_s), 80, 200).round()
+    vitesse = 3.2 + 0.6 * np.sin(t / 600)
+    distance = np.cumsum(vitesse)
+    horodatages = (pd.Timestamp("2025-06-18 08:00:00") + pd.to_timedelta(t, unit="s")).strftime("%Y-%m-%dT%H:%M:%SZ")
+    if format_fichier == "csv":
+        lignes = ["timestamp,hr,speed"] + [f"{h},{f:.0f},{v:.3f}" for h, f, v in zip(horodatages, fc, vitesse)]
+        return "\n".join(lignes).encode()
+    if format_fichier == "tcx":
+        points = "".join(
+            f"<Trackpoint><Time>{h}</Time><DistanceMeters>{d:.1f}</DistanceMeters>"
+            f"<HeartRateBpm><Value>{f:.0f}</Value></HeartRateBpm></Trackpoint>"
+            for h, d, f in zip(horodatages, distance, fc)
+        )
+        return ('<?xml version="1.0"?><TrainingCenterDatabase xmlns="http://www.garmin.com/xmlschemas/'
+                'TrainingCenterDatabase/v2"><Activities><Activity><Lap><Track>'
+                f"{points}</Track></Lap></Activity></Activities></TrainingCenterDatabase>").encode()
+    latitudes = 45 + distance / 111_320
+    points = "".join(
+        f'<trkpt lat="{lat:.7f}" lon="5.0"><time>{h}</time><extensions><gpxtpx:TrackPointExtension>'
+        f"<gpxtpx:hr>{f:.0f}</gpxtpx:hr></gpxtpx:TrackPointExtension></extensions></trkpt>"
+        for h, lat, f in zip(horodatages, latitudes, fc)
+    )
+    return ('<?xml version="1.0"?><gpx xmlns="http://www.topografix.com/GPX/1/1" '
+            'xmlns:gpxtpx="http://www.garmin.com/xmlschemas/TrackPointExtension/v1">'
+            f"<trk><trkseg>{points}</trkseg></trk></gpx>").encode()
+
+
+def generer(sortie, nb_athletes=1000, nb_semaines=104, seances_par_semaine=5,
+            taux_realisation=0.9, graine=0, fin=None):
+    """Écrit le jeu de données complet dans `sortie` ; renvoie les chemins des fichiers"""
+    rng = np.random.default_rng(graine)
+    os.makedirs(sortie, exist_ok=True)
+    seances = generer_seances()
+    athletes, users = generer_athletes(nb_athletes, rng)
+    assignations, feedbacks = generer_plan(athletes, seances, nb_semaines, seances_par_semaine,
+                                           taux_realisation, rng, fin)
+    fichiers = {}
+    for nom, df in [("athletes", athletes), ("users", users), ("seances_struct", seances),
+                    ("assignments", assignations), ("feedbacks", feedbacks)]:
+        fichiers[nom] = os.path.join(sortie, f"{nom}.csv")
+        df.to_csv(fichiers[nom], index=False)
+    return fichiers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sortie", default="donnees_bench", help="dossier de sortie")
+    parser.add_argument("--athletes", type=int, default=1000)
+    parser.add_argument("--semaines", type=int, default=104)
+    parser.add_argument("--seances-par-semaine", type=int, default=5)
+    parser.add_argument("--taux-realisation", type=float, default=0.9)
+    parser.add_argument("--graine", type=int, default=0)
+    args = parser.parse_args()
+    fichiers = generer(args.sortie, args.athletes, args.semaines, args.seances_par_semaine,
+                       args.taux_realisation, args.graine)
+    for nom, chemin in fichiers.items():
+        print(f"{nom:>15} : {chemin} ({os.path.getsize(chemin) / 1e6:.1f} Mo)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,41 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import json
 import re
 import time
 from datetime import date,datetime, timedelta
-from utils.io import load_csv, save_csv
-import altair as alt
-from collections import defaultdict
+from utils.io import load_csv, save_csv, inserer_lignes, supprimer_lignes
+from utils.modele import charger_seances, coefficients_configures, charge_bloc, NB_ZONES, CONFIG_ZONES_FILE
+from utils.agregats import (lire_agregats, mettre_a_jour_agregats, reconstruire_agregats,
+                            supprimer_agregats_athlete, charger_vue_ensemble)
 
 from utils.calculs import (
     formater_semaine, format_allure, pretty_allure, calc_allure,
     parse_blocs, calcul_imc, minutes_to_hmin, regrouper_zone, format_blocs,formater_semaine,
-    extraire_date_lundi, evolution_pct, generer_identifiant
+    evolution_pct, generer_identifiant, charger_assignations,
+    charger_blocs_long, charger_risque_acwr,
+    charger_monotonie_contrainte, tableau_monotonie, EMOJI_ZONE
 )
+from utils.affichage import figure_temps_par_zone, couleur_variation
+from utils.profilage import mesurer, mesures_execution, statistiques
+from utils.auth import hacher_mot_de_passe
+from utils.analytics import age, records_allures, charge_planifiee, repartition_zones
+from utils.plans import (MODELES_FILE, ACTIONS, charger_modeles, enregistrer_modele, supprimer_modele,
+                         appliquer_modele, editer_assignations)
+from utils.periodisation import JOURS, courbe_charge, generer_periodisation, resume_periodisation
+from utils.recherche import charger_index_seances
+from utils.zones import tables_allures
+from utils.coefficients import appliquer_coefficients, historique_coefficients
 
 # Fichiers CSV utilisés
 ATHLETES_FILE = "data/athletes.csv"
 SEANCES_STRUCT_FILE = "data/seances_struct.csv"
 ASSIGN_FILE = "data/assignments.csv"
 FEEDBACKS_FILE = "data/feedbacks.csv"
+FEEDBACKS_JOURNAL_FILE = "data/feedbacks_journal.csv"
 ATHLETES_HISTO_FILE = "data/athletes_historique.csv"
 USERS_FILE = "data/users.csv"
+EXTRAS_FILE = "extras_seances.csv"
 
 # --- Fonctions de chargement des données ---
 @st.cache_data
@@ -75,13 +89,11 @@ def page_coach():
             athlete_to_remove = st.selectbox("Sélectionner un athlète à supprimer", athletes["Nom"])
             if st.button("❌ Supprimer l'athlète"):
                 # Suppression dans athletes.csv
-                athletes = athletes[athletes["Nom"] != athlete_to_remove]
-                save_csv(athletes, ATHLETES_FILE)
+                supprimer_lignes({"Nom": athlete_to_remove}, ATHLETES_FILE)
 
                 # Suppression dans users.csv uniquement si rôle == 'athlete'
-                users = load_csv("data/users.csv", ["Nom", "Mot de passe", "Role"])
-                users = users[~((users["Nom"] == athlete_to_remove) & (users["Role"] == "athlete"))]
-                save_csv(users, "data/users.csv")
+                supprimer_lignes({"Nom": athlete_to_remove, "Role": "athlete"}, USERS_FILE)
+                supprimer_agregats_athlete(athlete_to_remove)
 
                 st.success(f"Athlète {athlete_to_remove} supprimé des fichiers athletes.csv et users.csv.")
                 st.rerun()
@@ -142,7 +154,7 @@ def page_coach():
                 else:
                     age = int((date.today() - naissance).days / 365.25)
                     imc = calcul_imc(poids_kg, taille_cm)
-                    new_row = pd.DataFrame([{
+                    new_row = {
                         "Nom": nom,
                         "Sexe": sexe,
                         "Amenorrhee": amenorrhee,
@@ -161,23 +173,21 @@ def page_coach():
                         "Allure 10km": calc_allure(10, record_10),
                         "Allure Semi": calc_allure(21.097, record_semi),
                         "Allure Marathon": calc_allure(42.195, record_marathon),
-                    }])
-                    athletes = pd.concat([athletes, new_row], ignore_index=True)
-                    save_csv(athletes, ATHLETES_FILE)
+                    }
+                    inserer_lignes(new_row, ATHLETES_FILE)
 
-                    users = load_csv("data/users.csv", ["Nom", "Mot de passe", "Role"])
+                    users = load_csv(USERS_FILE, ["Nom", "Mot de passe", "Role"])
                     if nom not in users["Nom"].values:
                         identifiant = generer_identifiant(nom)
                         
-                        new_user = pd.DataFrame([{
+                        new_user = {
                             "Nom": nom,
-                            "Mot de passe": mdp,
+                            "Mot de passe": hacher_mot_de_passe(mdp),
                             "Role": "athlete",
                             "Identifiant": identifiant
-                        }])
+                        }
                         
-                        users = pd.concat([users, new_user], ignore_index=True)
-                        save_csv(users, "data/users.csv")
+                        inserer_lignes(new_user, USERS_FILE)
 
                         st.success(f"Athlète {nom} ajouté ✅ (identifiant : {identifiant})")
                         time.sleep(2)
@@ -190,6 +200,27 @@ def page_coach():
         # Chargement des séances existantes
         seances_struct = load_csv(SEANCES_STRUCT_FILE, ["Nom", "Blocs", "Charge totale", "Volume total"])
 
+        # Coefficients de charge par zone : configuration versionnée, partagée par toutes les séances
+        version_coefficients, coefficients = coefficients_configures(CONFIG_ZONES_FILE)
+        with st.expander(f"⚙️ Coefficients de charge par zone (version {version_coefficients})"):
+            if "coefficients_enregistres" in st.session_state:
+                version, modifiees = st.session_state.pop("coefficients_enregistres")
+                st.success(f"Coefficients version {version} enregistrés : {modifiees} séances re-chiffrées ✅")
+            nouveaux = {}
+            for z, colonne in zip(range(1, NB_ZONES + 1), st.columns(NB_ZONES)):
+                with colonne:
+                    nouveaux[z] = st.number_input(f"Zone {z}", min_value=0.0, max_value=50.0, step=0.25,
+                                                  value=float(coefficients[z]), key=f"coeff_zone_{z}")
+            st.caption("Enregistrer re-chiffre toutes les séances existantes et les charges hebdomadaires.")
+            if st.button("💾 Enregistrer et recalculer les charges", disabled=nouveaux == coefficients):
+                st.session_state["coefficients_enregistres"] = appliquer_coefficients(
+                    nouveaux, SEANCES_STRUCT_FILE, CONFIG_ZONES_FILE
+                )
+                st.rerun()
+            historique = historique_coefficients(CONFIG_ZONES_FILE)
+            if not historique.empty:
+                st.dataframe(historique, use_container_width=True, hide_index=True)
+
         # Création de blocs
         if "blocs_temp" not in st.session_state:
             st.session_state["blocs_temp"] = []
@@ -222,26 +253,16 @@ def page_coach():
             # Extraction du numéro de zone
             df_blocs["Zone_num"] = df_blocs["Zone"].str.extract(r"(\d)").astype(int)
 
-            # Coefficients personnalisés par zone
-            coefficients_zone = {
-                1: 1,
-                2: 2,
-                3: 3,
-                4: 4,
-                5: 5,
-                6: 6,
-                7: 7,
-            }
+            # Coefficients configurés par zone
+            df_blocs["Coeff zone"] = df_blocs["Zone_num"].map(coefficients)
+            df_blocs["Volume total"] = df_blocs["Durée"] * df_blocs["Répétitions"]
+
+            # Calcul charge, arrondi à l'entier bloc par bloc (même règle que le re-chiffrage)
+            df_blocs["Charge"] = charge_bloc(df_blocs["Volume total"], df_blocs["Coeff zone"]).astype(int)
 
-            df_blocs["Coeff zone"] = df_blocs["Zone_num"].map(coefficients_zone)
-            
             # Format coefficient à 2 décimales
             df_blocs["Coeff zone"] = df_blocs["Coeff zone"].map(lambda x: f"{x:.2f}")
 
-            # Calcul charge, arrondi à l'entier
-            df_blocs["Charge"] = (df_blocs["Durée"] * df_blocs["Répétitions"] * df_blocs["Coeff zone"].astype(float)).round().astype(int)
-            df_blocs["Volume total"] = df_blocs["Durée"] * df_blocs["Répétitions"]
-
             # Coloration selon la zone
             zone_couleurs = {
                 "1": "#757779FF",
@@ -280,8 +301,8 @@ def page_coach():
                         "Charge totale": int(df_blocs["Charge"].sum()),
                         "Volume total": df_blocs["Volume total"].sum()
                     }
-                    seances_struct = pd.concat([seances_struct, pd.DataFrame([seance_dict])], ignore_index=True)
-                    save_csv(seances_struct, SEANCES_STRUCT_FILE)
+                    inserer_lignes(seance_dict, SEANCES_STRUCT_FILE)
+                    reconstruire_agregats()
                     st.success(f"Seance '{nom_seance}' enregistrée ✅")
                     st.session_state["blocs_temp"] = []
                     st.rerun()
@@ -305,7 +326,7 @@ def page_coach():
             nom_filtre = st.multiselect("Nom de séance", options=noms, default=noms)
 
             # Barre de recherche texte
-            recherche_texte = st.text_input("Recherche (nom ou description contient...)")
+            recherche_texte = st.text_input("Recherche (nom, type ou description des blocs, début de mot)")
 
             # Filtrer par durée
             if "Volume total" in seances.columns:
@@ -332,26 +353,16 @@ def page_coach():
                                     value=(min_charge, max_charge))
 
         # ----------- 🧮 Application des filtres ----------- #
-        df_filtre = seances.copy()
-
-        # Nom de séance
-        df_filtre = df_filtre[df_filtre["Nom"].isin(nom_filtre)]
-
-        # Recherche texte libre
-        if recherche_texte.strip() != "":
-            recherche_texte = recherche_texte.lower()
-            df_filtre = df_filtre[df_filtre["Nom"].str.lower().str.contains(recherche_texte) |
-                                df_filtre.apply(lambda row: recherche_texte in str(row).lower(), axis=1)]
-
-        # Durée
-        df_filtre = df_filtre[(df_filtre["Volume total"] >= duree_range[0]) &
-                            (df_filtre["Volume total"] <= duree_range[1])]
-
-        # Charge
-        df_filtre = df_filtre[(df_filtre["Charge totale"] >= charge_range[0]) &
-                            (df_filtre["Charge totale"] <= charge_range[1])]
+        # Recherche texte, durée et charge : index construit une fois par version du fichier
+        with mesurer("coach : recherche de séances"):
+            trouvees = charger_index_seances(SEANCES_STRUCT_FILE).rechercher(recherche_texte, duree_range, charge_range)
+            df_filtre = seances[seances["Nom"].isin(trouvees) & seances["Nom"].isin(nom_filtre)].copy()
 
         # ----------- 📋 Affichage ----------- #
+        seances_modele = charger_seances(SEANCES_STRUCT_FILE)
+        df_filtre["Blocs"] = df_filtre["Nom"].map(
+            lambda nom: format_blocs(seances_modele[nom]) if nom in seances_modele else ""
+        )
         st.dataframe(df_filtre, use_container_width=True,hide_index=True)
 
         # Suppression d'une séance
@@ -359,18 +370,15 @@ def page_coach():
             st.subheader("✏️ Supprimer une séance")
             nom_seance_select = st.selectbox("Sélectionner une séance à supprimer", seances_struct["Nom"])
             if st.button("🗑 Supprimer la séance"):
-                seances_struct = seances_struct[seances_struct["Nom"] != nom_seance_select]
-                save_csv(seances_struct, SEANCES_STRUCT_FILE)
+                supprimer_lignes({"Nom": nom_seance_select}, SEANCES_STRUCT_FILE)
+                reconstruire_agregats()
                 st.success(f"Seance supprimée.")
                 st.rerun()
                 
     # --- PAGE ASSIGNATION SEANCES ---
     def page_assignation():
             # --- Notification séances hors plan ---
-        try:
-            extras = pd.read_csv("extras_seances.csv")
-        except FileNotFoundError:
-            extras = pd.DataFrame(columns=["Athlete", "Date", "Description"])
+        extras = load_csv(EXTRAS_FILE, columns=["Athlete", "Date", "Description"])
 
         if not extras.empty:
             st.markdown("## ⚠️ Séances hors plan signalées par les athlètes")
@@ -381,7 +389,7 @@ def page_coach():
                 st.markdown(f"- **{row['Date']}** - {row['Athlete']} : {desc_court}")
 
             if st.button("Marquer toutes comme lues"):
-                pd.DataFrame(columns=extras.columns).to_csv("extras_seances.csv", index=False)
+                save_csv(pd.DataFrame(columns=extras.columns), EXTRAS_FILE)
                 st.success("Notifications hors plan vidées.")
                 st.rerun()
         else:
@@ -391,9 +399,10 @@ def page_coach():
         st.header("👥 Profil de l'athlète et assignation des séances")
 
         # Chargement des fichiers
-        athletes = load_csv(ATHLETES_FILE)
-        seances_struct = load_csv(SEANCES_STRUCT_FILE)
-        assignments = load_csv(ASSIGN_FILE, ["Athlete", "Seance", "Semaine"])
+        with mesurer("coach : chargement des données"):
+            athletes = load_csv(ATHLETES_FILE)
+            seances_struct = load_csv(SEANCES_STRUCT_FILE)
+            assignments = charger_assignations(ASSIGN_FILE)
 
         if athletes.empty or seances_struct.empty:
             st.warning("⚠️ Ajoutez au moins un athlète et une séance avant d’assigner.")
@@ -409,12 +418,8 @@ def page_coach():
         with col1:
             st.markdown(f"👤 **Nom :** {ath.get('Nom', '—')}")
             st.markdown(f"⚧️ **Sexe :** {ath.get('Sexe', '—')}")
-            try:
-                naissance = datetime.strptime(str(ath.get("Date de naissance", "")), "%Y-%m-%d").date()
-                age = int((date.today() - naissance).days / 365.25)
-                st.markdown(f"🎂 **Âge :** {age} ans")
-            except Exception:
-                st.markdown("🎂 **Âge :** —")
+            age_athlete = age(ath.get("Date de naissance", ""))
+            st.markdown(f"🎂 **Âge :** {age_athlete} ans" if age_athlete is not None else "🎂 **Âge :** —")
 
         with col2:
             st.markdown(f"📏 **Taille :** {ath.get('Taille (cm)', '—')} cm")
@@ -427,17 +432,34 @@ def page_coach():
             st.markdown(f"🎯 **Objectif :** {ath.get('Objectif', '—')}")
 
         st.markdown("### 🏅 Records — allures")
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown(f"🏃 **5 km** : {minutes_to_hmin(ath['Record 5km'])} — {pretty_allure(ath['Allure 5km'])}/km")
-            st.markdown(f"🏃 **10 km** : {minutes_to_hmin(ath['Record 10km'])} — {pretty_allure(ath['Allure 10km'])}/km")
-        with col2:
-            st.markdown(f"🏃 **Semi** : {minutes_to_hmin(ath['Record Semi'])} — {pretty_allure(ath['Allure Semi'])}/km")
-            st.markdown(f"🏃 **Marathon** : {minutes_to_hmin(ath['Record Marathon'])} — {pretty_allure(ath['Allure Marathon'])}/km")
+        records = records_allures(ath)
+        libelles = {"5km": "5 km", "10km": "10 km", "Semi": "Semi", "Marathon": "Marathon"}
+        colonnes = st.columns(2)
+        for i, r in enumerate(records.itertuples()):
+            with colonnes[i // 2]:
+                st.markdown(f"🏃 **{libelles[r.Distance]}** : {r.Record} — {r.Allure}/km")
+
+        # Allures par zone : calculées pour tous les athlètes, une fois par version du fichier
+        st.markdown("### 🎯 Allures par zone")
+        tables = tables_allures(ATHLETES_FILE).get(athlete_select, {})
+        allures_athlete = tables.get("allures", {})
+        if allures_athlete:
+            st.caption("Temps prédits (Riegel) : " + " · ".join(
+                f"{libelles[d]} {minutes_to_hmin(t)}" for d, t in tables["predictions"].items()
+            ))
+            colonnes = st.columns(2)
+            for z, plage in allures_athlete.items():
+                with colonnes[(z - 1) // 4]:
+                    st.markdown(f"{EMOJI_ZONE.get(z, '🎯')} **Zone {z}** : {plage}")
+        else:
+            st.info("Renseignez au moins un record pour calculer les allures par zone.")
 
         # Assignation de séances pour l'athlète selectionné  
         st.markdown("### 🗓️ Assignation des séances")
         seance_select = st.selectbox("📋 Choisir une séance", seances_struct["Nom"])
+        seances_modele = charger_seances(SEANCES_STRUCT_FILE)
+        if seance_select in seances_modele:
+            st.code(format_blocs(seances_modele[seance_select], allures_athlete))
         annee = st.number_input("📆 Année", value=datetime.today().year, min_value=2020, max_value=2100)
         num_semaine = st.number_input(
             "📅 Numéro de semaine (1 à 53)", min_value=1, max_value=53, value=datetime.today().isocalendar()[1]
@@ -454,7 +476,7 @@ def page_coach():
             already_exists = (
                 (assignments["Athlete"] == athlete_select) &
                 (assignments["Seance"] == seance_select) &
-                (assignments["Semaine"] == semaine_formatee)
+                (assignments["Lundi"] == pd.Timestamp(semaine))
             ).any()
 
             if already_exists:
@@ -463,10 +485,11 @@ def page_coach():
                 new_assign = {
                     "Athlete": athlete_select,
                     "Seance": seance_select,
-                    "Semaine": semaine_formatee
+                    "Semaine": semaine_formatee,
+                    "Lundi": semaine.strftime("%Y-%m-%d")
                 }
-                assignments = pd.concat([assignments, pd.DataFrame([new_assign])], ignore_index=True)
-                save_csv(assignments, ASSIGN_FILE)
+                inserer_lignes(new_assign, ASSIGN_FILE)
+                mettre_a_jour_agregats(athlete_select, [semaine])
                 st.success("Séance assignée avec succès 🎯")
                 st.rerun()
 
@@ -477,59 +500,22 @@ def page_coach():
         if df_assign.empty:
             st.info("Aucune séance assignée à cet athlète.")
         else:
-            seances_info = seances_struct[["Nom", "Charge totale", "Volume total"]]
-            df_assign = df_assign.merge(seances_info, left_on="Seance", right_on="Nom", how="left").dropna(subset=["Charge totale", "Volume total"])
-
-            df_assign["Charge totale"] = pd.to_numeric(df_assign["Charge totale"], errors="coerce")
-            df_assign["Volume total"] = pd.to_numeric(df_assign["Volume total"], errors="coerce")
-            df_assign["Date_lundi"] = df_assign["Semaine"].apply(extraire_date_lundi)
-            df_assign = df_assign.dropna(subset=["Date_lundi"])
-            df_assign = df_assign[df_assign["Date_lundi"] >= datetime.today() - timedelta(weeks=4)]
-
-            df_semaines = df_assign.groupby("Semaine").agg({
-                "Charge totale": "sum",
-                "Volume total": "sum",
-                "Seance": "count"
-            }).reset_index()
-
-            df_semaines["Charge moyenne"] = df_semaines.apply(
-                lambda row: row["Charge totale"] / row["Seance"] if row["Seance"] > 0 else 0, axis=1
-            )
-
-            chart = alt.Chart(df_semaines).mark_bar(color="#4B4B4B").encode(
-                x=alt.X("Semaine", title="Semaine", axis=alt.Axis(labelAngle=0)),
-                y=alt.Y("Charge totale", title="Charge externe", axis=alt.Axis(tickCount=15), scale=alt.Scale(nice=True)),
-                tooltip=["Semaine", "Charge totale"]
-            ).properties(height=200)
+            # Lecture de la vue hebdomadaire matérialisée (utils.agregats)
+            df_semaines = charge_planifiee(lire_agregats(athlete_select), athlete_select,
+                                           datetime.today() - timedelta(weeks=4))
+
+            with mesurer("coach : graphique charge hebdomadaire"):
+                import altair as alt  # chargé seulement quand le graphique est affiché
+                chart = alt.Chart(df_semaines[["Semaine", "Charge totale"]]).mark_bar(color="#4B4B4B").encode(
+                    x=alt.X("Semaine", title="Semaine", sort=None, axis=alt.Axis(labelAngle=0)),
+                    y=alt.Y("Charge totale", title="Charge externe", axis=alt.Axis(tickCount=15), scale=alt.Scale(nice=True)),
+                    tooltip=["Semaine", "Charge totale"]
+                ).properties(height=200)
             st.altair_chart(chart, use_container_width=True)
 
-            # Chargement feedbacks et calcul séances effectuées
-            feedbacks = load_csv(FEEDBACKS_FILE)
-            feedbacks = feedbacks[feedbacks["Athlete"] == athlete_select]
-            feedbacks["Semaine"] = feedbacks["Date seance"].apply(
-                lambda d: formater_semaine(pd.to_datetime(d)) if pd.notnull(d) else None
-            )
-            feedbacks = feedbacks[feedbacks["Effectuee"] == "Oui"]
-
-            effectuees = feedbacks.groupby("Semaine")["Seance"].count().rename("Séances effectuées")
-            df_semaines = df_semaines.set_index("Semaine").join(effectuees, how="left").fillna(0)
-            df_semaines["Séances programmées"] = df_semaines["Seance"]
-            df_semaines["Charge moyenne"] = df_semaines["Charge totale"] / df_semaines["Séances programmées"]
-            df_semaines = df_semaines.sort_index()
-
             # Histogramme de l'évolution du temps passé par zone sur les 6 dernières semaines 
             st.markdown("### 📈 Évolution sur 6 semaines — temps passé par zone")
 
-            zone_couleurs = {
-                "1": "gray",
-                "2": "#2D93D7",
-                "3": "#64AC37",
-                "4": "#D08E01",
-                "5": "#C81906",
-                "6": "#680D03", 
-                "7": "#68038A" 
-            }
-
             try:
                 date_ref = datetime.fromisocalendar(annee, num_semaine, 1)
             except Exception:
@@ -537,121 +523,203 @@ def page_coach():
                 date_ref = None
 
             if date_ref:
-                durees_par_semaine = defaultdict(lambda: {str(z): 0 for z in range(1, 8)})
-
-                for delta in range(5, -1, -1):  # 6 dernières semaines, la plus ancienne à gauche
-                    semaine_dt = date_ref - timedelta(weeks=delta)
-                    semaine_str = formater_semaine(semaine_dt)
-
-                    df_assign_zone = assignments[
-                        (assignments["Athlete"] == athlete_select) &
-                        (assignments["Semaine"] == semaine_str)
-                    ]
-
-                    for _, assign in df_assign_zone.iterrows():
-                        nom_seance = assign["Seance"]
-                        seance_row = seances_struct[seances_struct["Nom"] == nom_seance]
-                        if seance_row.empty:
-                            continue
-
-                        try:
-                            blocs = json.loads(seance_row["Blocs"].values[0])
-                        except Exception:
-                            continue
-
-                        for bloc in blocs:
-                            zone_num = bloc.get("Zone_num")
-                            if zone_num is None:
-                                zone = bloc.get("Zone", "")
-                                match = re.search(r"\d", zone)
-                                zone_num = int(match.group()) if match else None
-
-                            try:
-                                zone_num = str(int(zone_num))  # Converti en string ici
-                                duree = float(bloc.get("Durée", 0))
-                                repetitions = int(bloc.get("Répétitions", 1))
-                                total_duree = duree * repetitions
-
-                                if zone_num in durees_par_semaine[semaine_str]:
-                                    durees_par_semaine[semaine_str][zone_num] += total_duree
-                            except Exception:
-                                continue
-
-                if not durees_par_semaine:
-                    st.info("Aucune donnée sur les 6 dernières semaines.")
-                else:
-                    df_cumule = pd.DataFrame(durees_par_semaine).T.reset_index()
-                    df_cumule = df_cumule.rename(columns={"index": "Semaine"})
-                    df_cumule = df_cumule.sort_values(by="Semaine")
-                    df_melt = df_cumule.melt(id_vars="Semaine", var_name="Zone", value_name="Durée (min)")
-                    # Zone est déjà string
-
-                    fig_bar = px.bar(
-                        df_melt,
-                        x="Semaine",
-                        y="Durée (min)",
-                        color="Zone",
-                        text_auto=True,
-                        color_discrete_map=zone_couleurs,
-                        title="Histogramme empilé - Temps passé par zone (6 dernières semaines)"
-                    )
-                    fig_bar.update_layout(
-                        barmode="stack",
-                        yaxis_title="Temps cumulé (min)",
-                        xaxis_title="Semaine",
-                        legend_title="Zone",
-                        height=350
-                    )
-
-                    st.plotly_chart(fig_bar, use_container_width=True)
-
-        #VISUALISATION DES SEANCES ASSIGNEES + SUPPRESSION POSSIBLE
-        st.markdown(f"### 📅 Assignations existantes pour {athlete_select}")
+                durees = repartition_zones(assignments, charger_blocs_long(SEANCES_STRUCT_FILE), athlete_select, date_ref)
 
-        # Choix de tri en ligne
-        col_tri1, col_tri2 = st.columns([1, 1])
-        with col_tri1:
-            tri_seance = st.button("🔤 Trier par Séance")
-        with col_tri2:
-            tri_semaine = st.button("📅 Trier par Semaine")
+                st.plotly_chart(figure_temps_par_zone(durees), use_container_width=True)
 
-        # Filtrer et trier
-        df_assign = assignments[assignments["Athlete"] == athlete_select]
+        #VISUALISATION DES SEANCES ASSIGNEES + EDITION GROUPEE
+        st.markdown(f"### 📅 Assignations existantes pour {athlete_select}")
 
+        df_assign = assignments[assignments["Athlete"] == athlete_select]
         if df_assign.empty:
             st.info("Aucune séance assignée.")
-        else:
-            if tri_seance:
-                tri_colonne = "Seance"
+            return
+
+        # Tri et pagination : seule la page affichée est envoyée au navigateur
+        col_tri, col_taille, col_page = st.columns([2, 1, 1])
+        tri = col_tri.radio("Trier par", ["Semaine", "Séance"], horizontal=True)
+        taille_page = col_taille.selectbox("Lignes par page", [25, 50, 100, 200], index=1)
+        nb_pages = (len(df_assign) - 1) // taille_page + 1
+        num_page = col_page.number_input("Page", min_value=1, max_value=nb_pages, value=1)
+
+        df_assign = df_assign.sort_values(["Lundi", "Seance"] if tri == "Semaine" else ["Seance", "Lundi"],
+                                          ignore_index=True)
+        page_assign = df_assign.iloc[(num_page - 1) * taille_page:num_page * taille_page]
+        cle_grille = f"grille_{athlete_select}_{tri}_{taille_page}_{num_page}"
+        grille = st.data_editor(
+            page_assign[["Seance", "Semaine", "Lundi"]].assign(Selection=False),
+            key=cle_grille,
+            column_order=["Selection", "Seance", "Semaine", "Lundi"],
+            column_config={
+                "Selection": st.column_config.CheckboxColumn("✔", default=False),
+                "Lundi": st.column_config.DateColumn("Lundi", format="DD/MM/YYYY"),
+            },
+            disabled=["Seance", "Semaine", "Lundi"],
+            hide_index=True, use_container_width=True,
+        )
+        st.caption(f"{len(df_assign)} assignations — page {num_page}/{nb_pages}")
+
+        # Action groupée sur la sélection, écrite en un seul lot
+        selection = page_assign[grille["Selection"].to_numpy()]
+        col_action, col_cible, col_valider = st.columns([2, 2, 1])
+        action = col_action.selectbox("Action sur la sélection", ACTIONS)
+        cible = None
+        if action != "Supprimer":
+            cible = col_cible.date_input("Vers la semaine du", value=date.today())
+        col_valider.markdown("<br>", unsafe_allow_html=True)
+        if col_valider.button(f"Appliquer ({len(selection)})", disabled=selection.empty):
+            supprimees, ajoutees = editer_assignations(selection, action, cible, ASSIGN_FILE)
+            st.success(f"{supprimees} assignation(s) supprimée(s), {ajoutees} ajoutée(s).")
+            # Les lignes de la page ont changé : les cases cochées ne désignent plus les mêmes assignations
+            st.session_state.pop(cle_grille, None)
+            st.rerun()
+
+    def page_vue_ensemble():
+        st.header("🗂️ Vue d'ensemble des athlètes")
+        jour = st.date_input("Semaine du", value=date.today())
+        vue = charger_vue_ensemble(jour, ATHLETES_FILE)
+        lundi = jour - timedelta(days=jour.weekday())
+        st.caption(f"Semaine {formater_semaine(lundi)} — variation de la charge planifiée par rapport à la semaine précédente.")
+        if vue.empty:
+            st.info("Aucun athlète enregistré.")
+            return
+
+        st.dataframe(
+            vue.style
+            .format({"Charge planifiee": "{:.0f}", "Variation (%)": "{:+.1f}%",
+                     "Taux de realisation (%)": "{:.0f}%", "Dernier RPE": "{:.0f}",
+                     "Date dernier RPE": lambda d: d.strftime("%d/%m/%Y") if pd.notna(d) else "-"}, na_rep="-")
+            .map(lambda v: f"color: {couleur_variation(v)}" if pd.notna(v) else "", subset=["Variation (%)"]),
+            use_container_width=True, hide_index=True
+        )
+
+    def page_plans_types():
+        st.header("🧩 Plans types")
+        st.caption("Un plan type est une liste de séances par semaine (0 = première semaine), "
+                   "appliquée en une fois à plusieurs athlètes.")
+        modeles = charger_modeles(MODELES_FILE)
+        noms_seances = load_csv(SEANCES_STRUCT_FILE)["Nom"].tolist()
+
+        # Génération automatique à partir d'une courbe de charge
+        with st.expander("⚙️ Générer un plan à partir d'une courbe de charge"):
+            col1, col2, col3 = st.columns(3)
+            charge_depart = col1.number_input("Charge de la 1re semaine", min_value=50, value=1500, step=50)
+            nb_semaines = col2.number_input("Nombre de semaines", min_value=1, max_value=52, value=16)
+            part_basse = col3.slider("Zones basses (%)", 50, 100, 80, step=5)
+            col1, col2, col3 = st.columns(3)
+            progression = col1.number_input("Progression hebdo (%)", min_value=0, max_value=30, value=8)
+            semaines_montee = col2.number_input("Semaines de montée", min_value=1, max_value=8, value=3)
+            decharge = col3.number_input("Semaine de décharge (% du pic)", min_value=30, max_value=100, value=70)
+            jours = st.multiselect("Jours disponibles", JOURS, default=["Mardi", "Jeudi", "Samedi", "Dimanche"])
+
+            if st.button("🎲 Générer", disabled=not jours):
+                cibles = courbe_charge(charge_depart, int(nb_semaines), progression / 100,
+                                       int(semaines_montee), decharge / 100)
+                plan = generer_periodisation(charger_seances(SEANCES_STRUCT_FILE), cibles, jours, part_basse / 100)
+                st.session_state["plan_genere"] = (plan, resume_periodisation(plan, cibles))
+
+            if "plan_genere" in st.session_state:
+                plan, resume = st.session_state["plan_genere"]
+                if resume["Charge totale"].isna().any():
+                    st.warning("Certaines semaines n'ont pas de combinaison de séances possible : "
+                               "ajoutez des jours ou des séances à la bibliothèque.")
+                st.dataframe(resume.style.format({
+                    "Cible": "{:.0f}", "Charge totale": "{:.0f}", "Volume total": "{:.0f}",
+                    "Ecart (%)": "{:+.1f}%", "Zones basses (%)": "{:.0f}%"}, na_rep="-"),
+                    use_container_width=True, hide_index=True)
+                st.dataframe(plan[["Decalage semaine", "Jour", "Seance", "Charge totale"]],
+                             use_container_width=True, hide_index=True)
+                nom_genere = st.text_input("Enregistrer sous le nom", key="nom_plan_genere")
+                if st.button("💾 Enregistrer comme plan type", disabled=not nom_genere.strip()):
+                    enregistrer_modele(nom_genere.strip(), plan, MODELES_FILE)
+                    del st.session_state["plan_genere"]
+                    st.success(f"Plan « {nom_genere.strip()} » enregistré.")
+                    st.rerun()
+        nouveau = "➕ Nouveau plan"
+        choix = st.selectbox("Plan type", [nouveau] + sorted(modeles["Modele"].unique().tolist()))
+
+        # Création / modification : le tableau entier est enregistré en une écriture
+        nom = st.text_input("Nom du plan", value="" if choix == nouveau else choix)
+        lignes = modeles.loc[modeles["Modele"] == choix, ["Decalage semaine", "Seance"]].reset_index(drop=True)
+        lignes = st.data_editor(
+            lignes, num_rows="dynamic", use_container_width=True, hide_index=True, key=f"plan_{choix}",
+            column_config={
+                "Decalage semaine": st.column_config.NumberColumn("Semaine (décalage)", min_value=0, max_value=104, step=1, required=True),
+                "Seance": st.column_config.SelectboxColumn("Séance", options=noms_seances, required=True),
+            },
+        )
+        col1, col2 = st.columns(2)
+        if col1.button("💾 Enregistrer le plan"):
+            if not nom.strip():
+                st.error("Le plan doit avoir un nom.")
             else:
-                tri_colonne = "Semaine"  # Par défaut ou si "Trier par Semaine" cliqué
-
-            df_assign = df_assign.sort_values(by=tri_colonne).reset_index(drop=True)
-
-            for idx, row in df_assign.iterrows():
-                with st.container():
-                    st.markdown(
-                        """
-                        <div style="background-color:#f0f2f6; padding:5px; border-radius:5px; margin-bottom:5px;">
-                        """,
-                        unsafe_allow_html=True
-                    )
-
-                    col1, col2, col3 = st.columns([4, 4, 2])
-                    col1.markdown(f"**Séance :** {row['Seance']}")
-                    col2.markdown(f"**Semaine :** {row['Semaine']}")
-                    with col3:
-                        if st.button("🗑️", key=f"del_{idx}"):
-                            idx_global = assignments[(assignments["Athlete"] == athlete_select) &
-                                                    (assignments["Seance"] == row["Seance"]) &
-                                                    (assignments["Semaine"] == row["Semaine"])].index[0]
-                            assignments.drop(idx_global, inplace=True)
-                            assignments.reset_index(drop=True, inplace=True)
-                            save_csv(assignments, ASSIGN_FILE)
-                            st.success("Assignation supprimée")
-                            st.rerun()
-
-                    st.markdown("</div>", unsafe_allow_html=True)
+                enregistrer_modele(nom.strip(), lignes, MODELES_FILE)
+                st.success(f"Plan « {nom.strip()} » enregistré.")
+                st.rerun()
+        if choix != nouveau and col2.button("🗑️ Supprimer le plan"):
+            supprimer_modele(choix, MODELES_FILE)
+            st.rerun()
+
+        # Le plan appliqué est celui affiché, modifications non enregistrées comprises
+        plan = lignes.dropna()
+        if choix == nouveau or plan.empty:
+            return
+
+        # Application à un groupe d'athlètes
+        st.subheader("Appliquer le plan")
+        athletes = load_csv(ATHLETES_FILE)["Nom"].tolist()
+        selection = st.multiselect("Athlètes", athletes)
+        annee = st.number_input("📆 Année", value=datetime.today().year, min_value=2020, max_value=2100, key="plan_annee")
+        num_semaine = st.number_input("📅 Semaine de départ (1 à 53)", min_value=1, max_value=53,
+                                      value=datetime.today().isocalendar()[1], key="plan_semaine")
+        try:
+            debut = datetime.fromisocalendar(annee, num_semaine, 1)
+        except ValueError:
+            st.error("⛔ Semaine invalide pour cette année.")
+            return
+        nb_semaines = int(plan["Decalage semaine"].max()) + 1
+        st.caption(f"{len(plan)} séances sur {nb_semaines} semaines à partir de {formater_semaine(debut)}, "
+                   f"soit {len(plan) * len(selection)} assignations.")
+
+        if st.button("✅ Appliquer le plan", disabled=not selection):
+            ajoutees, ignorees = appliquer_modele(plan, selection, debut, ASSIGN_FILE)
+            st.success(f"{ajoutees} séances assignées" + (f", {ignorees} déjà présentes ignorées." if ignorees else "."))
+
+    def page_charge_aigue_chronique():
+        st.header("📈 Charge aiguë / chronique (ACWR)")
+        st.caption("Charge des 7 derniers jours rapportée à la charge des 28 derniers jours, "
+                   "pour tous les athlètes. Zone optimale : 0,8 à 1,3.")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            jour = st.date_input("Date de référence", value=date.today())
+        with col2:
+            charge = st.radio("Charge", ["Charge interne", "Charge totale"], horizontal=True,
+                              format_func=lambda c: "Interne (Volume x RPE)" if c == "Charge interne" else "Externe (Charge totale)")
+
+        risque = charger_risque_acwr(FEEDBACKS_FILE, FEEDBACKS_JOURNAL_FILE, SEANCES_STRUCT_FILE, charge, jour)
+        if risque.empty:
+            st.info("Aucun feedback de séance effectuée pour le moment.")
+            return
+
+        couleurs = {"Sous-charge": "#cce5ff", "Optimal": "#d4edda", "Vigilance": "#fff3cd", "Danger": "#f8d7da"}
+        st.dataframe(
+            risque.style
+            .format({"Charge 7 j": "{:.0f}", "Charge chronique (hebdo)": "{:.0f}",
+                     "ACWR couple": "{:.2f}", "ACWR EWMA": "{:.2f}"}, na_rep="-")
+            .map(lambda v: f"background-color: {couleurs[v]}" if v in couleurs else "",
+                 subset=["Zone couple", "Zone EWMA"]),
+            use_container_width=True, hide_index=True
+        )
+
+        st.subheader("Monotonie et contrainte (Foster)")
+        st.caption("Sur la charge interne des 7 derniers jours. Monotonie > 2 : semaine trop uniforme.")
+        monotonie = tableau_monotonie(
+            charger_monotonie_contrainte(FEEDBACKS_FILE, FEEDBACKS_JOURNAL_FILE, SEANCES_STRUCT_FILE, jour), jour)
+        st.dataframe(
+            monotonie.style.format({"Charge 7 j": "{:.0f}", "Monotonie": "{:.2f}", "Contrainte": "{:.0f}"}, na_rep="-"),
+            use_container_width=True, hide_index=True
+        )
 
     # --- MAIN ---
     def main():
@@ -666,12 +734,29 @@ def page_coach():
     page = st.sidebar.selectbox("Menu", [
         "Gestion des athlètes",
         "Création séances",
-        "Profil et assignation des séances"
+        "Profil et assignation des séances",
+        "Vue d'ensemble",
+        "Plans types",
+        "Charge aiguë / chronique"
     ])
 
-    if page == "Gestion des athlètes":
+    if page == "Vue d'ensemble":
+        page_vue_ensemble()
+    elif page == "Gestion des athlètes":
         page_gestion_athletes()
     elif page == "Création séances":
         page_creation_seances()
     elif page == "Profil et assignation des séances":
-        page_assignation()
\ No newline at end of file
+        page_assignation()
+    elif page == "Plans types":
+        page_plans_types()
+    elif page == "Charge aiguë / chronique":
+        page_charge_aigue_chronique()
+
+    # --- Temps d'exécution (p50 / p95 par section) ---
+    with st.expander("⏱ Performance", expanded=False):
+        st.caption("Cette exécution")
+        st.dataframe(mesures_execution().style.format({"Total ms": "{:.1f}"}), hide_index=True)
+        st.caption("Dernières exécutions, toutes sessions")
+        st.dataframe(statistiques().style.format({"p50 ms": "{:.1f}", "p95 ms": "{:.1f}", "Max ms": "{:.1f}"}),
+                     hide_index=True)
\ No newline at end of file
@@ -0,0 +1,22 @@
+"""
+Tests de comportement (valeurs vérifiées à la main).
+
+    pip install -r requirements-dev.txt
+    pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.io import vider_cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def cache_vide():
+    """Chaque test part d'un cache mémoire vide"""
+    vider_cache()
+    yield
+    vider_cache()
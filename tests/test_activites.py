@@ -0,0 +1,21 @@
+import io
+
+import pytest
+
+from utils.activites import analyser_activite
+from utils.zones import seuils_athlete
+
+ATHLETE = {"Date de naissance": "1990-01-01", "Allure 10km": 4.5}
+
+
+@pytest.mark.parametrize("point", [
+    '<trkpt lon="5.0"><time>2025-06-18T08:00:00Z</time></trkpt>',
+    '<trkpt lat="45.0"><time>2025-06-18T08:00:00Z</time></trkpt>',
+    '<trkpt lat="45.0" lon="5.0"><time></time></trkpt>',
+], ids=["sans lat", "sans lon", "sans heure"])
+def test_gpx_point_incomplet(point):
+    """Un trkpt incomplet lève un ValueError, affiché en erreur par la page athlète"""
+    contenu = ('<?xml version="1.0"?><gpx xmlns="http://www.topografix.com/GPX/1/1">'
+               f"<trk><trkseg>{point}</trkseg></trk></gpx>").encode()
+    with pytest.raises(ValueError):
+        analyser_activite(io.BytesIO(contenu), "activite.gpx", *seuils_athlete(ATHLETE))
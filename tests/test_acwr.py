@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.calculs import calculer_acwr, charges_quotidiennes, tableau_risque_acwr, zone_acwr
+
+
+def matrice(charges, debut="2025-01-01"):
+    jours = pd.date_range(debut, periods=len(charges), freq="D")
+    return pd.DataFrame([charges], index=pd.Index(["A"], name="Athlete"), columns=jours, dtype=float)
+
+
+def test_acwr_couple_apres_pic():
+    # 28 jours à 100 puis 7 jours à 200 : aigu 200/j, chronique (21 x 100 + 7 x 200) / 28 = 125/j
+    acwr = calculer_acwr(matrice([100] * 28 + [200] * 7))
+    dernier = acwr["ACWR couple"].columns[-1]
+    assert acwr["ACWR couple"].loc["A", pd.Timestamp("2025-01-28")] == pytest.approx(1.0)
+    assert acwr["Aigue"].loc["A", dernier] == pytest.approx(1400)
+    assert acwr["Chronique"].loc["A", dernier] == pytest.approx(875)
+    assert acwr["ACWR couple"].loc["A", dernier] == pytest.approx(1.6)
+
+
+def test_acwr_jours_anterieurs_a_zero():
+    # Un seul jour à 70 : 70 / 7 = 10 contre 70 / 28 = 2,5
+    acwr = calculer_acwr(matrice([70]))
+    assert acwr["ACWR couple"].iloc[0, 0] == pytest.approx(4.0)
+    assert np.isnan(calculer_acwr(matrice([0]))["ACWR couple"].iloc[0, 0])
+
+
+def test_acwr_ewma():
+    # lambda aigu = 2/8, chronique = 2/29 ; départ à la première valeur
+    acwr = calculer_acwr(matrice([100, 0]))
+    assert acwr["Aigue EWMA"].iloc[0].tolist() == pytest.approx([100, 75])
+    assert acwr["Chronique EWMA"].iloc[0].tolist() == pytest.approx([100, 2700 / 29])
+    assert acwr["ACWR EWMA"].iloc[0].tolist() == pytest.approx([1.0, 75 * 29 / 2700])
+
+
+def test_zones_de_risque():
+    assert zone_acwr([np.nan, 0.5, 0.8, 1.3, 1.31, 1.5, 1.6]).tolist() == [
+        "", "Sous-charge", "Optimal", "Optimal", "Vigilance", "Vigilance", "Danger"]
+
+
+def test_tableau_risque_depuis_feedbacks():
+    feedbacks = pd.DataFrame({
+        "Athlete": ["A", "A", "B", "B"],
+        "Seance": ["Footing", "Footing", "Footing", "Footing"],
+        "Semaine": ["2025-01-27"] * 4,
+        "Date seance": ["2025-01-28 18:00:00", "2025-01-29 18:00:00", "2025-01-28 07:00:00", ""],
+        "Effectuee": ["Oui", "Non", "Oui", "Oui"],
+        "RPE": [6, 9, 3, 5],
+    })
+    seances = pd.DataFrame({"Seance": ["Footing"], "Charge totale": [80], "Volume total": [50]})
+    quotidien = charges_quotidiennes(feedbacks, seances, fin="2025-02-02")
+    # 28 jours au moins, jusqu'à la date de fin
+    assert quotidien.shape == (2, 28) and quotidien.columns[-1] == pd.Timestamp("2025-02-02")
+    # Charge interne 50 x RPE ; sans date, la séance compte le lundi de sa semaine
+    assert quotidien.loc["A", pd.Timestamp("2025-01-28")] == 300
+    assert quotidien.loc["B", pd.Timestamp("2025-01-27")] == 250
+    assert quotidien.sum(axis=1).to_dict() == {"A": 300, "B": 400}
+
+    risque = tableau_risque_acwr(quotidien).set_index("Athlete")
+    # B : 400 sur 7 jours et sur 28 jours, soit (400 / 7) / (400 / 28) = 4
+    assert risque.loc["B", "Charge 7 j"] == 400
+    assert risque.loc["B", "Charge chronique (hebdo)"] == 100
+    assert risque.loc["B", "ACWR couple"] == pytest.approx(4.0)
+    assert risque.loc["B", "Zone couple"] == "Danger"
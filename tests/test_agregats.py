@@ -0,0 +1,57 @@
+import warnings
+
+import pandas as pd
+
+from utils.agregats import lire_agregats, mettre_a_jour_agregats, reconstruire_agregats
+from utils.io import load_csv, save_csv
+from utils.journal import journaliser_feedback
+
+
+def preparer(tmp_path):
+    fichiers = {nom: str(tmp_path / f"{nom}.csv") for nom in ["assignations", "feedbacks", "journal", "seances", "agregats"]}
+    save_csv(pd.DataFrame({
+        "Nom": ["Footing", "Seuil"], "Blocs": ["[]", "[]"], "Charge totale": [60, 150], "Volume total": [40, 50],
+    }), fichiers["seances"])
+    save_csv(pd.DataFrame({
+        "Athlete": ["A", "A", "A", "B"],
+        "Seance": ["Footing", "Seuil", "Footing", "Seuil"],
+        "Semaine": ["S02 - 06/01", "S02 - 06/01", "S03 - 13/01", "S02 - 06/01"],
+        "Lundi": ["2025-01-06", "2025-01-06", "2025-01-13", "2025-01-06"],
+    }), fichiers["assignations"])
+    save_csv(pd.DataFrame({
+        "Athlete": ["A"], "Seance": ["Footing"], "Semaine": ["2025-01-06"],
+        "Date seance": ["2025-01-07 18:00:00"], "Effectuee": ["Oui"], "RPE": [4],
+    }), fichiers["feedbacks"])
+    return fichiers
+
+
+def test_mise_a_jour_incrementale(tmp_path):
+    fichiers = preparer(tmp_path)
+    reconstruire_agregats(fichiers)
+    feedback = {"Athlete": "A", "Seance": "Seuil", "Semaine": "2025-01-06",
+                "Date seance": "2025-01-08 18:00:00", "Effectuee": "Oui", "RPE": 7}
+    journaliser_feedback(feedback, fichiers["journal"])
+    mettre_a_jour_agregats("A", ["2025-01-06", "2025-01-13"], fichiers)
+
+    vue = lire_agregats("A", fichiers).set_index("Lundi")
+    semaine = vue.loc[pd.Timestamp("2025-01-06")]
+    # 60 + 150 planifiés et réalisés ; charge interne 40 x 4 + 50 x 7 = 510
+    assert semaine["Charge planifiee"] == 210
+    assert semaine["Seances effectuees"] == 2
+    assert semaine["Charge realisee"] == 210
+    assert semaine["Charge interne"] == 510
+    assert vue.loc[pd.Timestamp("2025-01-13"), "Seances effectuees"] == 0
+    # Une ligne par (athlète, semaine), l'athlète B intact
+    stockee = load_csv(fichiers["agregats"])
+    assert len(stockee) == 3
+    assert stockee[stockee["Athlete"] == "B"]["Charge planifiee"].tolist() == [150]
+
+
+def test_lire_agregats_athlete_sans_avertissement(tmp_path):
+    fichiers = preparer(tmp_path)
+    reconstruire_agregats(fichiers)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        vue = lire_agregats("A", fichiers)
+    assert vue["Lundi"].dtype.kind == "M"
+    assert load_csv(fichiers["agregats"])["Lundi"].map(type).eq(str).all()
@@ -0,0 +1,61 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.analytics import charge_planifiee, conformite, evolution_hebdomadaire, variations_semaine
+
+
+def vue(lignes):
+    colonnes = ["Athlete", "Lundi", "Charge planifiee", "Volume planifie", "Seances planifiees",
+                "Seances effectuees", "Charge realisee", "Volume realise", "Charge interne"]
+    df = pd.DataFrame(lignes, columns=colonnes)
+    df["Lundi"] = pd.to_datetime(df["Lundi"])
+    return df
+
+
+AGREGATS = vue([
+    ["A", "2025-01-06", 200, 100, 2, 2, 200, 100, 600],
+    ["A", "2025-01-13", 300, 120, 3, 1, 90, 40, 280],
+    ["A", "2025-01-20", 0, 0, 0, 1, 50, 30, 150],
+    ["B", "2025-01-13", 100, 60, 1, 0, 0, 0, 0],
+])
+
+
+def test_variations_semaine():
+    courante, variations = variations_semaine(AGREGATS, "A", "2025-01-13")
+    assert courante == {"charge": 300, "volume": 120, "charge_moy": 100, "volume_moy": 40}
+    # 300 / 200 = +50 % ; 120 / 100 = +20 % ; moyennes 100 / 100 et 40 / 50
+    assert variations["charge"] == pytest.approx(50)
+    assert variations["volume"] == pytest.approx(20)
+    assert variations["charge_moy"] == pytest.approx(0)
+    assert variations["volume_moy"] == pytest.approx(-20)
+    # Pas de semaine précédente : aucune variation
+    assert variations_semaine(AGREGATS, "B", "2025-01-13")[1] == dict.fromkeys(courante)
+
+
+def test_conformite():
+    taux = conformite(AGREGATS, "A")["Taux de realisation (%)"].tolist()
+    assert taux[:2] == [100, pytest.approx(100 / 3)]
+    assert np.isnan(taux[2])
+
+
+def test_charge_planifiee():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        df = charge_planifiee(AGREGATS, "A", "2025-01-13")
+    assert df["Semaine"].tolist() == ["S03 - 13/01", "S04 - 20/01"]
+    assert df["Charge moyenne"].tolist() == [100, 0]
+
+
+def test_evolution_hebdomadaire():
+    lundi = pd.Timestamp.today().normalize() - pd.Timedelta(days=pd.Timestamp.today().weekday())
+    recentes = AGREGATS.assign(Lundi=AGREGATS["Lundi"] - AGREGATS["Lundi"].max() + lundi)
+    evolution = evolution_hebdomadaire(recentes, "A", lundi - pd.Timedelta(weeks=1))
+    # Semaines effectuées à partir du début demandé : internes 280 / 1 et 150 / 1
+    assert evolution["Charge_externe_totale"].tolist() == [90, 50]
+    assert evolution["Charge_interne_moyenne"].tolist() == [280, 150]
+    # Au plus 6 mois en arrière, quel que soit le début de l'entraînement
+    assert len(evolution_hebdomadaire(recentes, "A", "2000-01-01")) == 3
+    assert evolution_hebdomadaire(AGREGATS, "A", "2000-01-01").empty
@@ -0,0 +1,59 @@
+import pandas as pd
+
+from utils.auth import (authentifier, creer_compte_coach, hacher_mot_de_passe, index_identifiants,
+                        migrer_mots_de_passe, VARIABLE_MDP_COACH)
+from utils.io import load_csv, save_csv
+
+ITERATIONS_TEST = 1_000
+
+
+def ecrire_users(chemin, lignes):
+    save_csv(pd.DataFrame(lignes, columns=["Nom", "Mot de passe", "Role", "Identifiant"]), str(chemin))
+    return str(chemin)
+
+
+def test_mot_de_passe_absent_refuse(tmp_path):
+    users = ecrire_users(tmp_path / "users.csv", [
+        ["Sans Mdp", None, "athlete", "sansmdp"],
+        ["Avec Mdp", hacher_mot_de_passe("secret", ITERATIONS_TEST), "athlete", "avecmdp"],
+    ])
+    assert load_csv(users)["Mot de passe"].isna().iloc[0]
+    assert index_identifiants(users)["sansmdp"][2] is None
+    assert authentifier("sansmdp", "nan", "athlete", users) is None
+    assert authentifier("sansmdp", "None", "athlete", users) is None
+    assert authentifier("avecmdp", "secret", "athlete", users) == "Avec Mdp"
+
+
+def test_migration_ignore_mot_de_passe_absent(tmp_path):
+    users = ecrire_users(tmp_path / "users.csv", [
+        ["Sans Mdp", None, "athlete", "sansmdp"],
+        ["En Clair", "clair", "athlete", "enclair"],
+    ])
+    assert migrer_mots_de_passe(users, ITERATIONS_TEST) == 1
+    assert authentifier("sansmdp", "nan", "athlete", users) is None
+    assert authentifier("enclair", "clair", "athlete", users) == "En Clair"
+
+
+def test_compte_coach_sans_variable(tmp_path, monkeypatch):
+    monkeypatch.delenv(VARIABLE_MDP_COACH, raising=False)
+    users = str(tmp_path / "users.csv")
+    assert creer_compte_coach(users) is False
+    assert authentifier("coach", "coach123", "coach", users) is None
+    assert load_csv(users).empty
+
+
+def test_compte_coach_cree_une_fois(tmp_path, monkeypatch):
+    monkeypatch.setenv(VARIABLE_MDP_COACH, "motdepasse-coach")
+    users = str(tmp_path / "users.csv")
+    assert creer_compte_coach(users) is True
+    assert creer_compte_coach(users) is True
+    assert (load_csv(users)["Role"] == "coach").sum() == 1
+    assert authentifier("coach", "motdepasse-coach", "coach", users) == "Coach"
+    assert authentifier("coach", "motdepasse-coach", "athlete", users) is None
+
+
+def test_index_sans_ecriture(tmp_path):
+    """Construire l'index ne crée aucun compte"""
+    users = ecrire_users(tmp_path / "users.csv", [["Avec Mdp", "x", "athlete", "avecmdp"]])
+    index_identifiants(users)
+    assert len(load_csv(users)) == 1
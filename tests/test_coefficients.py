@@ -0,0 +1,58 @@
+import json
+
+import pandas as pd
+
+from utils.calculs import table_blocs
+from utils.coefficients import appliquer_coefficients, recalculer_charges
+from utils.io import load_csv, save_csv
+from utils.modele import construire_seances, charge_bloc, charger_seances
+
+COEFFICIENTS = {1: 1, 2: 1.5, 3: 3, 4: 5, 5: 7, 6: 9, 7: 12}
+
+
+def test_arrondi_par_bloc():
+    """Re-chiffrage, éditeur de séances et modèle donnent la même charge avec des coefficients fractionnaires"""
+    blocs = [{"Type": "Intervalles", "Durée": 5, "Répétitions": 1, "Zone": "Zone 2", "Zone_num": 2},
+             {"Type": "Intervalles", "Durée": 5, "Répétitions": 1, "Zone": "Zone 2", "Zone_num": 2},
+             {"Type": "Allure continue", "Durée": 3, "Répétitions": 3, "Zone": "Zone 4", "Zone_num": 4}]
+    seances = pd.DataFrame({"Nom": ["Mixte"], "Blocs": [json.dumps(blocs)], "Charge totale": [0], "Volume total": [19]})
+
+    # Éditeur de séances (page_coach) : charge de chaque bloc arrondie, puis somme
+    df_blocs = pd.DataFrame(blocs)
+    editeur = int(charge_bloc(df_blocs["Durée"] * df_blocs["Répétitions"],
+                              df_blocs["Zone_num"].map(COEFFICIENTS)).astype(int).sum())
+    recalculees = recalculer_charges(seances, table_blocs(construire_seances(seances)), COEFFICIENTS)
+    modele = construire_seances(seances.drop(columns="Charge totale"), COEFFICIENTS)["Mixte"]
+
+    # 2 x round(7.5) + round(45) = 61, alors que round(15 + 45) = 60
+    assert editeur == recalculees["Charge totale"].iloc[0] == modele.charge_totale == 61
+
+
+def test_charges_des_blocs_reecrites(tmp_path):
+    """Charge et Coeff zone enregistrés dans les blocs suivent les nouveaux coefficients"""
+    blocs = [{"Type": "Allure continue", "Durée": 30, "Répétitions": 1, "Zone": "Zone 2", "Zone_num": 2,
+              "Coeff zone": "2.00", "Charge": 60},
+             {"Type": "Intervalles", "Durée": 4, "Répétitions": 5, "Zone": "Zone 5", "Zone_num": 5}]
+    seances_file = str(tmp_path / "seances_struct.csv")
+    config_file = str(tmp_path / "config_zones.csv")
+    save_csv(pd.DataFrame({"Nom": ["Seuil"], "Blocs": [json.dumps(blocs)],
+                           "Charge totale": [160], "Volume total": [50]}), seances_file)
+    fichiers = {"assignations": str(tmp_path / "assignments.csv"), "seances": seances_file,
+                "feedbacks": str(tmp_path / "feedbacks.csv"), "journal": str(tmp_path / "journal.csv"),
+                "agregats": str(tmp_path / "charges_hebdo.csv")}
+    save_csv(pd.DataFrame({"Athlete": ["A"], "Seance": ["Seuil"], "Semaine": ["S02 - 06/01"],
+                           "Lundi": ["2025-01-06"]}), fichiers["assignations"])
+    save_csv(pd.DataFrame(columns=["Athlete", "Seance", "Semaine", "Date seance", "Effectuee", "RPE"]),
+             fichiers["feedbacks"])
+
+    version, modifiees = appliquer_coefficients(COEFFICIENTS, seances_file, config_file, fichiers)
+
+    # 30 x 1.5 = 45 ; 20 x 7 = 140
+    assert (version, modifiees) == (1, 1)
+    seance = load_csv(seances_file).iloc[0]
+    assert seance["Charge totale"] == 185
+    relus = json.loads(seance["Blocs"])
+    assert (relus[0]["Coeff zone"], relus[0]["Charge"]) == ("1.50", 45)
+    assert "Charge" not in relus[1] and "Coeff zone" not in relus[1]
+    assert charger_seances(seances_file, config_file)["Seuil"].blocs[0].charge == 45
+    assert load_csv(fichiers["agregats"])["Charge planifiee"].tolist() == [185]
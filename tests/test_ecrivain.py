@@ -0,0 +1,44 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from utils.io import appliquer_mutations, inserer_lignes, load_csv, mettre_a_jour_lignes, save_csv
+
+
+def test_ecritures_concurrentes_sans_perte(tmp_path):
+    """8 sessions x 25 ajouts et mises à jour simultanés : aucune ligne perdue"""
+    chemin = str(tmp_path / "feedbacks.csv")
+    save_csv(pd.DataFrame({"Athlete": ["Z"], "Seance": ["Depart"], "RPE": [0]}), chemin)
+
+    def session(n):
+        for i in range(25):
+            inserer_lignes({"Athlete": f"A{n}", "Seance": f"S{i}", "RPE": i % 10}, chemin)
+            mettre_a_jour_lignes({"Athlete": f"A{n}", "Seance": f"S{i}"}, {"RPE": 10}, chemin)
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(session, range(8)))
+
+    df = load_csv(chemin)
+    assert len(df) == 1 + 8 * 25
+    assert not df.duplicated(["Athlete", "Seance"]).any()
+    assert (pd.to_numeric(df["RPE"]) == 10).sum() == 8 * 25
+
+
+def test_lot_en_erreur_sans_effet(tmp_path):
+    """Un lot qui échoue n'écrit rien, et l'écrivain continue de servir les suivants"""
+    chemin = str(tmp_path / "assignments.csv")
+    save_csv(pd.DataFrame({"Athlete": ["A"], "Seance": ["Footing"]}), chemin)
+    with pytest.raises(Exception):
+        appliquer_mutations([
+            ("supprimer", {"Athlete": "A"}),
+            ("inserer", [{"Athlete": "B", "Seance": "Seuil"}]),
+            ("operation_inconnue",),
+        ], chemin)
+    assert load_csv(chemin).values.tolist() == [["A", "Footing"]]
+
+    assert appliquer_mutations([
+        ("supprimer", {"Athlete": "A"}),
+        ("inserer", [{"Athlete": "B", "Seance": "Seuil"}]),
+    ], chemin) == [1, 1]
+    assert load_csv(chemin).values.tolist() == [["B", "Seuil"]]
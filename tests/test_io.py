@@ -0,0 +1,49 @@
+import os
+
+import pandas as pd
+import pytest
+
+from utils.io import RACINE_PROJET, SQLITE_BASE, StockageCSV, StockageSQLite
+
+
+def test_base_sqlite_du_projet(tmp_path):
+    stockage = StockageSQLite()
+    assert SQLITE_BASE == os.path.join(RACINE_PROJET, "data", "plateforme.db")
+    assert stockage._base(os.path.join(RACINE_PROJET, "extras_seances.csv")) == SQLITE_BASE
+    assert stockage._base(os.path.join(RACINE_PROJET, "data", "assignments.csv")) == SQLITE_BASE
+    assert stockage._base(str(tmp_path / "assignments.csv")) == str(tmp_path / "plateforme.db")
+
+
+@pytest.mark.parametrize("stockage", [StockageCSV(), StockageSQLite()], ids=["csv", "sqlite"])
+def test_criteres_dates(tmp_path, stockage):
+    """Un critère Timestamp retrouve les dates écrites en texte ISO comme en datetime64"""
+    chemin = str(tmp_path / "charges_hebdo.csv")
+    stockage.appliquer([("ecrire", pd.DataFrame({
+        "Athlete": ["A", "A", "B"],
+        "Lundi": ["2025-01-06", "2025-01-13", "2025-01-06"],
+        "Date seance": pd.to_datetime(["2025-01-07 18:30:00", "2025-01-14", "2025-01-08"], format="ISO8601"),
+    }))], chemin)
+    assert stockage.appliquer([
+        ("supprimer", {"Athlete": "A", "Lundi": pd.Timestamp("2025-01-06")}),
+        ("mettre_a_jour", {"Date seance": pd.Timestamp("2025-01-14")}, {"Athlete": "X"}),
+        ("supprimer_cles", ["Athlete", "Date seance"], [("B", pd.Timestamp("2025-01-08"))]),
+    ], chemin) == [1, 1, 1]
+    assert stockage.lire(chemin)[["Athlete", "Lundi", "Date seance"]].values.tolist() == [
+        ["X", "2025-01-13", "2025-01-14 00:00:00"],
+    ]
+
+
+def test_lecture_sqlite_sans_transaction(tmp_path, monkeypatch):
+    """La table est créée depuis le CSV à la première lecture ; les suivantes ne font que lire"""
+    chemin = tmp_path / "assignments.csv"
+    pd.DataFrame({"Athlete": ["A"], "Seance": ["Footing"]}).to_csv(chemin, index=False)
+    stockage = StockageSQLite()
+    assert stockage.lire(str(chemin)).values.tolist() == [["A", "Footing"]]
+    assert stockage.lire(str(tmp_path / "absente.csv")) is None
+
+    def transaction(filepath):
+        raise AssertionError("transaction ouverte pour une lecture")
+
+    monkeypatch.setattr(stockage, "_transaction", transaction)
+    assert stockage.lire(str(chemin)).values.tolist() == [["A", "Footing"]]
+    assert stockage.lire(str(tmp_path / "absente.csv")) is None
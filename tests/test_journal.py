@@ -0,0 +1,32 @@
+import pandas as pd
+
+from utils import journal as module_journal
+from utils.io import load_csv, save_csv
+from utils.journal import journaliser_feedback, lire_feedbacks, taille_journal
+
+
+def feedback(seance, rpe):
+    return {"Athlete": "A", "Seance": seance, "Semaine": "2025-01-06",
+            "Date seance": "2025-01-07 18:00:00", "Effectuee": "Oui", "RPE": rpe}
+
+
+def test_correction_et_compactage(tmp_path, monkeypatch):
+    instantane, journal = str(tmp_path / "feedbacks.csv"), str(tmp_path / "journal.csv")
+    save_csv(pd.DataFrame([feedback("Footing", 3)]), instantane)
+    monkeypatch.setattr(module_journal, "SEUIL_COMPACTAGE", 3)
+
+    journaliser_feedback(feedback("Footing", 5), journal)
+    journaliser_feedback(feedback("Seuil", 8), journal)
+    assert taille_journal(journal) == 2
+    fb = lire_feedbacks(instantane, journal).set_index("Seance")
+    # La correction (RPE 5) remplace l'instantané (RPE 3)
+    assert fb["RPE"].to_dict() == {"Footing": 5, "Seuil": 8}
+    assert len(load_csv(instantane)) == 1
+
+    journaliser_feedback(feedback("Seuil", 7), journal)
+    assert taille_journal(journal) == 3
+    fb = lire_feedbacks(instantane, journal).set_index("Seance")
+    assert fb["RPE"].to_dict() == {"Footing": 5, "Seuil": 7}
+    # Seuil atteint : journal replié dans l'instantané puis vidé
+    assert taille_journal(journal) == 0
+    assert len(load_csv(instantane)) == 2
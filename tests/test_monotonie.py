@@ -0,0 +1,43 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.calculs import monotonie_et_contrainte, tableau_monotonie
+
+
+def matrice(lignes, debut="2025-01-01"):
+    jours = pd.date_range(debut, periods=len(next(iter(lignes.values()))), freq="D")
+    return pd.DataFrame(list(lignes.values()), index=pd.Index(list(lignes), name="Athlete"),
+                        columns=jours, dtype=float)
+
+
+def test_monotonie_et_contrainte():
+    # Semaine [0, 0, 0, 0, 0, 0, 70] : moyenne 10, écart-type (ddof 1) racine(4200 / 6) = racine(700)
+    indicateurs = monotonie_et_contrainte(matrice({"A": [0, 0, 0, 0, 0, 0, 70]}))
+    assert indicateurs["Charge hebdo"].iloc[0, -1] == 70
+    assert indicateurs["Monotonie"].iloc[0, -1] == pytest.approx(1 / math.sqrt(7))
+    assert indicateurs["Contrainte"].iloc[0, -1] == pytest.approx(math.sqrt(700))
+
+
+def test_jours_anterieurs_a_zero_et_charge_constante():
+    # Premier jour de la matrice : les 6 jours précédents comptent à 0, même fenêtre que ci-dessus
+    indicateurs = monotonie_et_contrainte(matrice({"A": [70, 70, 70, 70, 70, 70, 70]}))
+    assert indicateurs["Monotonie"].iloc[0, 0] == pytest.approx(1 / math.sqrt(7))
+    # Charge identique tous les jours : écart-type nul, monotonie indéfinie
+    assert np.isnan(indicateurs["Monotonie"].iloc[0, -1])
+    assert indicateurs["Charge hebdo"].iloc[0, -1] == 490
+
+
+def test_tableau_trie_par_contrainte():
+    indicateurs = monotonie_et_contrainte(matrice({
+        "A": [0, 0, 0, 0, 0, 0, 70],
+        "B": [0, 0, 0, 0, 0, 70, 70],
+        "C": [0, 0, 0, 0, 0, 0, 0],
+    }))
+    tableau = tableau_monotonie(indicateurs)
+    # B : moyenne 20, écart-type racine((5 x 20² + 2 x 50²) / 6) = racine(7000 / 6)
+    assert tableau["Athlete"].tolist() == ["B", "A", "C"]
+    assert tableau.loc[0, "Contrainte"] == pytest.approx(140 * 20 / math.sqrt(7000 / 6))
+    assert np.isnan(tableau.loc[2, "Monotonie"])
@@ -0,0 +1,8 @@
+import os
+
+from utils import profilage
+
+
+def test_journal_perf_depuis_la_racine():
+    assert profilage.JOURNAL_PERF == os.path.join(profilage.RACINE_PROJET, "logs", "performance.log")
+    assert os.path.isfile(os.path.join(profilage.RACINE_PROJET, "app.py"))
@@ -0,0 +1,42 @@
+import pandas as pd
+
+from utils.calculs import charger_assignations, migrer_semaines, parser_libelles_semaine
+from utils.io import load_csv, save_csv
+
+
+def test_libelles_vers_lundi():
+    lundis = parser_libelles_semaine(
+        ["S27 - 30/06", "S01 - 30/12", "S53 - 28/12", "S27 - 31/02", "illisible"],
+        reference=pd.Timestamp("2025-01-10"),
+    )
+    # 30/06/2025 : lundi de la semaine ISO 27 ; 30/12/2024 : lundi de la
+    # semaine 1 de 2025 ; parmi 2024 à 2026, seul 28/12/2026 est le lundi
+    # d'une semaine 53
+    assert lundis.iloc[0] == pd.Timestamp("2025-06-30")
+    assert lundis.iloc[1] == pd.Timestamp("2024-12-30")
+    assert lundis.iloc[2] == pd.Timestamp("2026-12-28")
+    assert lundis.iloc[3:].isna().all()
+    assert parser_libelles_semaine(["S53 - 28/12"], reference=pd.Timestamp("2021-01-05")).iloc[0] \
+        == pd.Timestamp("2020-12-28")
+
+
+def test_migration_complete_les_lundis_manquants():
+    df = pd.DataFrame({
+        "Athlete": ["A", "A", "A"],
+        "Seance": ["Footing", "Seuil", "Footing"],
+        "Semaine": ["S27 - 30/06", "S28 - 07/07", "S02 - 06/01"],
+        "Lundi": [None, None, "2025-01-06"],
+    })
+    migre, completees = migrer_semaines(df, reference=pd.Timestamp("2025-07-01"))
+    assert completees == 2
+    assert migre["Lundi"].tolist() == [pd.Timestamp("2025-06-30"), pd.Timestamp("2025-07-07"),
+                                       pd.Timestamp("2025-01-06")]
+
+
+def test_migration_enregistree_une_fois(tmp_path):
+    chemin = str(tmp_path / "assignments.csv")
+    save_csv(pd.DataFrame({"Athlete": ["A"], "Seance": ["Footing"], "Semaine": ["S02 - 06/01"]}), chemin)
+    assignations = charger_assignations(chemin)
+    assert assignations["Lundi"].dt.weekday.tolist() == [0]
+    # La clé est écrite dans le fichier au format AAAA-MM-JJ
+    assert load_csv(chemin)["Lundi"].tolist() == [assignations["Lundi"].iloc[0].strftime("%Y-%m-%d")]
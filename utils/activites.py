@@ -0,0 +1,209 @@
+"""
+Temps réellement passé par zone à partir d'un fichier d'activité (GPX, TCX
+ou CSV timestamp / FC / vitesse). Les fichiers sont lus en flux, point par
+point, puis traités par paquets NumPy : la mémoire reste constante quelle
+que soit la durée de l'activité.
+"""
+import csv
+import io
+import math
+import os
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from xml.etree.ElementTree import iterparse
+
+import numpy as np
+
+from utils.modele import NB_ZONES
+from utils.zones import zones_depuis_valeurs
+from utils.profilage import mesurer
+
+FORMATS = ["gpx", "tcx", "csv"]
+TAILLE_PAQUET = 4096
+# Au-delà de cet écart entre deux points, l'activité est considérée en pause
+ECART_MAX_S = 30
+COLONNES_TEMPS_REEL = [f"Temps reel Zone {z}" for z in range(1, NB_ZONES + 1)]
+
+# En-têtes reconnus dans un CSV (insensibles à la casse)
+ALIAS_CSV = {
+    "temps": ["timestamp", "time", "temps", "date"],
+    "fc": ["hr", "heart_rate", "heartrate", "fc", "bpm"],
+    "vitesse": ["speed", "vitesse", "velocity"],
+    "distance": ["distance", "distance_m"],
+}
+RAYON_TERRE_M = 6_371_000
+NAN = float("nan")
+
+
+def _secondes(horodatage):
+    """Horodatage ISO 8601 (avec ou sans Z) ou epoch en secondes -> secondes (float)"""
+    if not horodatage or not horodatage.strip():
+        raise ValueError("horodatage vide")
+    texte = horodatage.strip()
+    try:
+        return float(texte)
+    except ValueError:
+        return datetime.fromisoformat(texte.replace("Z", "+00:00")).timestamp()
+
+
+def _nombre(texte):
+    try:
+        return float(texte)
+    except (TypeError, ValueError):
+        return NAN
+
+
+@lru_cache(maxsize=None)
+def _nom_local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _points(flux, balise, conteneur):
+    """
+    Éléments `balise` d'un XML lu en flux ; chacun est retiré de son
+    `conteneur` après usage pour que l'arbre ne grossisse pas.
+    """
+    parent = None
+    for evenement, elem in iterparse(flux, events=("start", "end")):
+        nom = _nom_local(elem.tag)
+        if evenement == "start":
+            if nom == conteneur:
+                parent = elem
+            continue
+        if nom == balise:
+            yield elem
+            if parent is not None:
+                parent.remove(elem)
+            else:
+                elem.clear()
+
+
+# --- Lecteurs en flux : (secondes, FC, vitesse m/s, distance cumulée m) ---
+def lire_gpx(flux):
+    """Points de trace d'un GPX ; distance cumulée calculée entre points (haversine)"""
+    distance, precedent = 0.0, None
+    for elem in _points(flux, "trkpt", "trkseg"):
+        lat, lon = elem.get("lat"), elem.get("lon")
+        if lat is None or lon is None:
+            raise ValueError("point de trace (trkpt) sans latitude ou longitude")
+        lat, lon = math.radians(float(lat)), math.radians(float(lon))
+        t, fc = None, NAN
+        for enfant in elem.iter():
+            nom = _nom_local(enfant.tag)
+            if nom == "time":
+                t = _secondes(enfant.text)
+            elif nom == "hr":
+                fc = _nombre(enfant.text)
+        if precedent is not None:
+            dlat, dlon = lat - precedent[0], lon - precedent[1]
+            a = math.sin(dlat / 2) ** 2 + math.cos(lat) * math.cos(precedent[0]) * math.sin(dlon / 2) ** 2
+            distance += 2 * RAYON_TERRE_M * math.asin(math.sqrt(a))
+        precedent = (lat, lon)
+        if t is not None:
+            yield t, fc, NAN, distance
+
+
+def lire_tcx(flux):
+    """Trackpoints d'un TCX (FC, distance cumulée, vitesse de l'extension si présente)"""
+    for elem in _points(flux, "Trackpoint", "Track"):
+        t, fc, vitesse, distance = None, NAN, NAN, NAN
+        for enfant in elem.iter():
+            nom = _nom_local(enfant.tag)
+            if nom == "Time":
+                t = _secondes(enfant.text)
+            elif nom == "DistanceMeters":
+                distance = _nombre(enfant.text)
+            elif nom == "Value" and fc != fc:
+                fc = _nombre(enfant.text)
+            elif nom == "Speed":
+                vitesse = _nombre(enfant.text)
+        if t is not None:
+            yield t, fc, vitesse, distance
+
+
+def lire_csv(flux):
+    """Lignes d'un CSV avec une colonne de temps et au moins FC, vitesse ou distance"""
+    if not isinstance(flux, io.TextIOBase):
+        flux = io.TextIOWrapper(flux, encoding="utf-8-sig", newline="")
+    lecteur = csv.reader(flux)
+    entete = [c.strip().lower() for c in next(lecteur, [])]
+    position = {cle: next((entete.index(a) for a in alias if a in entete), None) for cle, alias in ALIAS_CSV.items()}
+    if position["temps"] is None:
+        raise ValueError("colonne de temps absente (timestamp, time, temps)")
+
+    def champ(ligne, cle):
+        i = position[cle]
+        return _nombre(ligne[i]) if i is not None and i < len(ligne) else NAN
+
+    for ligne in lecteur:
+        if len(ligne) <= position["temps"] or not ligne[position["temps"]].strip():
+            continue
+        yield _secondes(ligne[position["temps"]]), champ(ligne, "fc"), champ(ligne, "vitesse"), champ(ligne, "distance")
+
+
+LECTEURS = {"gpx": lire_gpx, "tcx": lire_tcx, "csv": lire_csv}
+
+
+def format_fichier(nom):
+    extension = os.path.splitext(nom)[1].lower().lstrip(".")
+    if extension not in LECTEURS:
+        raise ValueError(f"format non pris en charge : {extension or nom} (attendu : {', '.join(FORMATS)})")
+    return extension
+
+
+# --- Temps par zone ---
+def _paquets(echantillons, taille):
+    while True:
+        paquet = list(islice(echantillons, taille))
+        if not paquet:
+            return
+        yield np.array(paquet, dtype=float)
+
+
+def temps_par_zone_flux(echantillons, seuils_fc=None, seuils_vitesse=None, taille_paquet=TAILLE_PAQUET):
+    """
+    Minutes passées dans chaque zone (tableau de NB_ZONES valeurs) pour un flux
+    d'échantillons (secondes, FC, vitesse, distance). La durée d'un point est
+    l'écart au point précédent (0 au-delà de ECART_MAX_S). La zone vient de la
+    FC quand elle est connue, sinon de la vitesse (mesurée ou déduite de la
+    distance) ; un point sans l'une ni l'autre n'est pas compté.
+    """
+    secondes = np.zeros(NB_ZONES + 1)
+    t_prec = d_prec = None
+    for paquet in _paquets(iter(echantillons), taille_paquet):
+        t, fc, vitesse, distance = paquet.T
+        t0 = t[0] if t_prec is None else t_prec
+        d0 = distance[0] if d_prec is None else d_prec
+        dt = np.diff(t, prepend=t0)
+        dt[(dt < 0) | (dt > ECART_MAX_S)] = 0
+        t_prec, d_prec = t[-1], distance[-1]
+
+        # Vitesse déduite de la distance cumulée quand elle n'est pas fournie
+        manquante = np.isnan(vitesse)
+        if manquante.any():
+            with np.errstate(divide="ignore", invalid="ignore"):
+                deduite = np.diff(distance, prepend=d0) / dt
+            vitesse = np.where(manquante & (dt > 0), deduite, vitesse)
+
+        zones = np.zeros(len(t), dtype=int)
+        if seuils_vitesse is not None:
+            zones = zones_depuis_valeurs(vitesse, seuils_vitesse)
+        if seuils_fc is not None:
+            zones_fc = zones_depuis_valeurs(fc, seuils_fc)
+            zones = np.where(zones_fc > 0, zones_fc, zones)
+        secondes += np.bincount(zones, weights=dt, minlength=NB_ZONES + 1)
+    # Indice 0 : points sans zone
+    return secondes[1:] / 60
+
+
+@mesurer("activité : temps par zone")
+def analyser_activite(flux, nom_fichier, seuils_fc=None, seuils_vitesse=None):
+    """Minutes par zone d'un fichier d'activité (flux binaire), selon son extension"""
+    lecteur = LECTEURS[format_fichier(nom_fichier)]
+    return temps_par_zone_flux(lecteur(flux), seuils_fc, seuils_vitesse)
+
+
+def colonnes_temps_reel(minutes):
+    """{"Temps reel Zone N": minutes} à joindre à un enregistrement de feedback"""
+    return {col: round(float(m), 1) for col, m in zip(COLONNES_TEMPS_REEL, minutes)}
@@ -1,28 +1,123 @@
-import ast
+import pandas as pd
+
+from utils.modele import lire_blocs
+from utils.calculs import libelles_semaine
+from utils.profilage import mesurer
+
+ZONE_COULEURS = {
+    "1": "gray",
+    "2": "#2D93D7",
+    "3": "#64AC37",
+    "4": "#D08E01",
+    "5": "#C81906",
+    "6": "#680D03",
+    "7": "#68038A"
+}
+
+# Variation hebdomadaire acceptable (en %) avant d'être signalée en rouge
+SEUIL_VARIATION = 12
+
+def couleur_variation(pct, seuil=SEUIL_VARIATION):
+    """Vert si la variation reste dans ±seuil %, rouge sinon"""
+    return "green" if abs(pct) <= seuil else "red"
+
+def format_variation(pct, seuil=SEUIL_VARIATION):
+    """Flèche et pourcentage colorés (HTML) pour une variation d'une semaine à l'autre"""
+    if pct is None or pd.isna(pct):
+        return ""
+    arrow = "▲" if pct >= 0 else "▼"
+    return f"<span style='font-size:0.75em; color:{couleur_variation(pct, seuil)}; margin-left:6px'>{arrow} {abs(pct):.1f}%</span>"
 
 def format_blocs(blocs):
     """Affiche les blocs de manière lisible dans une cellule"""
-    if isinstance(blocs, str):
-        try:
-            blocs = ast.literal_eval(blocs)
-        except Exception:
-            return blocs
+    if isinstance(blocs, str) and not lire_blocs(blocs):
+        return blocs
 
     lignes = []
-    for b in blocs:
+    for b in lire_blocs(blocs):
         lignes.append(
-            f"{b['Répétitions']}×{b['Durée']}min {b['Zone']} [{b['Type']}] {b.get('Description','')}"
+            f"{b.repetitions}×{b.duree}min {b.zone} [{b.type}] {b.description}"
         )
     return "\n".join(lignes)
 
 def format_blocs_athlete(blocs):
     """Affichage optimisé pour les athlètes"""
-    if isinstance(blocs, str):
-        blocs = ast.literal_eval(blocs)
     lignes = []
-    for b in blocs:
+    for b in lire_blocs(blocs):
         lignes.append(
-            f"▶ {b['Répétitions']}× {b['Durée']} min | {b['Zone']} | {b['Type']}"
-            + (f" – {b['Description']}" if b.get('Description') else "")
+            f"▶ {b.repetitions}× {b.duree} min | {b.zone} | {b.type}"
+            + (f" – {b.description}" if b.description else "")
         )
     return "\n".join(lignes)
+
+@mesurer("graphique temps par zone")
+def figure_temps_par_zone(durees, nb_semaines=6):
+    """
+    Histogramme empilé du temps passé par zone.
+    `durees` : une ligne par semaine (index = lundi), une colonne par zone.
+    """
+    import plotly.express as px  # chargé au premier graphique, pas au démarrage
+
+    if isinstance(durees.index, pd.DatetimeIndex):
+        durees = durees.set_axis(libelles_semaine(durees.index).values)
+    df_melt = durees.rename(columns=str).rename_axis("Semaine").reset_index().melt(
+        id_vars="Semaine", var_name="Zone", value_name="Durée (min)"
+    )
+    fig_bar = px.bar(
+        df_melt,
+        x="Semaine",
+        y="Durée (min)",
+        color="Zone",
+        text_auto=True,
+        color_discrete_map=ZONE_COULEURS,
+        title=f"Histogramme empilé - Temps passé par zone ({nb_semaines} dernières semaines)"
+    )
+    fig_bar.update_layout(
+        barmode="stack",
+        yaxis_title="Temps cumulé (min)",
+        xaxis_title="Semaine",
+        legend_title="Zone",
+        height=350
+    )
+    return fig_bar
+
+
+def figure_evolution_hebdo(stats_hebdo, moyennes=False):
+    """
+    Barres de charge externe / interne (totales ou moyennes par séance) et
+    courbe du volume, par semaine. `stats_hebdo` : analytics.evolution_hebdomadaire().
+    """
+    suffixe, opacite = ("moyenne", 0.6) if moyennes else ("totale", 0.8)
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=stats_hebdo["annee_semaine"],
+        y=stats_hebdo[f"Charge_externe_{suffixe}"],
+        name=f"Charge externe {suffixe}",
+        marker_color=f"rgba(99, 110, 250, {opacite})"
+    ))
+    fig.add_trace(go.Bar(
+        x=stats_hebdo["annee_semaine"],
+        y=stats_hebdo[f"Charge_interne_{suffixe}"],
+        name=f"Charge interne {suffixe}",
+        marker_color=f"rgba(239, 85, 59, {opacite})"
+    ))
+    fig.add_trace(go.Scatter(
+        x=stats_hebdo["annee_semaine"],
+        y=stats_hebdo["Volume_total"],
+        name="Durée totale (min)",
+        mode="lines+markers",
+        yaxis="y2",
+        line=dict(color="rgba(0, 204, 150, 1)" if moyennes else "rgba(0, 204, 150, 0.9)", width=3)
+    ))
+    fig.update_layout(
+        title=f"📊 Évolution hebdomadaire – Charges {suffixe}s & Volume",
+        barmode="group",
+        xaxis_title="Semaine",
+        yaxis_title=f"Charge ({suffixe})",
+        yaxis2=dict(title="Durée (min)", overlaying="y", side="right"),
+        xaxis_tickangle=-45,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5)
+    )
+    return fig
@@ -0,0 +1,201 @@
+import pandas as pd
+
+from utils.io import load_csv, save_csv, supprimer_lignes, appliquer_mutations, cache_par_version
+from utils.journal import lire_feedbacks
+from utils.modele import charger_tableau_seances
+from utils.calculs import charger_assignations, lundi_semaine, formater_lundis
+from utils.profilage import mesurer
+
+# Vue matérialisée : une ligne par athlète et par semaine (lundi)
+FICHIERS = {
+    "assignations": "data/assignments.csv",
+    "feedbacks": "data/feedbacks.csv",
+    "journal": "data/feedbacks_journal.csv",
+    "seances": "data/seances_struct.csv",
+    "agregats": "data/charges_hebdo.csv",
+}
+
+COLONNES_AGREGATS = [
+    "Athlete", "Lundi",
+    "Charge planifiee", "Volume planifie", "Seances planifiees",
+    "Seances effectuees", "Charge realisee", "Volume realise", "Charge interne",
+]
+
+
+@mesurer("agrégats hebdomadaires")
+def calculer_agregats(assignations, feedbacks, seances):
+    """
+    Agrégats hebdomadaires par athlète, en deux groupby :
+    - planifié : charge, volume et nombre de séances assignées ;
+    - réalisé : séances effectuées, leur charge externe et volume, et la
+      charge interne (Volume total x RPE).
+    `seances` : DataFrame (Seance, Charge totale, Volume total).
+    """
+    plan = assignations.dropna(subset=["Lundi"]).merge(seances, on="Seance", how="inner")
+    planifie = plan.groupby(["Athlete", "Lundi"]).agg(**{
+        "Charge planifiee": ("Charge totale", "sum"),
+        "Volume planifie": ("Volume total", "sum"),
+        "Seances planifiees": ("Seance", "count"),
+    })
+
+    fb = feedbacks[feedbacks["Effectuee"] == "Oui"].copy()
+    fb["Lundi"] = lundi_semaine(fb["Semaine"]).values
+    fb["RPE"] = pd.to_numeric(fb["RPE"], errors="coerce")
+    fb = fb.dropna(subset=["Lundi"]).merge(seances, on="Seance", how="inner")
+    fb["Charge interne"] = fb["Volume total"] * fb["RPE"]
+    realise = fb.groupby(["Athlete", "Lundi"]).agg(**{
+        "Seances effectuees": ("Seance", "count"),
+        "Charge realisee": ("Charge totale", "sum"),
+        "Volume realise": ("Volume total", "sum"),
+        "Charge interne": ("Charge interne", "sum"),
+    })
+
+    agregats = planifie.join(realise, how="outer").fillna(0).reset_index()
+    for col in ["Seances planifiees", "Seances effectuees"]:
+        agregats[col] = agregats[col].astype(int)
+    return agregats.reindex(columns=COLONNES_AGREGATS).sort_values(["Athlete", "Lundi"], ignore_index=True)
+
+
+def _sources(fichiers, athlete=None, lundis=None):
+    assignations = charger_assignations(fichiers["assignations"])
+    feedbacks = lire_feedbacks(fichiers["feedbacks"], fichiers["journal"])
+    if athlete is not None:
+        assignations = assignations[assignations["Athlete"] == athlete]
+        feedbacks = feedbacks[feedbacks["Athlete"] == athlete]
+    if lundis is not None:
+        assignations = assignations[assignations["Lundi"].isin(lundis)]
+        feedbacks = feedbacks[lundi_semaine(feedbacks["Semaine"]).isin(lundis).values]
+    return assignations, feedbacks, charger_tableau_seances(fichiers["seances"])
+
+
+def _pour_stockage(df):
+    df = df.copy()
+    df["Lundi"] = formater_lundis(df["Lundi"])
+    return df
+
+
+def reconstruire_agregats(fichiers=FICHIERS):
+    """Recalcule entièrement la vue (à faire quand la bibliothèque de séances change)"""
+    agregats = calculer_agregats(*_sources(fichiers))
+    save_csv(_pour_stockage(agregats), fichiers["agregats"])
+    return agregats
+
+
+def mettre_a_jour_agregats(athlete, lundis, fichiers=FICHIERS):
+    """
+    Met à jour les lignes (athlete, lundi) concernées par une écriture
+    (feedback, assignation) sans relire l'historique des autres semaines.
+    """
+    if load_csv(fichiers["agregats"]).columns.empty:
+        reconstruire_agregats(fichiers)
+        return
+    lundis = pd.DatetimeIndex(lundi_semaine(list(lundis)).dropna().unique())
+    nouveaux = _pour_stockage(calculer_agregats(*_sources(fichiers, athlete, lundis)))
+    _remplacer_semaines(nouveaux, [athlete], lundis, fichiers)
+
+
+def _remplacer_semaines(nouveaux, athletes, lundis, fichiers):
+    """Remplace les lignes (athlète, lundi) de la vue par `nouveaux`, en un seul lot de l'écrivain"""
+    cles = [(athlete, lundi) for athlete in athletes for lundi in formater_lundis(lundis)]
+    appliquer_mutations([
+        ("supprimer_cles", ["Athlete", "Lundi"], cles),
+        ("inserer", nouveaux.reindex(columns=COLONNES_AGREGATS).to_dict(orient="records")),
+    ], fichiers["agregats"])
+
+
+def supprimer_agregats_athlete(athlete, fichiers=FICHIERS):
+    supprimer_lignes({"Athlete": athlete}, fichiers["agregats"])
+
+
+def lire_agregats(athlete=None, fichiers=FICHIERS):
+    """
+    Lit la vue (construite au premier appel). Lundi est renvoyé en datetime64.
+    """
+    agregats = load_csv(fichiers["agregats"])
+    if agregats.columns.empty:
+        agregats = _pour_stockage(reconstruire_agregats(fichiers))
+    agregats = agregats.reindex(columns=COLONNES_AGREGATS)
+    if athlete is not None:
+        agregats = agregats[agregats["Athlete"] == athlete].copy()
+    agregats["Lundi"] = pd.to_datetime(agregats["Lundi"], format="ISO8601")
+    return agregats.sort_values("Lundi", ignore_index=True)
+
+
+# --- Vue d'ensemble du coach ---
+COLONNES_VUE_ENSEMBLE = [
+    "Athlete", "Charge planifiee", "Variation (%)", "Seances planifiees",
+    "Seances effectuees", "Taux de realisation (%)", "Dernier RPE", "Date dernier RPE",
+]
+
+
+@mesurer("vue d'ensemble")
+def vue_ensemble(agregats, feedbacks, athletes, lundi):
+    """
+    Une ligne par athlète pour la semaine `lundi` : charge planifiée et sa
+    variation par rapport à la semaine précédente, taux de réalisation et
+    dernier RPE saisi. Tous les athlètes sont traités en une passe.
+    `agregats` : vue hebdomadaire (Lundi en datetime64).
+    """
+    lundi = lundi_semaine([lundi]).iloc[0]
+    athletes = list(athletes)
+    par_semaine = agregats.set_index(["Athlete", "Lundi"])
+
+    def semaine(l):
+        index = pd.MultiIndex.from_product([athletes, [l]], names=["Athlete", "Lundi"])
+        return par_semaine.reindex(index).droplevel("Lundi")
+
+    vue = semaine(lundi)[["Charge planifiee", "Seances planifiees", "Seances effectuees"]].fillna(0)
+    charge_prec = semaine(lundi - pd.Timedelta(weeks=1))["Charge planifiee"]
+    vue["Variation (%)"] = ((vue["Charge planifiee"] - charge_prec) / charge_prec * 100).where(charge_prec > 0)
+    vue["Taux de realisation (%)"] = (vue["Seances effectuees"] / vue["Seances planifiees"] * 100).where(
+        vue["Seances planifiees"] > 0)
+
+    # Dernier RPE : feedback effectué le plus récent de chaque athlète
+    fb = pd.DataFrame({
+        "Athlete": feedbacks["Athlete"].values,
+        "Dernier RPE": pd.to_numeric(feedbacks["RPE"], errors="coerce").values,
+        "Date dernier RPE": pd.to_datetime(feedbacks["Date seance"], format="ISO8601", errors="coerce").values,
+    })[(feedbacks["Effectuee"] == "Oui").values].dropna(subset=["Dernier RPE"])
+    dernier = fb.sort_values("Date dernier RPE", kind="stable", na_position="first") \
+        .drop_duplicates("Athlete", keep="last").set_index("Athlete")
+    vue = vue.join(dernier, how="left")
+
+    for col in ["Seances planifiees", "Seances effectuees"]:
+        vue[col] = vue[col].astype(int)
+    return vue.reset_index().reindex(columns=COLONNES_VUE_ENSEMBLE)
+
+
+def charger_vue_ensemble(lundi, athletes_file="data/athletes.csv", fichiers=FICHIERS):
+    """vue_ensemble() de tous les athlètes, calculée une fois par version des données"""
+    lundi = lundi_semaine([lundi]).iloc[0]
+
+    def construire():
+        athletes = load_csv(athletes_file)
+        noms = athletes["Nom"].dropna().unique() if "Nom" in athletes.columns else []
+        return vue_ensemble(lire_agregats(fichiers=fichiers),
+                            lire_feedbacks(fichiers["feedbacks"], fichiers["journal"]), noms, lundi)
+
+    return cache_par_version(
+        f"vue_ensemble:{lundi.date()}",
+        (fichiers["agregats"], fichiers["feedbacks"], fichiers["journal"], athletes_file), construire
+    ).copy()
+
+
+def mettre_a_jour_agregats_lot(athletes, lundis, fichiers=FICHIERS):
+    """
+    Recalcule les semaines `lundis` de plusieurs athlètes à la fois (plan
+    appliqué à un groupe) et les remplace dans la vue en un seul lot de
+    l'écrivain : une mise à jour concurrente d'autres lignes n'est pas perdue.
+    """
+    if load_csv(fichiers["agregats"]).columns.empty:
+        reconstruire_agregats(fichiers)
+        return
+    athletes = list(athletes)
+    lundis = pd.DatetimeIndex(lundi_semaine(list(lundis)).dropna().unique())
+    assignations, feedbacks, seances = _sources(fichiers, lundis=lundis)
+    nouveaux = _pour_stockage(calculer_agregats(
+        assignations[assignations["Athlete"].isin(athletes)],
+        feedbacks[feedbacks["Athlete"].isin(athletes)],
+        seances,
+    ))
+    _remplacer_semaines(nouveaux, athletes, lundis, fichiers)
@@ -0,0 +1,126 @@
+"""
+Calculs d'analyse sans Streamlit : chaque fonction reçoit des DataFrames et
+renvoie des DataFrames ou des dicts. Les pages se contentent de les afficher ;
+les mêmes fonctions servent aux rapports et aux traitements par lot.
+"""
+from datetime import date, datetime
+
+import pandas as pd
+
+from utils.calculs import (lundi_semaine, libelles_semaine, temps_par_zone, semaines_glissantes,
+                           minutes_to_hmin, pretty_allure)
+
+DISTANCES_RECORDS = ["5km", "10km", "Semi", "Marathon"]
+
+
+# --- Statistiques hebdomadaires ---
+def stats_semaine(agregats, athlete, lundi):
+    """
+    Charge et volume planifiés (totaux et moyennes par séance) d'une semaine,
+    lus dans la vue hebdomadaire. Renvoie None si la semaine est vide.
+    """
+    lignes = agregats[(agregats["Athlete"] == athlete) & (agregats["Lundi"] == pd.Timestamp(lundi))]
+    if lignes.empty:
+        return None
+    ligne = lignes.iloc[0]
+    nb = ligne["Seances planifiees"]
+    return {
+        "charge": ligne["Charge planifiee"],
+        "volume": ligne["Volume planifie"],
+        "charge_moy": ligne["Charge planifiee"] / nb if nb else 0,
+        "volume_moy": ligne["Volume planifie"] / nb if nb else 0,
+    }
+
+
+def variations_semaine(agregats, athlete, lundi):
+    """
+    stats_semaine() de la semaine `lundi` et variation (%) de chaque valeur
+    par rapport à la semaine précédente (None si elle n'est pas comparable).
+    """
+    vide = {"charge": 0, "volume": 0, "charge_moy": 0, "volume_moy": 0}
+    courante = stats_semaine(agregats, athlete, lundi) or vide
+    precedente = stats_semaine(agregats, athlete, pd.Timestamp(lundi) - pd.Timedelta(days=7))
+    variations = {
+        cle: ((courante[cle] - precedente[cle]) / precedente[cle] * 100) if precedente and precedente[cle] else None
+        for cle in vide
+    }
+    return courante, variations
+
+
+def evolution_hebdomadaire(agregats, athlete, debut_entrainement, mois=6):
+    """
+    Séances effectuées semaine par semaine depuis le début de l'entraînement
+    (au plus `mois` mois) : charges externe et interne totales et moyennes, volume.
+    Une séance compte dans sa semaine planifiée (Lundi de la vue), même si
+    elle a été faite ou saisie une autre semaine (Date seance).
+    """
+    df = agregats[(agregats["Athlete"] == athlete) & (agregats["Seances effectuees"] > 0)]
+    debut = max(pd.to_datetime(debut_entrainement), pd.Timestamp.now() - pd.DateOffset(months=mois))
+    df = df[df["Lundi"] >= lundi_semaine([debut]).iloc[0]]
+
+    nb = df["Seances effectuees"]
+    return pd.DataFrame({
+        "annee_semaine": libelles_semaine(df["Lundi"]).values,
+        "Charge_externe_totale": df["Charge realisee"].values,
+        "Charge_externe_moyenne": (df["Charge realisee"] / nb).values,
+        "Volume_total": df["Volume realise"].values,
+        "Charge_interne_totale": df["Charge interne"].values,
+        "Charge_interne_moyenne": (df["Charge interne"] / nb).values,
+    })
+
+
+def charge_planifiee(agregats, athlete, depuis):
+    """Charge externe planifiée par semaine depuis `depuis` (graphique coach)"""
+    df = agregats[(agregats["Athlete"] == athlete) & (agregats["Lundi"] >= pd.Timestamp(depuis))]
+    df = df.rename(columns={
+        "Charge planifiee": "Charge totale",
+        "Volume planifie": "Volume total",
+        "Seances planifiees": "Séances programmées",
+        "Seances effectuees": "Séances effectuées",
+    })
+    df["Semaine"] = libelles_semaine(df["Lundi"]).values
+    df["Charge moyenne"] = (
+        df["Charge totale"] / df["Séances programmées"].where(df["Séances programmées"] > 0)
+    ).fillna(0)
+    return df.reset_index(drop=True)
+
+
+# --- Respect du plan ---
+def conformite(agregats, athlete=None):
+    """
+    Séances planifiées, effectuées et taux de réalisation (%) par athlète et
+    par semaine ; le taux est vide pour une semaine sans séance planifiée.
+    """
+    df = agregats if athlete is None else agregats[agregats["Athlete"] == athlete]
+    df = df[["Athlete", "Lundi", "Seances planifiees", "Seances effectuees"]].copy()
+    df["Taux de realisation (%)"] = (
+        df["Seances effectuees"] / df["Seances planifiees"] * 100
+    ).where(df["Seances planifiees"] > 0)
+    return df.reset_index(drop=True)
+
+
+# --- Répartition par zone ---
+def repartition_zones(assignations, blocs_long, athlete, date_ref, nb_semaines=6):
+    """Minutes planifiées par zone sur les `nb_semaines` semaines finissant à date_ref"""
+    return temps_par_zone(
+        assignations, blocs_long, semaines_glissantes(date_ref, nb_semaines), athletes=[athlete]
+    ).loc[athlete]
+
+
+# --- Profil, records et allures ---
+def age(date_naissance, aujourd_hui=None):
+    """Âge en années (None si la date est illisible)"""
+    try:
+        naissance = datetime.strptime(str(date_naissance), "%Y-%m-%d").date()
+    except ValueError:
+        return None
+    return int(((aujourd_hui or date.today()) - naissance).days / 365.25)
+
+
+def records_allures(athlete):
+    """Records (h/min) et allures (min/km) d'une ligne de athletes.csv : DataFrame par distance"""
+    return pd.DataFrame({
+        "Distance": DISTANCES_RECORDS,
+        "Record": [minutes_to_hmin(athlete.get(f"Record {d}")) for d in DISTANCES_RECORDS],
+        "Allure": [pretty_allure(athlete.get(f"Allure {d}")) for d in DISTANCES_RECORDS],
+    })
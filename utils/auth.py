@@ -0,0 +1,128 @@
+import hashlib
+import hmac
+import os
+import secrets
+
+from utils.calculs import generer_identifiant
+from utils.io import load_csv, save_csv, inserer_lignes, mettre_a_jour_lignes, cache_par_version
+
+USERS_FILE = "data/users.csv"
+
+# Mots de passe stockés sous la forme "pbkdf2_sha256$<itérations>$<sel hex>$<empreinte hex>"
+ALGORITHME = "pbkdf2_sha256"
+ITERATIONS = 600_000
+
+COLONNES_USERS = ["Nom", "Mot de passe", "Role", "Identifiant"]
+
+# Compte coach créé une fois, au démarrage (creer_compte_coach), avec le mot
+# de passe de cette variable d'environnement : pas de mot de passe par défaut
+IDENTIFIANT_COACH = "coach"
+VARIABLE_MDP_COACH = "PLATEFORME_COACH_MDP"
+
+
+def hacher_mot_de_passe(mdp, iterations=ITERATIONS):
+    """Empreinte salée (PBKDF2-SHA256) d'un mot de passe"""
+    sel = secrets.token_bytes(16)
+    empreinte = hashlib.pbkdf2_hmac("sha256", mdp.encode("utf-8"), sel, iterations)
+    return f"{ALGORITHME}${iterations}${sel.hex()}${empreinte.hex()}"
+
+
+def est_hache(valeur):
+    return isinstance(valeur, str) and valeur.startswith(ALGORITHME + "$")
+
+
+def verifier_mot_de_passe(mdp, stocke):
+    """
+    Compare un mot de passe saisi à la valeur stockée (empreinte, ou texte
+    clair pour les comptes pas encore migrés), en temps constant.
+    """
+    if not isinstance(stocke, str) or not mdp:
+        return False
+    if not est_hache(stocke):
+        return hmac.compare_digest(mdp.encode("utf-8"), stocke.encode("utf-8"))
+    try:
+        _, iterations, sel, empreinte = stocke.split("$")
+        calcule = hashlib.pbkdf2_hmac("sha256", mdp.encode("utf-8"), bytes.fromhex(sel), int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(calcule.hex(), empreinte)
+
+
+def _mot_de_passe_stocke(valeur):
+    """Valeur lue dans users.csv, ou None si absente (NaN, vide, non textuelle)"""
+    return valeur if isinstance(valeur, str) and valeur else None
+
+
+def creer_compte_coach(users_file=USERS_FILE, mdp=None):
+    """
+    Crée le compte coach s'il n'existe pas encore, avec `mdp` ou à défaut le
+    mot de passe de PLATEFORME_COACH_MDP. À appeler une fois au démarrage.
+    Renvoie True si un compte coach existe, False s'il n'a pas pu être créé
+    (variable non définie).
+    """
+    users = load_csv(users_file, COLONNES_USERS)
+    if (users["Role"] == "coach").any():
+        return True
+    mdp = mdp or os.environ.get(VARIABLE_MDP_COACH)
+    if not mdp:
+        return False
+    inserer_lignes({
+        "Nom": "Coach",
+        "Mot de passe": hacher_mot_de_passe(mdp),
+        "Role": "coach",
+        "Identifiant": IDENTIFIANT_COACH,
+    }, users_file)
+    return True
+
+
+def _construire_index(users_file):
+    """{Identifiant: (Nom, Role, mot de passe stocké ou None)} ; le premier compte l'emporte"""
+    users = load_csv(users_file, COLONNES_USERS)
+    index = {}
+    for identifiant, nom, role, mdp in zip(users["Identifiant"], users["Nom"], users["Role"], users["Mot de passe"]):
+        if isinstance(identifiant, str) and identifiant not in index:
+            index[identifiant] = (nom, role, _mot_de_passe_stocke(mdp))
+    return index
+
+
+def index_identifiants(users_file=USERS_FILE):
+    """
+    Index des comptes par identifiant, reconstruit automatiquement quand
+    users.csv change. Partagé : ne pas le modifier.
+    """
+    return cache_par_version("index_identifiants", users_file, lambda: _construire_index(users_file))
+
+
+def authentifier(identifiant, mdp, role="athlete", users_file=USERS_FILE):
+    """
+    Renvoie le nom du compte si (identifiant, mot de passe, rôle) est valide,
+    sinon None. Un mot de passe encore en clair est haché à la première
+    connexion réussie.
+    """
+    identifiant = generer_identifiant(identifiant or "")
+    compte = index_identifiants(users_file).get(identifiant)
+    if compte is None or not mdp:
+        return None
+    nom, role_compte, stocke = compte
+    if role_compte != role or not verifier_mot_de_passe(mdp, stocke):
+        return None
+    if not est_hache(stocke):
+        mettre_a_jour_lignes({"Identifiant": identifiant}, {"Mot de passe": hacher_mot_de_passe(mdp)}, users_file)
+    return nom
+
+
+def migrer_mots_de_passe(users_file=USERS_FILE, iterations=ITERATIONS):
+    """Hache tous les mots de passe encore en clair, en une écriture ; renvoie le nombre de comptes migrés"""
+    users = load_csv(users_file)
+    if users.empty:
+        return 0
+    # Un mot de passe absent reste absent (et refusé), il n'est jamais haché
+    a_migrer = users["Mot de passe"].map(_mot_de_passe_stocke).notna() & ~users["Mot de passe"].map(est_hache)
+    if not a_migrer.any():
+        return 0
+    users["Mot de passe"] = users["Mot de passe"].astype(object)
+    users.loc[a_migrer, "Mot de passe"] = [
+        hacher_mot_de_passe(mdp, iterations) for mdp in users.loc[a_migrer, "Mot de passe"]
+    ]
+    save_csv(users, users_file)
+    return int(a_migrer.sum())
@@ -1,17 +1,24 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-import ast
-import json
 import unicodedata
+from utils.io import load_csv, save_csv, cache_par_version
+from utils.modele import Bloc, NB_ZONES, CONFIG_ZONES_FILE, lire_blocs, charger_seances, charger_tableau_seances
+from utils.journal import lire_feedbacks
+from utils.profilage import mesurer
 
 
 def calculer_charge_bloc(bloc):
     """Renvoie la charge d’un bloc : Durée x Répétitions x Zone"""
-    return bloc["Durée"] * bloc["Répétitions"] * int(bloc["Zone"].strip("🔘🔵🟢🟡🔴Zone "))
+    if not isinstance(bloc, Bloc):
+        bloc = Bloc.depuis_dict(bloc)
+    return bloc.charge
 
 def calculer_duree_bloc(bloc):
     """Renvoie la durée d’un bloc (min)"""
-    return bloc["Durée"] * bloc["Répétitions"]
+    if not isinstance(bloc, Bloc):
+        bloc = Bloc.depuis_dict(bloc)
+    return bloc.minutes
 
 def evolution_pourcentage(nouvelle_valeur, ancienne_valeur):
     """Renvoie l'évolution en % entre deux valeurs"""
@@ -33,57 +40,306 @@ def charge_et_duree_par_semaine(df):
     resume.columns = ["Année", "Semaine", "Charge totale", "Charge moyenne", "Volume total", "Volume moyen"]
     return resume
 
-# --- Fonctions utilitaires déplacées depuis page_athlete
-def extraire_date_lundi(chaine_semaine):
-    try:
-        jour_mois = chaine_semaine.split(" - ")[1]
-        annee = datetime.today().year
-        return datetime.strptime(f"{jour_mois}/{annee}", "%d/%m/%Y")
-    except Exception:
-        return None
+@mesurer("monotonie et contrainte")
+def monotonie_et_contrainte(matrice, fenetre=7):
+    """
+    Monotonie (moyenne / écart-type des charges quotidiennes sur `fenetre`
+    jours) et contrainte (charge de la fenêtre x monotonie) de Foster, pour
+    chaque athlète et chaque jour de la matrice athlètes x jours.
+    Renvoie un dict de DataFrames : Charge hebdo, Monotonie, Contrainte.
+    """
+    valeurs = matrice.to_numpy(dtype=float)
+    # Fenêtres glissantes sans copie ; les jours précédant la matrice comptent à 0
+    rembourre = np.pad(valeurs, ((0, 0), (fenetre - 1, 0)))
+    fenetres = np.lib.stride_tricks.sliding_window_view(rembourre, fenetre, axis=1)
+    somme = fenetres.sum(axis=2)
+    ecart = fenetres.std(axis=2, ddof=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        monotonie = np.where(ecart > 0, (somme / fenetre) / ecart, np.nan)
+
+    def cadre(v):
+        return pd.DataFrame(v, index=matrice.index, columns=matrice.columns)
+    return {
+        "Charge hebdo": cadre(somme),
+        "Monotonie": cadre(monotonie),
+        "Contrainte": cadre(somme * monotonie),
+    }
+
+def charger_monotonie_contrainte(feedbacks_file, journal_file, seances_file, fin=None):
+    """
+    monotonie_et_contrainte() sur la charge interne (session-RPE) de tous les
+    athlètes, calculé une fois par version des données et par jour.
+    Les DataFrames sont partagés : ne pas les modifier.
+    """
+    fin = pd.Timestamp(fin if fin is not None else datetime.today()).normalize()
+    return cache_par_version(
+        f"monotonie:{fin.date()}", (feedbacks_file, journal_file, seances_file),
+        lambda: monotonie_et_contrainte(
+            charger_charges_quotidiennes(feedbacks_file, journal_file, seances_file, "Charge interne", fin))
+    )
+
+def tableau_monotonie(indicateurs, jour=None):
+    """Une ligne par athlète au `jour` donné (dernier jour par défaut) : charge 7 j, monotonie, contrainte"""
+    charge = indicateurs["Charge hebdo"]
+    if charge.empty:
+        return pd.DataFrame(columns=["Athlete", "Charge 7 j", "Monotonie", "Contrainte"])
+    jour = charge.columns[-1] if jour is None else pd.Timestamp(jour).normalize()
+    return pd.DataFrame({
+        "Athlete": charge.index,
+        "Charge 7 j": charge[jour].values,
+        "Monotonie": indicateurs["Monotonie"][jour].values,
+        "Contrainte": indicateurs["Contrainte"][jour].values,
+    }).sort_values("Contrainte", ascending=False, na_position="last", ignore_index=True)
+
+# --- Assignations ---
+COLONNES_ASSIGNATIONS = ["Athlete", "Seance", "Semaine", "Lundi"]
+
+def migrer_semaines(df, reference=None):
+    """
+    Complète la clé "Lundi" (datetime64) à partir des libellés "Semaine".
+    Renvoie (df, nombre de lignes complétées).
+    """
+    df = df.copy()
+    for col in COLONNES_ASSIGNATIONS:
+        if col not in df.columns:
+            df[col] = None
+    lundis = parser_lundis(df["Lundi"])
+    manquants = lundis.isna() & df["Semaine"].notna()
+    if manquants.any():
+        devines = parser_libelles_semaine(df.loc[manquants, "Semaine"], reference)
+        lundis = lundis.where(~manquants, devines.reindex(df.index))
+    df["Lundi"] = lundis
+    return df, int((manquants & lundis.notna()).sum())
+
+def _preparer_assignations(filepath):
+    df, completees = migrer_semaines(load_csv(filepath))
+    if completees:
+        # Migration unique : la clé est enregistrée pour ne plus être devinée
+        a_sauver = df.copy()
+        a_sauver["Lundi"] = formater_lundis(df["Lundi"]).where(df["Lundi"].notna())
+        save_csv(a_sauver, filepath)
+    return df
+
+def charger_assignations(filepath):
+    """
+    Assignations avec la clé de semaine "Lundi" en datetime64, mise en cache
+    par version du fichier. Les anciennes lignes sans clé sont migrées.
+    """
+    return cache_par_version("assignations", filepath, lambda: _preparer_assignations(filepath)).copy()
+
+# --- Temps passé par zone ---
+def exploser_blocs(seances_modele):
+    """
+    Table longue (Seance, Zone, Minutes) : une ligne par séance et par zone
+    effectivement parcourue, construite depuis le modèle {nom: Seance}.
+    """
+    noms = list(seances_modele)
+    if not noms:
+        return pd.DataFrame({"Seance": [], "Zone": [], "Minutes": []})
+    minutes = np.array([seances_modele[n].minutes_par_zone for n in noms], dtype=float)
+    i_seance, i_zone = np.nonzero(minutes)
+    return pd.DataFrame({
+        "Seance": np.asarray(noms, dtype=object)[i_seance],
+        "Zone": i_zone + 1,
+        "Minutes": minutes[i_seance, i_zone],
+    })
+
+def table_blocs(seances_modele):
+    """Table (Seance, Zone, Minutes) : une ligne par bloc, pour chiffrer les blocs un à un"""
+    lignes = [(nom, b.zone_num, b.minutes) for nom, s in seances_modele.items() for b in s.blocs]
+    return pd.DataFrame(lignes, columns=["Seance", "Zone", "Minutes"])
+
+def charger_table_blocs(filepath, config_file=CONFIG_ZONES_FILE):
+    """table_blocs() de seances_struct.csv, une fois par version du fichier et des coefficients"""
+    return cache_par_version(
+        "table_blocs", (filepath, config_file),
+        lambda: table_blocs(charger_seances(filepath, config_file))
+    )
+
+def charger_blocs_long(filepath):
+    """exploser_blocs() de seances_struct.csv, calculé une fois par version du fichier"""
+    return cache_par_version("blocs_long", filepath, lambda: exploser_blocs(charger_seances(filepath)))
+
+def semaines_glissantes(date_ref, nb_semaines=6):
+    """Lundis des `nb_semaines` semaines se terminant à date_ref, le plus ancien en premier"""
+    lundi = lundi_semaine([date_ref]).iloc[0]
+    return [lundi - pd.Timedelta(weeks=delta) for delta in range(nb_semaines - 1, -1, -1)]
+
+@mesurer("agrégation temps par zone")
+def temps_par_zone(assignations, blocs_long, semaines, athletes=None):
+    """
+    Minutes planifiées par athlète, semaine et zone, en un seul groupby.
+    Renvoie un DataFrame indexé par (Athlete, Lundi) avec une colonne par
+    zone (1 à 7) ; toutes les semaines demandées sont présentes, à 0 si vides.
+    """
+    zones = list(range(1, NB_ZONES + 1))
+    semaines = pd.DatetimeIndex(semaines)
+    df = assignations[assignations["Lundi"].isin(semaines)]
+    if athletes is not None:
+        df = df[df["Athlete"].isin(athletes)]
+    else:
+        athletes = df["Athlete"].unique()
+
+    df = df[["Athlete", "Seance", "Lundi"]].merge(blocs_long, on="Seance", how="inner")
+    matrice = (
+        df.groupby(["Athlete", "Lundi", "Zone"])["Minutes"].sum()
+        .unstack("Zone")
+        .reindex(columns=zones)
+    )
+    index = pd.MultiIndex.from_product([list(athletes), semaines], names=["Athlete", "Lundi"])
+    return matrice.reindex(index).fillna(0)
+
+# --- Charge quotidienne et ratio aigu:chronique (ACWR) ---
+# Charge interne = Volume total x RPE (session-RPE), charge externe = Charge totale
+CHARGES = ["Charge interne", "Charge totale"]
+ZONES_ACWR = ["Sous-charge", "Optimal", "Vigilance", "Danger"]
+
+@mesurer("charges quotidiennes")
+def charges_quotidiennes(feedbacks, seances, charge="Charge interne", fin=None, chronique=28):
+    """
+    Matrice athlètes x jours des charges des séances effectuées, tous les
+    athlètes en un seul groupby. Les jours sans séance valent 0 ; la matrice
+    couvre au moins les `chronique` jours qui précèdent `fin` (aujourd'hui par défaut).
+    `seances` : DataFrame (Seance, Charge totale, Volume total).
+    """
+    fin = pd.Timestamp(fin if fin is not None else datetime.today()).normalize()
+    fb = feedbacks[feedbacks["Effectuee"] == "Oui"]
+    jours = pd.to_datetime(fb["Date seance"], format="ISO8601", errors="coerce").dt.normalize()
+    # Sans date de séance, on retient le lundi de la semaine
+    jours = jours.fillna(pd.Series(lundi_semaine(fb["Semaine"]).values, index=fb.index))
+    fb = pd.DataFrame({
+        "Athlete": fb["Athlete"].values,
+        "Seance": fb["Seance"].values,
+        "Jour": jours.values,
+        "RPE": pd.to_numeric(fb["RPE"], errors="coerce").values,
+    }).merge(seances, on="Seance", how="inner")
+    fb["Charge interne"] = fb["Volume total"] * fb["RPE"]
+    fb = fb[fb["Jour"] <= fin]
+
+    debut = min(fb["Jour"].min(), fin - pd.Timedelta(days=chronique - 1)) if not fb.empty else fin
+    matrice = fb.groupby(["Athlete", "Jour"])[charge].sum().unstack("Jour")
+    return matrice.reindex(columns=pd.date_range(debut, fin, freq="D")).fillna(0.0)
+
+def _moyenne_glissante(valeurs, fenetre):
+    """Moyenne des `fenetre` derniers jours (axe 1), jours antérieurs au début comptés à 0"""
+    cumul = np.cumsum(valeurs, axis=1)
+    cumul[:, fenetre:] = cumul[:, fenetre:] - cumul[:, :-fenetre]
+    return cumul / fenetre
+
+@mesurer("ACWR")
+def calculer_acwr(matrice, aigu=7, chronique=28):
+    """
+    ACWR de chaque athlète pour chaque jour de la matrice, tous les athlètes
+    en une passe :
+    - couplé : moyenne sur `aigu` jours / moyenne sur `chronique` jours ;
+    - EWMA : moyennes exponentielles, lambda = 2 / (N + 1).
+    Renvoie un dict de DataFrames (même forme que la matrice) :
+    Aigue, Chronique, ACWR couple, Aigue EWMA, Chronique EWMA, ACWR EWMA.
+    """
+    valeurs = matrice.to_numpy(dtype=float)
+    aigue = _moyenne_glissante(valeurs, aigu)
+    chron = _moyenne_glissante(valeurs, chronique)
+    # ewm par colonne : on transpose pour traiter tous les athlètes d'un coup
+    aigue_ewma = matrice.T.ewm(alpha=2 / (aigu + 1), adjust=False).mean().T.to_numpy()
+    chron_ewma = matrice.T.ewm(alpha=2 / (chronique + 1), adjust=False).mean().T.to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        couple = np.where(chron > 0, aigue / chron, np.nan)
+        ewma = np.where(chron_ewma > 0, aigue_ewma / chron_ewma, np.nan)
+
+    def cadre(v):
+        return pd.DataFrame(v, index=matrice.index, columns=matrice.columns)
+    return {
+        "Aigue": cadre(aigue * aigu),
+        "Chronique": cadre(chron * aigu),
+        "ACWR couple": cadre(couple),
+        "Aigue EWMA": cadre(aigue_ewma),
+        "Chronique EWMA": cadre(chron_ewma),
+        "ACWR EWMA": cadre(ewma),
+    }
+
+def zone_acwr(ratios):
+    """<0.8 sous-charge, 0.8-1.3 optimal, 1.3-1.5 vigilance, >1.5 danger ; vectorisé"""
+    ratios = np.asarray(ratios, dtype=float)
+    return np.select(
+        [np.isnan(ratios), ratios < 0.8, ratios <= 1.3, ratios <= 1.5],
+        ["", *ZONES_ACWR[:3]], default=ZONES_ACWR[3]
+    )
+
+def tableau_risque_acwr(matrice, jour=None, aigu=7, chronique=28):
+    """
+    Une ligne par athlète au `jour` donné (dernier jour de la matrice par
+    défaut) : charge des 7 derniers jours, charge chronique hebdomadaire
+    (moyenne 28 j x 7), ACWR couplé et EWMA avec leur zone de risque.
+    """
+    colonnes = ["Athlete", "Charge 7 j", "Charge chronique (hebdo)",
+                "ACWR couple", "Zone couple", "ACWR EWMA", "Zone EWMA"]
+    if matrice.empty:
+        return pd.DataFrame(columns=colonnes)
+    acwr = calculer_acwr(matrice, aigu, chronique)
+    jour = matrice.columns[-1] if jour is None else pd.Timestamp(jour).normalize()
+    risque = pd.DataFrame({
+        "Athlete": matrice.index,
+        "Charge 7 j": acwr["Aigue"][jour].values,
+        "Charge chronique (hebdo)": acwr["Chronique"][jour].values,
+        "ACWR couple": acwr["ACWR couple"][jour].values,
+        "ACWR EWMA": acwr["ACWR EWMA"][jour].values,
+    })
+    risque["Zone couple"] = zone_acwr(risque["ACWR couple"])
+    risque["Zone EWMA"] = zone_acwr(risque["ACWR EWMA"])
+    return risque[colonnes].sort_values("ACWR EWMA", ascending=False, na_position="last", ignore_index=True)
+
+def charger_charges_quotidiennes(feedbacks_file, journal_file, seances_file, charge="Charge interne", fin=None):
+    """charges_quotidiennes() depuis les fichiers, calculé une fois par version des données et par jour"""
+    fin = pd.Timestamp(fin if fin is not None else datetime.today()).normalize()
+    return cache_par_version(
+        f"charges_quotidiennes:{charge}:{fin.date()}", (feedbacks_file, journal_file, seances_file),
+        lambda: charges_quotidiennes(lire_feedbacks(feedbacks_file, journal_file),
+                                     charger_tableau_seances(seances_file), charge, fin)
+    )
 
+def charger_risque_acwr(feedbacks_file, journal_file, seances_file, charge="Charge interne", jour=None):
+    """tableau_risque_acwr() depuis les fichiers, mis en cache par version des données"""
+    jour = pd.Timestamp(jour if jour is not None else datetime.today()).normalize()
+    return cache_par_version(
+        f"risque_acwr:{charge}:{jour.date()}", (feedbacks_file, journal_file, seances_file),
+        lambda: tableau_risque_acwr(
+            charger_charges_quotidiennes(feedbacks_file, journal_file, seances_file, charge, jour), jour)
+    ).copy()
+
+# --- Fonctions utilitaires déplacées depuis page_athlete
 def format_h_min(minutes):
     h = int(minutes) // 60
     m = int(minutes) % 60
     return f"{h}h{m:02d}"
 
-def afficher_blocs(blocs):
-    if not blocs or isinstance(blocs, float):
-        return ""
+EMOJI_ZONE = {
+    1: "🔘",
+    2: "🔵",
+    3: "🟢",
+    4: "🟡",
+    5: "🔴",
+    6: "🟤",
+    7: "🟣"
+}
 
-    if isinstance(blocs, str):
-        try:
-            blocs = json.loads(blocs)
-        except Exception:
-            return ""
+def _suffixe_allure(bloc, allures):
+    """" – 4:35–4:50 /km" : plage d'allure de l'athlète dans la zone du bloc, "" si inconnue"""
+    allure = (allures or {}).get(bloc.zone_num)
+    return f" – {allure}" if allure else ""
 
-    if not isinstance(blocs, list):
-        return ""
-
-    def zone_to_emoji(zone):
-        z = str(zone).strip()[-1]  # Dernier caractère, souvent un chiffre
-        return {
-            "1": "🔘",
-            "2": "🔵",
-            "3": "🟢",
-            "4": "🟡",
-            "5": "🔴",
-            "6": "🟤",
-            "7": "🟣"
-        }.get(z, "🎯")
+def afficher_blocs(blocs, allures=None):
+    """
+    Affiche les blocs d'une séance (Seance, liste de Bloc ou JSON).
+    `allures` : {zone: plage d'allure} de l'athlète (utils.zones.tables_allures).
+    """
+    blocs = lire_blocs(blocs)
 
     lignes = []
     for b in blocs:
-        repetitions = b.get('Répétitions', 1)
-        volume = b.get('Volume total') or b.get('Durée', '')
-        zone = b.get('Zone', '')
-        type_ = b.get('Type', '')
-        description = b.get('Description', '')
-
-        emoji_zone = zone_to_emoji(zone)
-        ligne = f"{repetitions}× {volume}min ⏱ – {zone} {emoji_zone} [{type_}]"
-        if description:
-            ligne += f" - {description}"
+        emoji_zone = EMOJI_ZONE.get(b.zone_num, "🎯")
+        ligne = f"{b.repetitions}× {b.minutes}min ⏱ – {b.zone} {emoji_zone}{_suffixe_allure(b, allures)} [{b.type}]"
+        if b.description:
+            ligne += f" - {b.description}"
         lignes.append(ligne)
 
     return "\n".join(lignes)
@@ -112,12 +368,7 @@ def calc_allure(dist_km, t_min):
     return round(t_min / dist_km, 2) if t_min > 0 else None
 
 def parse_blocs(blocs_str):
-    if isinstance(blocs_str, str):
-        try:
-            return ast.literal_eval(blocs_str)
-        except:
-            return []
-    return blocs_str
+    return list(lire_blocs(blocs_str))
 
 def calcul_imc(poids, taille_cm):
     taille_m = taille_cm / 100
@@ -144,45 +395,76 @@ def regrouper_zone(zone_num):
     else:
         return None
     
-def format_blocs(blocs):
-    if not blocs or isinstance(blocs, float):
-        return ""
-
-    if isinstance(blocs, str):
-        try:
-            blocs = ast.literal_eval(blocs)
-        except (ValueError, SyntaxError):
-            return ""
-
+def format_blocs(blocs, allures=None):
     lines = []
-    for b in blocs:
-        repetitions = b.get('Répétitions', 1)
-        duree = b.get('Durée', '')
-        zone = b.get('Zone', '')
-        bloc_type = b.get('Type', '')
-        description = b.get('Description', '')
-
-        ligne = f"{repetitions}× {duree}min {zone} [{bloc_type}]"
-        if description:
-            ligne += f" - {description}"
+    for b in lire_blocs(blocs):
+        ligne = f"{b.repetitions}× {b.duree}min {b.zone}{_suffixe_allure(b, allures)} [{b.type}]"
+        if b.description:
+            ligne += f" - {b.description}"
         lines.append(ligne)
     return "\n".join(lines)
 
-def formater_semaine(date_obj):
-    semaine_num = f"{date_obj.isocalendar()[1]:02d}"
-    lundi = date_obj.strftime("%d/%m")
-    return f"S{semaine_num} - {lundi}"
-
 def extraire_date_lundi(chaine_semaine):
-    try:
-        jour_mois = chaine_semaine.split(" - ")[1]
-        jour, mois = map(int, jour_mois.split("/"))
-        today = datetime.today()
-        annee = today.year if mois >= today.month else today.year - 1
-        return datetime.strptime(f"{jour_mois}/{annee}", "%d/%m/%Y")
-    except Exception:
-        return None
-    
+    """Lundi (datetime) d'un libellé "S27 - 30/06", None s'il est illisible"""
+    lundi = parser_libelles_semaine(pd.Series([chaine_semaine])).iloc[0]
+    return None if pd.isna(lundi) else lundi.to_pydatetime()
+
+# --- Clé de semaine canonique ---
+# Une semaine est identifiée par la date ISO (AAAA-MM-JJ) de son lundi :
+# colonne "Lundi" des assignations, colonne "Semaine" des feedbacks.
+def lundi_semaine(dates):
+    """Lundi (à minuit) de la semaine de chaque date, vectorisé"""
+    dates = pd.Series(dates)
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, format="ISO8601", errors="coerce")
+    return (dates - pd.to_timedelta(dates.dt.weekday, unit="D")).dt.normalize()
+
+def parser_lundis(valeurs):
+    """Colonne "AAAA-MM-JJ" -> datetime64, vectorisé"""
+    valeurs = pd.Series(valeurs)
+    if not pd.api.types.is_datetime64_any_dtype(valeurs):
+        valeurs = pd.to_datetime(valeurs.astype("string"), format="ISO8601", errors="coerce")
+    return valeurs.dt.normalize()
+
+def formater_lundis(lundis):
+    """datetime64 -> "AAAA-MM-JJ" (format de stockage de la clé de semaine)"""
+    return pd.to_datetime(pd.Series(lundis)).dt.strftime("%Y-%m-%d")
+
+def libelles_semaine(lundis):
+    """Libellés d'affichage "S27 - 30/06", vectorisé (équivalent de formater_semaine)"""
+    lundis = pd.to_datetime(pd.Series(lundis))
+    numeros = lundis.dt.isocalendar().week.astype("Int64").astype(str).str.zfill(2)
+    return ("S" + numeros + " - " + lundis.dt.strftime("%d/%m")).where(lundis.notna())
+
+def parser_libelles_semaine(libelles, reference=None):
+    """
+    Libellés "S27 - 30/06" -> lundi (datetime64), vectorisé.
+    L'année n'est pas dans le libellé : parmi l'année de référence et ses
+    voisines, on retient celle où le jj/mm tombe un lundi de la semaine
+    ISO indiquée, la plus proche de la date de référence (aujourd'hui).
+    """
+    libelles = pd.Series(libelles)
+    reference = pd.Timestamp(reference or datetime.today()).normalize()
+    parties = libelles.astype(str).str.extract(r"S(\d{1,2})\s*-\s*(\d{1,2})/(\d{1,2})").dropna().astype(int)
+    semaine, jour, mois = parties[0], parties[1], parties[2]
+
+    meilleur = pd.Series(pd.NaT, index=parties.index, dtype="datetime64[ns]")
+    ecart_min = pd.Series(np.inf, index=parties.index)
+    for annee in (reference.year - 1, reference.year, reference.year + 1):
+        with np.errstate(invalid="ignore"):  # dates impossibles (31/02) -> NaT
+            candidat = pd.to_datetime(
+                pd.DataFrame({"year": annee, "month": mois, "day": jour}), errors="coerce"
+            )
+        valide = (
+            (candidat.dt.weekday == 0)
+            & (candidat.dt.isocalendar().week == semaine)
+        ).fillna(False).astype(bool)
+        ecart = (candidat - reference).abs().dt.days.astype(float).where(valide, np.inf)
+        mieux = ecart < ecart_min
+        meilleur = meilleur.mask(mieux, candidat)
+        ecart_min = ecart_min.mask(mieux, ecart)
+    return meilleur.reindex(libelles.index)
+
 def evolution_pct(df, col, semaine_courante):
     if semaine_courante not in df.index:
         return 0, 0
@@ -197,11 +479,15 @@ def evolution_pct(df, col, semaine_courante):
     pct = (delta / prev * 100) if prev else 0
     return delta, pct
 
-def generer_identifiant(nom_complet):
+def normaliser_texte(texte):
+    """Minuscules, sans accents (comparaisons et recherche insensibles aux accents)"""
     # Met en minuscules
-    nom = nom_complet.strip().lower()
+    texte = texte.strip().lower()
     # Supprime les accents
-    nom = unicodedata.normalize('NFKD', nom).encode('ASCII', 'ignore').decode('utf-8')
+    return unicodedata.normalize('NFKD', texte).encode('ASCII', 'ignore').decode('utf-8')
+
+def generer_identifiant(nom_complet):
+    nom = normaliser_texte(nom_complet)
     # Supprime les espaces
     identifiant = nom.replace(" ", "")
     return identifiant
@@ -0,0 +1,143 @@
+"""
+Coefficients de charge par zone : configuration versionnée
+(utils.modele.CONFIG_ZONES_FILE) et re-chiffrage de toute la bibliothèque
+de séances, d'un coup, quand ils changent.
+"""
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from utils.io import load_csv, save_csv, inserer_lignes
+from utils.modele import (NB_ZONES, CONFIG_ZONES_FILE, COLONNES_CONFIG_ZONES, coefficients_configures, charge_bloc,
+                          extraire_zone_num, duree_repetitions)
+from utils.calculs import charger_table_blocs
+from utils.agregats import FICHIERS, reconstruire_agregats
+from utils.profilage import mesurer
+
+COLONNES_ZONES = [f"Zone {z}" for z in range(1, NB_ZONES + 1)]
+
+
+# --- Configuration versionnée ---
+def historique_coefficients(config_file=CONFIG_ZONES_FILE):
+    """Une ligne par version (Version, Date, Zone 1 ... Zone 7), la plus récente en premier"""
+    config = load_csv(config_file, COLONNES_CONFIG_ZONES)
+    if config.empty:
+        return pd.DataFrame(columns=["Version", "Date"] + COLONNES_ZONES)
+    historique = config.pivot_table(index=["Version", "Date"], columns="Zone", values="Coefficient", aggfunc="last")
+    historique.columns = [f"Zone {int(z)}" for z in historique.columns]
+    return historique.reset_index().sort_values("Version", ascending=False, ignore_index=True)
+
+
+def enregistrer_coefficients(coefficients, config_file=CONFIG_ZONES_FILE):
+    """Ajoute une version des coefficients ({zone: coefficient}) ; renvoie son numéro"""
+    version = coefficients_configures(config_file)[0] + 1
+    date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    inserer_lignes([
+        {"Version": version, "Date": date, "Zone": z, "Coefficient": float(coefficients[z])}
+        for z in range(1, NB_ZONES + 1)
+    ], config_file)
+    return version
+
+
+# --- Re-chiffrage en masse ---
+def _lire_json(valeur):
+    """Liste de blocs si la valeur enregistre des charges par bloc, sinon None (pas de décodage)"""
+    if not isinstance(valeur, str) or not ('"Charge"' in valeur or '"Coeff zone"' in valeur):
+        return None
+    try:
+        blocs = json.loads(valeur)
+    except ValueError:
+        return None
+    return blocs if isinstance(blocs, list) else None
+
+
+def rechiffrer_blocs(valeurs, coefficients):
+    """
+    Colonne Blocs (JSON) avec "Coeff zone" et "Charge" recalculés dans les
+    blocs qui les enregistrent (charge_bloc, en un seul calcul vectorisé).
+    Une valeur où rien ne change est renvoyée telle quelle.
+    """
+    valeurs = list(valeurs)
+    seances, blocs_chiffres, minutes, coeffs = {}, [], [], []
+    for i, valeur in enumerate(valeurs):
+        blocs = _lire_json(valeur)
+        for bloc in blocs or ():
+            if not isinstance(bloc, dict) or not ("Charge" in bloc or "Coeff zone" in bloc):
+                continue
+            zone = extraire_zone_num(bloc)
+            if zone is None:
+                continue
+            duree, repetitions = duree_repetitions(bloc)
+            seances[i] = blocs
+            blocs_chiffres.append((i, bloc))
+            minutes.append(duree * repetitions)
+            coeffs.append(float(coefficients.get(zone, 0)))
+    charges = charge_bloc(np.asarray(minutes, dtype=float), np.asarray(coeffs, dtype=float))
+    modifiees = set()
+    for (i, bloc), coeff, charge in zip(blocs_chiffres, coeffs, charges):
+        for cle, val in (("Coeff zone", f"{coeff:.2f}"), ("Charge", int(charge))):
+            if cle in bloc and bloc[cle] != val:
+                bloc[cle] = val
+                modifiees.add(i)
+    for i in modifiees:
+        valeurs[i] = json.dumps(seances[i])
+    return valeurs
+
+
+def recalculer_charges(seances, blocs, coefficients):
+    """
+    seances_struct avec "Charge totale" recalculée pour toutes les séances en
+    un groupby sur `blocs` (table_blocs) : somme des charges des blocs,
+    chacune arrondie comme dans l'éditeur de séances (charge_bloc). Une
+    séance sans bloc en zone garde sa charge enregistrée. La charge et le
+    coefficient enregistrés dans chaque bloc (colonne Blocs) suivent.
+    """
+    blocs = blocs.dropna(subset=["Zone"])
+    charges = pd.Series(
+        charge_bloc(blocs["Minutes"].to_numpy(dtype=float), blocs["Zone"].map(coefficients).fillna(0).to_numpy(dtype=float)),
+        index=blocs.index,
+    ).groupby(blocs["Seance"]).sum()
+    anciennes = pd.to_numeric(seances["Charge totale"], errors="coerce")
+    nouvelles = seances["Nom"].map(charges).fillna(anciennes)
+    colonnes = {"Charge totale": nouvelles.round().astype("Int64")}
+    if "Blocs" in seances.columns:
+        colonnes["Blocs"] = rechiffrer_blocs(seances["Blocs"], coefficients)
+    return seances.assign(**colonnes)
+
+
+@mesurer("re-chiffrage des séances")
+def rechiffrer_seances(seances_file, config_file=CONFIG_ZONES_FILE):
+    """
+    Réécrit "Charge totale" (et les charges des blocs) de toute la
+    bibliothèque avec les coefficients en vigueur (une seule écriture) ;
+    renvoie le nombre de séances modifiées.
+    """
+    seances = load_csv(seances_file)
+    if seances.empty or "Charge totale" not in seances.columns:
+        return 0
+    recalculees = recalculer_charges(seances, charger_table_blocs(seances_file, config_file),
+                                     coefficients_configures(config_file)[1])
+    avant = pd.to_numeric(seances["Charge totale"], errors="coerce").to_numpy(dtype=float)
+    apres = recalculees["Charge totale"].to_numpy(dtype=float, na_value=np.nan)
+    changees = ~np.isclose(avant, apres, equal_nan=True)
+    if "Blocs" in seances.columns:
+        changees |= (seances["Blocs"] != recalculees["Blocs"]).to_numpy() & seances["Blocs"].notna().to_numpy()
+    modifiees = int(changees.sum())
+    if modifiees:
+        save_csv(recalculees, seances_file)
+    return modifiees
+
+
+def appliquer_coefficients(coefficients, seances_file, config_file=CONFIG_ZONES_FILE, fichiers=FICHIERS):
+    """
+    Enregistre une nouvelle version des coefficients, re-chiffre toutes les
+    séances puis, si des charges ont changé, reconstruit la vue hebdomadaire
+    (charges planifiées et réalisées). Renvoie (version, séances modifiées).
+    """
+    version = enregistrer_coefficients(coefficients, config_file)
+    modifiees = rechiffrer_seances(seances_file, config_file)
+    if modifiees:
+        reconstruire_agregats(fichiers)
+    return version, modifiees
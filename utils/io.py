@@ -1,14 +1,645 @@
+import atexit
+import csv
 import os
+import sqlite3
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import closing, contextmanager
+from datetime import date, datetime
+
+import numpy as np
 import pandas as pd
 
+from utils.profilage import mesurer, RACINE_PROJET
+
+# --- Choix du stockage ---
+# "csv" (par défaut) : un fichier par table, comme historiquement.
+# "sqlite" : une base data/plateforme.db en mode WAL, écritures ligne à ligne.
+STOCKAGE = os.environ.get("PLATEFORME_STOCKAGE", "csv").lower()
+SQLITE_NOM = "plateforme.db"
+# Toutes les tables du projet (data/*.csv comme extras_seances.csv à la
+# racine) vont dans data/plateforme.db ; un fichier hors du projet (tests,
+# benchmarks) a sa propre base dans son dossier.
+SQLITE_BASE = os.path.join(RACINE_PROJET, "data", SQLITE_NOM)
+
+# Taille maximale du cache mémoire partagé (en Mo)
+CACHE_MAX_MO = int(os.environ.get("PLATEFORME_CACHE_MO", "256"))
+
+# Index créés sur les tables qui possèdent les colonnes concernées
+INDEX_SQLITE = [
+    ("Athlete", "Semaine"),
+    ("Athlete", "Seance", "Semaine"),
+    ("Athlete", "Lundi"),
+]
+# Type SQLite d'une colonne selon son dtype pandas (les mêmes que DataFrame.to_sql)
+TYPES_SQLITE = {"i": "INTEGER", "u": "INTEGER", "b": "INTEGER", "f": "REAL", "M": "TIMESTAMP"}
+
+
+FORMAT_DATE_SQL = "%Y-%m-%d %H:%M:%S"
+
+
+def _est_date(val):
+    return isinstance(val, date) and val is not pd.NaT
+
+
+def _texte(val):
+    """Texte d'une valeur de critère ; une date au format complet (voir _colonne_texte)"""
+    return pd.Timestamp(val).strftime(FORMAT_DATE_SQL) if _est_date(val) else str(val)
+
+
+def _colonne_texte(serie, val):
+    """
+    Colonne en texte comparable à _texte(val). Pour un critère date, la
+    colonne est relue comme date : "2025-01-06" et "2025-01-06 00:00:00"
+    (selon ce que to_csv a écrit) désignent le même jour.
+    """
+    if _est_date(val):
+        return pd.to_datetime(serie, errors="coerce", format="ISO8601").dt.strftime(FORMAT_DATE_SQL)
+    return serie.astype(str)
+
+
+def _masque(df, criteres):
+    """Masque booléen des lignes correspondant à tous les critères {colonne: valeur}"""
+    masque = pd.Series(True, index=df.index)
+    for col, val in criteres.items():
+        if col not in df.columns:
+            return pd.Series(False, index=df.index)
+        masque &= _colonne_texte(df[col], val) == _texte(val)
+    return masque
+
+
+def _op_ecrire(df, nouveau):
+    return nouveau, None, True
+
+
+def _op_inserer(df, lignes):
+    nouveau = pd.DataFrame(lignes)
+    if df is not None:
+        nouveau = pd.concat([df, nouveau], ignore_index=True)
+    return nouveau, len(lignes), bool(lignes)
+
+
+def _op_mettre_a_jour(df, criteres, valeurs):
+    if df is None:
+        return df, 0, False
+    masque = _masque(df, criteres)
+    n = int(masque.sum())
+    if n:
+        df = df.copy()
+        for col, val in valeurs.items():
+            if col not in df.columns:
+                df[col] = None
+            df[col] = df[col].astype(object)
+            df.loc[masque, col] = val
+    return df, n, bool(n)
+
+
+def _op_supprimer(df, criteres):
+    if df is None:
+        return df, 0, False
+    masque = _masque(df, criteres)
+    n = int(masque.sum())
+    return (df[~masque] if n else df), n, bool(n)
+
+
+def _op_supprimer_cles(df, colonnes, cles):
+    if df is None or not cles or any(c not in df.columns for c in colonnes):
+        return df, 0, False
+    textes = pd.DataFrame({c: _colonne_texte(df[c], v) for c, v in zip(colonnes, cles[0])})
+    cles = {tuple(_texte(v) for v in cle) for cle in cles}
+    masque = pd.MultiIndex.from_frame(textes).isin(cles)
+    n = int(masque.sum())
+    return (df[~masque] if n else df), n, bool(n)
+
+
+def _op_remplacer(df, criteres, ligne):
+    df, n, modifie = _op_mettre_a_jour(df, criteres, ligne)
+    if n == 0:
+        df, _, modifie = _op_inserer(df, [ligne])
+    return df, n, modifie
+
+
+# Mutations applicables en mémoire à un DataFrame : (df, *args) -> (df, résultat, modifié)
+_OPERATIONS_CSV = {
+    "ecrire": _op_ecrire,
+    "inserer": _op_inserer,
+    "mettre_a_jour": _op_mettre_a_jour,
+    "supprimer": _op_supprimer,
+    "supprimer_cles": _op_supprimer_cles,
+    "remplacer": _op_remplacer,
+}
+
+
+class StockageCSV:
+    """Stockage historique : chaque table est un fichier CSV réécrit en entier."""
+
+    def version(self, filepath):
+        """Version du fichier sur disque : (mtime, taille), None s'il n'existe pas"""
+        try:
+            st = os.stat(filepath)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def lire(self, filepath):
+        # Sous verrou : un ajout en fin de fichier ne doit pas être lu à moitié
+        with verrou_fichier(filepath):
+            if os.path.exists(filepath):
+                return pd.read_csv(filepath)
+        return None
+
+    def ecrire(self, df, filepath):
+        """Écriture atomique : fichier temporaire du même dossier puis renommage"""
+        dossier = os.path.dirname(filepath) or "."
+        os.makedirs(dossier, exist_ok=True)
+        fd, temporaire = tempfile.mkstemp(dir=dossier, prefix="." + os.path.basename(filepath), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+                df.to_csv(f, index=False)
+            os.replace(temporaire, filepath)
+        except BaseException:
+            if os.path.exists(temporaire):
+                os.remove(temporaire)
+            raise
+
+    def inserer(self, lignes, filepath):
+        """Ajoute des lignes en fin de fichier, sans relire ni réécrire l'existant."""
+        if not lignes:
+            return 0
+        entete = None
+        if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
+            with open(filepath, newline="", encoding="utf-8") as f:
+                entete = next(csv.reader(f), None)
+
+        colonnes = list(dict.fromkeys(c for ligne in lignes for c in ligne))
+        if entete is None or not set(colonnes) <= set(entete):
+            # Nouvelle table ou nouvelles colonnes : réécriture complète
+            nouveau, n, _ = _op_inserer(self.lire(filepath), lignes)
+            self.ecrire(nouveau, filepath)
+            return n
+
+        df = pd.DataFrame(lignes).reindex(columns=entete)
+        besoin_saut = False
+        with open(filepath, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            besoin_saut = f.read(1) not in (b"\n", b"\r")
+        with open(filepath, "a", newline="", encoding="utf-8") as f:
+            if besoin_saut:
+                f.write("\n")
+            df.to_csv(f, index=False, header=False)
+        return len(lignes)
+
+    def appliquer(self, operations, filepath):
+        """
+        Applique une suite de mutations [(nom, *args)] au fichier en une seule
+        écriture. Des ajouts seuls restent des ajouts en fin de fichier.
+        Renvoie le résultat de chaque mutation.
+        """
+        if all(op[0] == "inserer" for op in operations):
+            self.inserer([ligne for op in operations for ligne in op[1]], filepath)
+            return [len(op[1]) for op in operations]
+        df = self.lire(filepath)
+        resultats, modifie = [], False
+        for nom, *args in operations:
+            df, resultat, change = _OPERATIONS_CSV[nom](df, *args)
+            resultats.append(resultat)
+            modifie = modifie or change
+        if modifie:
+            self.ecrire(df, filepath)
+        return resultats
+
+
+def _valeur_sql(val):
+    """Convertit une valeur pandas / numpy / date en type accepté par sqlite3"""
+    if val is None or val is pd.NA or val is pd.NaT:
+        return None
+    if isinstance(val, (np.generic,)):
+        val = val.item()
+    if isinstance(val, float) and np.isnan(val):
+        return None
+    if isinstance(val, (pd.Timestamp, datetime)):
+        return val.strftime(FORMAT_DATE_SQL)
+    if isinstance(val, date):
+        return val.isoformat()
+    return val
+
+
+class StockageSQLite:
+    """
+    Stockage SQLite (mode WAL) : une base par dossier de données, une table par
+    fichier CSV (assignments.csv -> table "assignments"). Au premier accès,
+    une table absente est initialisée depuis le CSV existant.
+    """
+
+    def __init__(self):
+        # Tables déjà initialisées depuis leur CSV dans ce processus : (base, table)
+        self._preparees = set()
+        self._verrou = threading.Lock()
+
+    def _base(self, filepath):
+        chemin = os.path.abspath(filepath)
+        if os.path.commonpath([chemin, RACINE_PROJET]) == RACINE_PROJET:
+            return SQLITE_BASE
+        return os.path.join(os.path.dirname(chemin), SQLITE_NOM)
+
+    def _table(self, filepath):
+        return os.path.splitext(os.path.basename(filepath))[0]
+
+    def version(self, filepath):
+        """Version de la base (fichier principal + WAL) : toutes les tables la partagent"""
+        base = self._base(filepath)
+        etat = []
+        for chemin in (base, base + "-wal"):
+            try:
+                st = os.stat(chemin)
+                etat.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                etat.append(None)
+        # Tant que la base n'existe pas, c'est le CSV historique qui fait foi
+        if etat[0] is None:
+            return StockageCSV().version(filepath)
+        return tuple(etat)
+
+    def _connexion(self, filepath):
+        base = self._base(filepath)
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+        conn = sqlite3.connect(base, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _transaction(self, filepath):
+        """
+        Connexion dont tout le travail, DDL compris (sqlite3 ne l'englobe pas
+        implicitement), forme une seule transaction : validée à la sortie,
+        annulée en cas d'erreur.
+        """
+        with closing(self._connexion(filepath)) as conn, conn:
+            conn.execute("BEGIN")
+            yield conn
+
+    def _colonnes(self, conn, table):
+        return [r[1] for r in conn.execute(f'PRAGMA table_info("{table}")')]
+
+    def _indexer(self, conn, table):
+        colonnes = self._colonnes(conn, table)
+        for cols in INDEX_SQLITE:
+            if all(c in colonnes for c in cols):
+                nom = f"idx_{table}_" + "_".join(c.lower() for c in cols)
+                liste = ", ".join(f'"{c}"' for c in cols)
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "{nom}" ON "{table}" ({liste})')
+
+    def _preparer(self, conn, filepath):
+        """Crée la table depuis le CSV historique si elle n'existe pas encore"""
+        table = self._table(filepath)
+        if self._colonnes(conn, table):
+            return table
+        if os.path.exists(filepath):
+            df = pd.read_csv(filepath)
+            # Un CSV vide ne donne pas les types des colonnes : la table sera
+            # créée à la première insertion
+            if not df.empty:
+                self._creer_table(conn, table, df)
+        return table
+
+    def _creer_table(self, conn, table, df):
+        """(Re)crée la table aux types des colonnes de df et y insère ses lignes, dans la transaction en cours"""
+        conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        if df.columns.empty:
+            return
+        colonnes = ", ".join(f'"{c}" {TYPES_SQLITE.get(df[c].dtype.kind, "TEXT")}' for c in df.columns)
+        conn.execute(f'CREATE TABLE "{table}" ({colonnes})')
+        marques = ", ".join("?" for _ in df.columns)
+        conn.executemany(
+            f'INSERT INTO "{table}" VALUES ({marques})',
+            [[_valeur_sql(v) for v in ligne] for ligne in df.astype(object).itertuples(index=False, name=None)],
+        )
+        self._indexer(conn, table)
+
+    def lire(self, filepath):
+        """Lecture sur une connexion simple, sans transaction d'écriture (la table est préparée une fois)"""
+        table = self._table(filepath)
+        cle = (self._base(filepath), table)
+        if cle not in self._preparees:
+            with self._verrou:
+                if cle not in self._preparees:
+                    with self._transaction(filepath) as conn:
+                        self._preparer(conn, filepath)
+                    self._preparees.add(cle)
+        with closing(self._connexion(filepath)) as conn:
+            if not self._colonnes(conn, table):
+                return None
+            return pd.read_sql_query(f'SELECT * FROM "{table}" ORDER BY rowid', conn)
+
+    def _ecrire(self, conn, filepath, df):
+        table = self._table(filepath)
+        if df.empty and self._colonnes(conn, table):
+            # Vider la table en conservant ses types de colonnes
+            conn.execute(f'DELETE FROM "{table}"')
+            return None
+        self._creer_table(conn, table, df)
+        return None
+
+    def _ajouter_colonnes(self, conn, table, colonnes):
+        existantes = self._colonnes(conn, table)
+        for col in colonnes:
+            if col not in existantes:
+                conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{col}"')
+
+    def _inserer(self, conn, filepath, lignes):
+        if not lignes:
+            return 0
+        table = self._preparer(conn, filepath)
+        if not self._colonnes(conn, table):
+            self._creer_table(conn, table, pd.DataFrame(lignes))
+            return len(lignes)
+        colonnes = list(dict.fromkeys(c for ligne in lignes for c in ligne))
+        self._ajouter_colonnes(conn, table, colonnes)
+        liste = ", ".join(f'"{c}"' for c in colonnes)
+        marques = ", ".join("?" for _ in colonnes)
+        conn.executemany(
+            f'INSERT INTO "{table}" ({liste}) VALUES ({marques})',
+            [[_valeur_sql(ligne.get(c)) for c in colonnes] for ligne in lignes],
+        )
+        return len(lignes)
+
+    def _egalite(self, colonne, val):
+        """Condition "colonne = ?" ; une date est comparée par datetime(), qu'elle soit stockée avec ou sans heure"""
+        return f'datetime("{colonne}") = datetime(?)' if _est_date(val) else f'"{colonne}" = ?'
+
+    def _where(self, criteres):
+        clause = " AND ".join(self._egalite(c, v) for c, v in criteres.items())
+        return clause, [_valeur_sql(v) for v in criteres.values()]
+
+    def _mettre_a_jour(self, conn, filepath, criteres, valeurs):
+        table = self._preparer(conn, filepath)
+        if not self._colonnes(conn, table):
+            return 0
+        self._ajouter_colonnes(conn, table, valeurs)
+        affect = ", ".join(f'"{c}" = ?' for c in valeurs)
+        clause, params = self._where(criteres)
+        cur = conn.execute(
+            f'UPDATE "{table}" SET {affect} WHERE {clause}',
+            [_valeur_sql(v) for v in valeurs.values()] + params,
+        )
+        return cur.rowcount
+
+    def _supprimer(self, conn, filepath, criteres):
+        table = self._preparer(conn, filepath)
+        if not self._colonnes(conn, table):
+            return 0
+        clause, params = self._where(criteres)
+        return conn.execute(f'DELETE FROM "{table}" WHERE {clause}', params).rowcount
+
+    def _supprimer_cles(self, conn, filepath, colonnes, cles):
+        table = self._preparer(conn, filepath)
+        if not cles or not self._colonnes(conn, table):
+            return 0
+        clause = " AND ".join(self._egalite(c, v) for c, v in zip(colonnes, cles[0]))
+        return conn.executemany(
+            f'DELETE FROM "{table}" WHERE {clause}', [[_valeur_sql(v) for v in cle] for cle in cles]
+        ).rowcount
+
+    def _remplacer(self, conn, filepath, criteres, ligne):
+        n = self._mettre_a_jour(conn, filepath, criteres, ligne)
+        if n == 0:
+            self._inserer(conn, filepath, [ligne])
+        return n
+
+    def appliquer(self, operations, filepath):
+        """Applique une suite de mutations [(nom, *args)] dans une seule transaction"""
+        with self._transaction(filepath) as conn:
+            return [getattr(self, "_" + nom)(conn, filepath, *args) for nom, *args in operations]
+
+
+_STOCKAGES = {"csv": StockageCSV, "sqlite": StockageSQLite}
+_stockage = None
+
+
+def get_stockage():
+    """Renvoie le stockage actif (choisi par la variable PLATEFORME_STOCKAGE)"""
+    global _stockage
+    if _stockage is None:
+        if STOCKAGE not in _STOCKAGES:
+            raise ValueError(f"Stockage inconnu : {STOCKAGE} (attendu : {', '.join(_STOCKAGES)})")
+        _stockage = _STOCKAGES[STOCKAGE]()
+    return _stockage
+
+
+# --- Cache mémoire partagé ---
+class CacheLRU:
+    """
+    Cache mémoire borné (LRU) : chaque entrée est valable pour une version
+    donnée des fichiers dont elle dépend.
+    """
+
+    def __init__(self, max_octets):
+        self.max_octets = max_octets
+        self.taille = 0
+        self._entrees = OrderedDict()  # cle -> (version, valeur, taille, chemins)
+        self._verrou = threading.Lock()
+
+    def get(self, cle, version):
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is None or entree[0] != version:
+                return None
+            self._entrees.move_to_end(cle)
+            return entree[1]
+
+    def put(self, cle, version, valeur, taille, chemins):
+        with self._verrou:
+            ancienne = self._entrees.pop(cle, None)
+            if ancienne is not None:
+                self.taille -= ancienne[2]
+            if taille > self.max_octets:
+                return
+            self._entrees[cle] = (version, valeur, taille, chemins)
+            self.taille += taille
+            while self.taille > self.max_octets:
+                _, (_, _, t, _) = self._entrees.popitem(last=False)
+                self.taille -= t
+
+    def invalider(self, filepath):
+        with self._verrou:
+            for cle in [c for c, e in self._entrees.items() if filepath in e[3]]:
+                self.taille -= self._entrees.pop(cle)[2]
+
+    def vider(self):
+        with self._verrou:
+            self._entrees.clear()
+            self.taille = 0
+
+
+_cache = CacheLRU(CACHE_MAX_MO * 1024 * 1024)
+# Compteur d'écritures par fichier : rend une écriture visible même si le
+# mtime du système de fichiers est trop grossier pour la distinguer
+_generations = {}
+
+
+def _chemin(filepath):
+    return os.path.abspath(filepath)
+
+
+def _taille(valeur):
+    """Estimation de l'empreinte mémoire d'une valeur mise en cache"""
+    if isinstance(valeur, pd.DataFrame):
+        return int(valeur.memory_usage(deep=True).sum())
+    if isinstance(valeur, pd.Series):
+        return int(valeur.memory_usage(deep=True))
+    if hasattr(valeur, "__len__"):
+        return sys.getsizeof(valeur) + 200 * len(valeur)
+    return sys.getsizeof(valeur)
+
+
+def version_fichier(filepath):
+    """Version courante d'un fichier de données (stockage + écritures locales)"""
+    chemin = _chemin(filepath)
+    return (get_stockage().version(filepath), _generations.get(chemin, 0))
+
+
+def invalider_cache(filepath):
+    """Oublie tout ce qui a été calculé à partir de `filepath`"""
+    chemin = _chemin(filepath)
+    _generations[chemin] = _generations.get(chemin, 0) + 1
+    _cache.invalider(chemin)
+
+
+def vider_cache():
+    """Vide entièrement le cache mémoire"""
+    _cache.vider()
+
+
+def cache_par_version(nom, chemins, construire):
+    """
+    Renvoie construire() mémorisé tant qu'aucun des fichiers `chemins` n'a changé
+    (mtime, taille, ou écriture via ce module). La valeur renvoyée est partagée :
+    l'appelant ne doit pas la modifier.
+    """
+    if isinstance(chemins, str):
+        chemins = (chemins,)
+    absolus = tuple(_chemin(c) for c in chemins)
+    cle = (nom, absolus)
+    version = tuple(version_fichier(c) for c in chemins)
+    valeur = _cache.get(cle, version)
+    if valeur is None:
+        valeur = construire()
+        _cache.put(cle, version, valeur, _taille(valeur), absolus)
+    return valeur
+
+
+# --- Écritures coordonnées ---
+# Toutes les mutations passent par un thread écrivain unique. Les mutations
+# en attente sur un même fichier sont appliquées ensemble, en une écriture
+# atomique (CSV) ou une transaction (SQLite) ; l'appelant attend la fin de
+# la sienne, ce qui garantit la lecture de ses propres écritures.
+_verrous = {}
+_verrous_garde = threading.Lock()
+
+
+def verrou_fichier(filepath):
+    """Verrou (réentrant) propre à un fichier de données"""
+    chemin = _chemin(filepath)
+    with _verrous_garde:
+        verrou = _verrous.get(chemin)
+        if verrou is None:
+            verrou = _verrous[chemin] = threading.RLock()
+        return verrou
+
+
+class Ecrivain:
+    """Thread unique d'écriture : regroupe les mutations en attente par fichier"""
+
+    def __init__(self):
+        self._attente = OrderedDict()  # chemin -> (filepath, [(operation, future)])
+        self._condition = threading.Condition()
+        self._en_cours = 0
+        self._thread = None
+
+    def soumettre(self, filepath, operation):
+        """Met une mutation (nom, *args) en file ; renvoie un Future de son résultat"""
+        futur = Future()
+        with self._condition:
+            self._attente.setdefault(_chemin(filepath), (filepath, []))[1].append((operation, futur))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._boucle, name="ecrivain-donnees", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return futur
+
+    def soumettre_lot(self, filepath, operations):
+        """
+        Met plusieurs mutations en file d'un seul coup : elles sont appliquées
+        dans le même lot (une écriture ou une transaction). Renvoie leurs Futures.
+        """
+        futurs = [Future() for _ in operations]
+        with self._condition:
+            lot = self._attente.setdefault(_chemin(filepath), (filepath, []))[1]
+            lot.extend(zip(operations, futurs))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._boucle, name="ecrivain-donnees", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return futurs
+
+    def _boucle(self):
+        while True:
+            with self._condition:
+                while not self._attente:
+                    self._condition.wait()
+                _, (filepath, lot) = self._attente.popitem(last=False)
+                self._en_cours += 1
+            try:
+                self._appliquer(filepath, lot)
+            finally:
+                with self._condition:
+                    self._en_cours -= 1
+                    self._condition.notify_all()
+
+    def _appliquer(self, filepath, lot):
+        try:
+            with verrou_fichier(filepath):
+                try:
+                    resultats = get_stockage().appliquer([op for op, _ in lot], filepath)
+                finally:
+                    invalider_cache(filepath)
+        except BaseException as erreur:
+            for _, futur in lot:
+                futur.set_exception(erreur)
+            return
+        for (_, futur), resultat in zip(lot, resultats):
+            futur.set_result(resultat)
+
+    def attendre(self, timeout=None):
+        """Attend que toutes les mutations en file soient écrites"""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._attente and not self._en_cours, timeout)
+
+
+_ecrivain = Ecrivain()
+atexit.register(_ecrivain.attendre, 30)
+
+
+def _muter(filepath, *operation):
+    with mesurer(f"{operation[0]} {os.path.basename(filepath)}"):
+        return _ecrivain.soumettre(filepath, operation).result()
+
+
 def load_csv(filepath, columns=None):
     """
     Charge un fichier CSV en DataFrame pandas.
     Si le fichier n'existe pas ou si certaines colonnes sont manquantes,
     un DataFrame vide avec les colonnes spécifiées est retourné.
+    Le contenu est mis en cache tant que le fichier ne change pas.
     """
-    if os.path.exists(filepath):
-        df = pd.read_csv(filepath)
+    with mesurer(f"load_csv {os.path.basename(filepath)}"):
+        df = cache_par_version("csv", filepath, lambda: get_stockage().lire(filepath))
+    if df is not None:
+        df = df.copy()
         if columns:
             # S'assurer que toutes les colonnes demandées sont présentes
             for col in columns:
@@ -21,7 +652,45 @@ def load_csv(filepath, columns=None):
 
 def save_csv(df, filepath):
     """
-    Sauvegarde un DataFrame en CSV (sans l’index).
+    Sauvegarde un DataFrame en CSV (sans l’index), de façon atomique.
+    """
+    _muter(filepath, "ecrire", df)
+
+def inserer_lignes(lignes, filepath):
+    """
+    Ajoute une ou plusieurs lignes (dicts) à une table sans la réécrire.
+    """
+    if isinstance(lignes, dict):
+        lignes = [lignes]
+    return _muter(filepath, "inserer", list(lignes))
+
+def mettre_a_jour_lignes(criteres, valeurs, filepath):
+    """
+    Met à jour les lignes dont les colonnes valent `criteres` ({colonne: valeur}).
+    Renvoie le nombre de lignes modifiées.
+    """
+    return _muter(filepath, "mettre_a_jour", criteres, valeurs)
+
+def supprimer_lignes(criteres, filepath):
+    """
+    Supprime les lignes dont les colonnes valent `criteres` ({colonne: valeur}).
+    Renvoie le nombre de lignes supprimées.
+    """
+    return _muter(filepath, "supprimer", criteres)
+
+def appliquer_mutations(operations, filepath):
+    """
+    Applique plusieurs mutations [(nom, *args)] en un seul lot : une écriture
+    CSV ou une transaction SQLite, sans état intermédiaire visible. Par exemple
+    ("supprimer_cles", colonnes, [tuples]) puis ("inserer", lignes).
+    Renvoie le résultat de chacune.
+    """
+    with mesurer(f"lot {os.path.basename(filepath)}"):
+        return [f.result() for f in _ecrivain.soumettre_lot(filepath, list(operations))]
+
+def remplacer_ligne(criteres, ligne, filepath):
+    """
+    Met à jour la ligne identifiée par `criteres`, ou l'insère si elle n'existe pas
+    (en une seule mutation).
     """
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    df.to_csv(filepath, index=False)
+    _muter(filepath, "remplacer", criteres, ligne)
@@ -0,0 +1,76 @@
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from utils.io import load_csv, save_csv, inserer_lignes, cache_par_version
+
+# Instantané compacté + journal des feedbacks saisis depuis le dernier compactage
+FEEDBACKS_FILE = "data/feedbacks.csv"
+JOURNAL_FILE = "data/feedbacks_journal.csv"
+
+CLES_FEEDBACK = ["Athlete", "Seance", "Semaine"]
+HORODATAGE = "Horodatage"
+SEUIL_COMPACTAGE = 500
+
+# Les ajouts au journal et le compactage ne doivent pas se chevaucher. Le
+# verrou ne vaut que dans ce processus : l'application suppose un seul
+# processus Streamlit par dossier de données (sinon un ajout peut être perdu
+# pendant un compactage lancé par un autre processus).
+_verrou = threading.Lock()
+
+
+def journaliser_feedback(entree, journal=JOURNAL_FILE):
+    """
+    Ajoute un feedback en fin de journal (une ligne, sans réécriture).
+    Une correction est simplement un nouvel enregistrement plus récent.
+    """
+    ligne = dict(entree)
+    ligne[HORODATAGE] = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+    with _verrou:
+        inserer_lignes(ligne, journal)
+
+
+def _fusionner(instantane, journal):
+    """Garde le dernier enregistrement par (Athlete, Seance, Semaine)"""
+    df = pd.concat([instantane, journal], ignore_index=True)
+    if df.empty:
+        return df.drop(columns=[HORODATAGE], errors="ignore")
+    if HORODATAGE in df.columns:
+        df = df.sort_values(HORODATAGE, kind="stable", na_position="first")
+    cles = df[CLES_FEEDBACK].astype(str)
+    df = df[~cles.duplicated(keep="last")]
+    return df.drop(columns=[HORODATAGE], errors="ignore").reset_index(drop=True)
+
+
+def taille_journal(journal=JOURNAL_FILE):
+    """Nombre de lignes du journal, compté une fois par version du fichier"""
+    return cache_par_version("taille_journal", journal, lambda: len(load_csv(journal)))
+
+
+def lire_feedbacks(instantane=FEEDBACKS_FILE, journal=JOURNAL_FILE):
+    """
+    Renvoie les feedbacks à jour : instantané + journal, dernier enregistrement
+    par (Athlete, Seance, Semaine). Compacte le journal au-delà du seuil.
+    """
+    if taille_journal(journal) >= SEUIL_COMPACTAGE:
+        return compacter_feedbacks(instantane, journal)
+    fusion = cache_par_version(
+        "feedbacks", (instantane, journal),
+        lambda: _fusionner(load_csv(instantane), load_csv(journal))
+    )
+    return fusion.copy()
+
+
+def compacter_feedbacks(instantane=FEEDBACKS_FILE, journal=JOURNAL_FILE):
+    """
+    Replie le journal dans l'instantané puis vide le journal.
+    Renvoie les feedbacks compactés.
+    """
+    with _verrou:
+        df_journal = load_csv(journal)
+        df = _fusionner(load_csv(instantane), df_journal)
+        if not df_journal.empty:
+            save_csv(df, instantane)
+            save_csv(df_journal.iloc[0:0], journal)
+    return df
@@ -0,0 +1,200 @@
+import ast
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+from utils.io import load_csv, cache_par_version
+
+NB_ZONES = 7
+
+# Coefficient de charge par zone (charge d'un bloc = minutes x coefficient)
+COEFFICIENTS_ZONE = {
+    1: 1,
+    2: 2,
+    3: 3,
+    4: 4,
+    5: 5,
+    6: 6,
+    7: 7,
+}
+
+# Coefficients configurés : une ligne par version et par zone, la version
+# la plus récente fait foi (COEFFICIENTS_ZONE tant que le fichier est vide)
+CONFIG_ZONES_FILE = "data/config_zones.csv"
+COLONNES_CONFIG_ZONES = ["Version", "Date", "Zone", "Coefficient"]
+
+
+def coefficients_configures(config_file=CONFIG_ZONES_FILE):
+    """(version, {zone: coefficient}) en vigueur, une fois par version du fichier de configuration"""
+    def construire():
+        config = load_csv(config_file, COLONNES_CONFIG_ZONES)
+        config = config.assign(Version=pd.to_numeric(config["Version"], errors="coerce")).dropna(subset=["Version"])
+        if config.empty:
+            return 0, dict(COEFFICIENTS_ZONE)
+        version = int(config["Version"].max())
+        derniere = config[config["Version"] == version]
+        coefficients = dict(COEFFICIENTS_ZONE)
+        coefficients.update({int(z): float(c) for z, c in zip(derniere["Zone"], derniere["Coefficient"])})
+        return version, coefficients
+    return cache_par_version("coefficients_zone", config_file, construire)
+
+
+def charge_bloc(minutes, coefficient):
+    """
+    Charge d'un bloc : minutes x coefficient, arrondie à l'entier. Règle
+    unique (scalaire ou vectorisée) : la charge d'une séance est la somme
+    des charges arrondies de ses blocs.
+    """
+    return np.rint(np.multiply(minutes, coefficient))
+
+
+def _nombre(val, defaut):
+    try:
+        if val is None or val == "" or pd.isna(val):
+            return defaut
+        return float(val)
+    except (TypeError, ValueError):
+        return defaut
+
+
+def extraire_zone_num(bloc):
+    """Numéro de zone d'un bloc (dict) : Zone_num, sinon le chiffre du libellé"""
+    zone_num = bloc.get("Zone_num")
+    if zone_num is None or (isinstance(zone_num, float) and pd.isna(zone_num)):
+        match = re.search(r"\d", str(bloc.get("Zone", "")))
+        return int(match.group()) if match else None
+    try:
+        return int(zone_num)
+    except (TypeError, ValueError):
+        return None
+
+
+def duree_repetitions(bloc):
+    """(Durée, Répétitions) d'un bloc (dict), 0 et 1 si absentes"""
+    duree = _nombre(bloc.get("Durée"), 0)
+    repetitions = int(_nombre(bloc.get("Répétitions"), 1))
+    return (int(duree) if duree.is_integer() else duree), repetitions
+
+
+class Bloc:
+    """Bloc d'une séance, avec minutes et charge précalculées"""
+
+    __slots__ = ("type", "duree", "repetitions", "zone", "zone_num", "description", "minutes", "charge")
+
+    def __init__(self, type_, duree, repetitions, zone, zone_num, description="", coefficients=COEFFICIENTS_ZONE):
+        self.type = type_
+        self.duree = duree
+        self.repetitions = repetitions
+        self.zone = zone
+        self.zone_num = zone_num
+        self.description = description
+        self.minutes = duree * repetitions
+        self.charge = int(charge_bloc(self.minutes, coefficients.get(zone_num, 0)))
+
+    @classmethod
+    def depuis_dict(cls, bloc, coefficients=COEFFICIENTS_ZONE):
+        duree, repetitions = duree_repetitions(bloc)
+        description = bloc.get("Description") or ""
+        return cls(
+            bloc.get("Type", ""), duree, repetitions, bloc.get("Zone", ""),
+            extraire_zone_num(bloc), description if isinstance(description, str) else "",
+            coefficients,
+        )
+
+    def __repr__(self):
+        return f"Bloc({self.repetitions}x{self.duree}min Zone {self.zone_num}, {self.type})"
+
+
+class Seance:
+    """Séance structurée : blocs typés, minutes par zone, charge et volume"""
+
+    __slots__ = ("nom", "blocs", "charge_totale", "volume_total", "minutes_par_zone")
+
+    def __init__(self, nom, blocs, charge_totale=None, volume_total=None):
+        self.nom = nom
+        self.blocs = tuple(blocs)
+        minutes = [0.0] * NB_ZONES
+        for b in self.blocs:
+            if b.zone_num is not None and 1 <= b.zone_num <= NB_ZONES:
+                minutes[b.zone_num - 1] += b.minutes
+        # minutes_par_zone[0] = Zone 1, ..., minutes_par_zone[6] = Zone 7
+        self.minutes_par_zone = tuple(minutes)
+        self.charge_totale = charge_totale if charge_totale is not None else sum(b.charge for b in self.blocs)
+        self.volume_total = volume_total if volume_total is not None else sum(b.minutes for b in self.blocs)
+
+    def __repr__(self):
+        return f"Seance({self.nom!r}, {len(self.blocs)} blocs, charge {self.charge_totale}, {self.volume_total} min)"
+
+
+def lire_blocs(valeur, coefficients=COEFFICIENTS_ZONE):
+    """
+    Convertit la colonne Blocs (JSON, liste de dicts, ou blocs déjà typés)
+    en tuple de Bloc. Renvoie un tuple vide si la valeur est illisible.
+    """
+    if isinstance(valeur, Seance):
+        return valeur.blocs
+    if valeur is None or isinstance(valeur, float):
+        return ()
+    if isinstance(valeur, str):
+        try:
+            valeur = json.loads(valeur)
+        except ValueError:
+            try:
+                valeur = ast.literal_eval(valeur)
+            except (ValueError, SyntaxError):
+                return ()
+    if not isinstance(valeur, (list, tuple)):
+        return ()
+    return tuple(b if isinstance(b, Bloc) else Bloc.depuis_dict(b, coefficients)
+                 for b in valeur if isinstance(b, (Bloc, dict)))
+
+
+def construire_seances(df, coefficients=COEFFICIENTS_ZONE):
+    """Construit {nom: Seance} depuis le DataFrame de seances_struct.csv"""
+    seances = {}
+    if df.empty or "Nom" not in df.columns:
+        return seances
+    charges = df["Charge totale"] if "Charge totale" in df.columns else pd.Series(None, index=df.index)
+    volumes = df["Volume total"] if "Volume total" in df.columns else pd.Series(None, index=df.index)
+    blocs = df["Blocs"] if "Blocs" in df.columns else pd.Series(None, index=df.index)
+    for nom, b, charge, volume in zip(df["Nom"], blocs, charges, volumes):
+        if pd.isna(nom) or nom in seances:
+            continue
+        seances[nom] = Seance(
+            nom, lire_blocs(b, coefficients),
+            charge_totale=None if pd.isna(charge) else charge,
+            volume_total=None if pd.isna(volume) else volume,
+        )
+    return seances
+
+
+def charger_seances(filepath, config_file=CONFIG_ZONES_FILE):
+    """
+    Renvoie {nom: Seance} pour seances_struct.csv, construit une seule fois par
+    version du fichier et des coefficients de zone. Le dictionnaire est
+    partagé : ne pas le modifier.
+    """
+    return cache_par_version(
+        "seances", (filepath, config_file),
+        lambda: construire_seances(load_csv(filepath), coefficients_configures(config_file)[1])
+    )
+
+
+def tableau_seances(seances_modele):
+    """DataFrame (Seance, Charge totale, Volume total) depuis le modèle"""
+    return pd.DataFrame({
+        "Seance": list(seances_modele),
+        "Charge totale": pd.to_numeric([s.charge_totale for s in seances_modele.values()], errors="coerce"),
+        "Volume total": pd.to_numeric([s.volume_total for s in seances_modele.values()], errors="coerce"),
+    })
+
+
+def charger_tableau_seances(filepath, config_file=CONFIG_ZONES_FILE):
+    """tableau_seances() de seances_struct.csv, une fois par version du fichier et des coefficients"""
+    return cache_par_version(
+        "tableau_seances", (filepath, config_file),
+        lambda: tableau_seances(charger_seances(filepath, config_file))
+    )
+
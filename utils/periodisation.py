@@ -0,0 +1,163 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from utils.modele import NB_ZONES
+from utils.calculs import regrouper_zone
+from utils.profilage import mesurer
+
+JOURS = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche"]
+ZONES_BASSES = [z for z in range(1, NB_ZONES + 1) if regrouper_zone(z) == "basse"]
+
+
+# --- Courbe de charge cible ---
+def courbe_charge(charge_depart, nb_semaines=16, progression=0.08, semaines_montee=3, decharge=0.7):
+    """
+    Charge totale visée semaine par semaine : `semaines_montee` semaines en
+    hausse de `progression`, puis une semaine de décharge (x `decharge`) ;
+    chaque cycle repart un palier au-dessus du précédent.
+    """
+    cycle = semaines_montee + 1
+    semaines = np.arange(nb_semaines)
+    bloc, position = semaines // cycle, semaines % cycle
+    montee = charge_depart * (1 + progression) ** (bloc + position)
+    recup = charge_depart * (1 + progression) ** (bloc + semaines_montee - 1) * decharge
+    return np.where(position == semaines_montee, recup, montee).round()
+
+
+# --- Bibliothèque de séances ---
+def bibliotheque(seances_modele):
+    """
+    DataFrame (Seance, Charge totale, Volume total, Minutes basses) des
+    séances utilisables : charge positive et au moins un bloc en zone.
+    """
+    lignes = []
+    for nom, s in seances_modele.items():
+        minutes = sum(s.minutes_par_zone)
+        charge = pd.to_numeric(s.charge_totale, errors="coerce")
+        if minutes <= 0 or not charge > 0:
+            continue
+        lignes.append((nom, float(charge), minutes, sum(s.minutes_par_zone[z - 1] for z in ZONES_BASSES)))
+    return pd.DataFrame(lignes, columns=["Seance", "Charge totale", "Volume total", "Minutes basses"])
+
+
+# --- Choix des séances d'une semaine ---
+def _choisir_semaine(charges, ecarts, penalites, nb_seances, nb_charge, demi_ecart):
+    """
+    Programmation dynamique 0/1 sur les séances : etat (nombre de séances,
+    charge, écart de zone), tous deux discrétisés. valeur = pénalité d'usage
+    minimale pour atteindre l'état ; les états hors bornes sont élagués.
+    Renvoie, pour chaque état final à `nb_seances` séances, de quoi retrouver
+    les séances choisies.
+    """
+    nb_ecart = 2 * demi_ecart + 1
+    valeur = np.full((nb_seances + 1, nb_charge, nb_ecart), np.inf)
+    valeur[0, 0, demi_ecart] = 0
+    pris = []
+    for cb, db, p in zip(charges, ecarts, penalites):
+        # source (c, b, d) -> cible (c + 1, b + cb, d + db)
+        d_src = slice(max(0, -db), min(nb_ecart, nb_ecart - db))
+        d_dst = slice(max(0, db), min(nb_ecart, nb_ecart + db))
+        source = valeur[:-1, :nb_charge - cb, d_src] + p
+        cible = valeur[1:, cb:, d_dst]
+        mieux = source < cible
+        cible[mieux] = source[mieux]
+        pris.append(mieux)
+    return valeur[nb_seances], pris
+
+
+def _retrouver(pris, charges, ecarts, nb_seances, b, d):
+    """Remonte les décisions depuis l'état final (nb_seances, b, d) : indices des séances prises"""
+    choix, c = [], nb_seances
+    for i in range(len(pris) - 1, -1, -1):
+        if c == 0:
+            break
+        cb, db = charges[i], ecarts[i]
+        if b < cb or not (0 <= d - max(0, db) < pris[i].shape[2]) or not pris[i][c - 1, b - cb, d - max(0, db)]:
+            continue
+        choix.append(i)
+        c, b, d = c - 1, b - cb, d - db
+    return choix
+
+
+@mesurer("périodisation")
+def generer_periodisation(seances_modele, cibles, jours, part_basse=0.8, resolution=100,
+                          tolerance=0.1, pas_minutes=5, ecart_max=0.25, poids_zones=1.0):
+    """
+    Plan semaine par semaine : exactement une séance par jour disponible,
+    charge totale au plus près de la cible (sans la dépasser de plus de
+    `tolerance`) et part des minutes en zones basses proche de `part_basse`.
+    Les séances déjà utilisées sont pénalisées pour varier le plan.
+
+    Renvoie un DataFrame (Decalage semaine, Jour, Seance, Charge totale,
+    Volume total, Minutes basses) ; une semaine sans solution est absente.
+    """
+    biblio = bibliotheque(seances_modele)
+    jours = [j for j in JOURS if j in jours]
+    nb_seances = len(jours)
+    if biblio.empty or nb_seances == 0:
+        return pd.DataFrame(columns=["Decalage semaine", "Jour"] + list(biblio.columns))
+
+    charge = biblio["Charge totale"].to_numpy()
+    volume = biblio["Volume total"].to_numpy()
+    ecart = biblio["Minutes basses"].to_numpy() - part_basse * volume
+    minutes_par_charge = volume.sum() / charge.sum()
+    usage = np.zeros(len(biblio))
+    semaines = []
+
+    for semaine, cible in enumerate(cibles):
+        if not cible > 0:
+            continue
+        pas_charge = cible / resolution
+        nb_charge = int(math.floor(cible * (1 + tolerance) / pas_charge)) + 1
+        volume_vise = cible * minutes_par_charge
+        demi_ecart = max(1, int(math.ceil(volume_vise * ecart_max / pas_minutes)))
+
+        charges_u = np.rint(charge / pas_charge).astype(int)
+        ecarts_u = np.rint(ecart / pas_minutes).astype(int)
+        # Élagage : séances trop chargées à elles seules, puis séances
+        # équivalentes (même charge et même écart discrétisés) : on garde
+        # les nb_seances moins utilisées
+        candidats = pd.DataFrame({"cb": charges_u, "db": ecarts_u, "usage": usage})
+        candidats = candidats[(candidats["cb"] < nb_charge) & (candidats["db"].abs() <= 2 * demi_ecart)]
+        candidats = candidats.sort_values("usage", kind="stable").groupby(["cb", "db"]).head(nb_seances)
+        indices = candidats.index.to_numpy()
+        cb, db = candidats["cb"].to_numpy(), candidats["db"].to_numpy()
+
+        finale, pris = _choisir_semaine(cb, db, candidats["usage"].to_numpy(), nb_seances, nb_charge, demi_ecart)
+        if not np.isfinite(finale).any():
+            continue
+        # Coût d'un état final : écart relatif à la charge cible, écart à la
+        # répartition de zones visée, puis usage (départage)
+        b, d = np.meshgrid(np.arange(nb_charge), np.arange(-demi_ecart, demi_ecart + 1), indexing="ij")
+        cout = (np.abs(b * pas_charge - cible) / cible
+                + poids_zones * np.abs(d * pas_minutes) / volume_vise
+                + 1e-3 * finale)
+        b_final, d_final = np.unravel_index(np.argmin(cout), cout.shape)
+        choix = indices[_retrouver(pris, cb, db, nb_seances, b_final, d_final)]
+        usage[choix] += 1
+
+        # Séances les plus intenses sur les jours les plus espacés
+        choisies = biblio.iloc[choix].assign(
+            intensite=lambda df: 1 - df["Minutes basses"] / df["Volume total"]
+        ).sort_values("intensite", ascending=False).drop(columns="intensite")
+        ordre_jours = jours[::2] + jours[1::2]
+        choisies.insert(0, "Jour", ordre_jours[:len(choisies)])
+        choisies.insert(0, "Decalage semaine", semaine)
+        choisies["ordre"] = choisies["Jour"].map(JOURS.index)
+        semaines.append(choisies.sort_values("ordre").drop(columns="ordre"))
+
+    if not semaines:
+        return pd.DataFrame(columns=["Decalage semaine", "Jour"] + list(biblio.columns))
+    return pd.concat(semaines, ignore_index=True)
+
+
+def resume_periodisation(plan, cibles):
+    """Par semaine : charge visée, charge obtenue, écart (%) et part des minutes en zones basses (%)"""
+    par_semaine = plan.groupby("Decalage semaine")[["Charge totale", "Volume total", "Minutes basses"]].sum()
+    resume = pd.DataFrame({"Decalage semaine": range(len(cibles)), "Cible": np.asarray(cibles, dtype=float)})
+    resume = resume.merge(par_semaine, on="Decalage semaine", how="left")
+    resume["Ecart (%)"] = (resume["Charge totale"] - resume["Cible"]) / resume["Cible"] * 100
+    resume["Zones basses (%)"] = resume["Minutes basses"] / resume["Volume total"] * 100
+    return resume.drop(columns="Minutes basses")
@@ -0,0 +1,116 @@
+import pandas as pd
+
+from utils.io import load_csv, save_csv, inserer_lignes, appliquer_mutations
+from utils.calculs import charger_assignations, formater_semaine, formater_lundis, lundi_semaine
+from utils.agregats import FICHIERS, mettre_a_jour_agregats_lot
+
+# Plans types : une ligne par séance, dans l'ordre, avec le décalage (en
+# semaines) par rapport à la semaine de départ (0 = première semaine)
+MODELES_FILE = "data/modeles_plans.csv"
+COLONNES_MODELES = ["Modele", "Decalage semaine", "Seance"]
+CLES_ASSIGNATION = ["Athlete", "Seance", "Lundi"]
+
+
+def charger_modeles(filepath=MODELES_FILE):
+    modeles = load_csv(filepath, COLONNES_MODELES)
+    modeles["Decalage semaine"] = pd.to_numeric(modeles["Decalage semaine"], errors="coerce")
+    return modeles.dropna(subset=["Modele", "Seance", "Decalage semaine"])
+
+
+def enregistrer_modele(nom, lignes, filepath=MODELES_FILE):
+    """Remplace le plan type `nom` par `lignes` (DataFrame Decalage semaine, Seance), en une écriture"""
+    lignes = lignes.dropna(subset=["Seance", "Decalage semaine"])
+    nouveau = pd.DataFrame({
+        "Modele": nom,
+        "Decalage semaine": lignes["Decalage semaine"].astype(int).values,
+        "Seance": lignes["Seance"].values,
+    })
+    autres = load_csv(filepath, COLONNES_MODELES)
+    save_csv(pd.concat([autres[autres["Modele"] != nom], nouveau], ignore_index=True), filepath)
+
+
+def supprimer_modele(nom, filepath=MODELES_FILE):
+    modeles = load_csv(filepath, COLONNES_MODELES)
+    save_csv(modeles[modeles["Modele"] != nom], filepath)
+
+
+def deplier_modele(modele, athletes, lundi_debut):
+    """
+    Assignations produites par un plan type pour chaque athlète, à partir
+    de la semaine de `lundi_debut` : produit cartésien athlètes x lignes du plan.
+    """
+    lundi_debut = lundi_semaine([lundi_debut]).iloc[0]
+    plan = modele[["Decalage semaine", "Seance"]].reset_index(drop=True)
+    plan["Lundi"] = lundi_debut + pd.to_timedelta(plan["Decalage semaine"].astype(int) * 7, unit="D")
+    plan = plan.merge(pd.DataFrame({"Athlete": list(athletes)}), how="cross")
+    libelles = {l: formater_semaine(l) for l in plan["Lundi"].unique()}
+    return pd.DataFrame({
+        "Athlete": plan["Athlete"],
+        "Seance": plan["Seance"],
+        "Semaine": plan["Lundi"].map(libelles),
+        "Lundi": plan["Lundi"],
+    })
+
+
+def anti_jointure(nouvelles, existantes, cles=CLES_ASSIGNATION):
+    """Lignes de `nouvelles` absentes de `existantes` (et sans doublon entre elles)"""
+    nouvelles = nouvelles.drop_duplicates(subset=cles)
+    fusion = nouvelles.merge(existantes[cles].drop_duplicates(), on=cles, how="left", indicator=True)
+    return fusion[fusion["_merge"] == "left_only"].drop(columns="_merge").reset_index(drop=True)
+
+
+def appliquer_modele(modele, athletes, lundi_debut, assign_file=FICHIERS["assignations"], fichiers=FICHIERS):
+    """
+    Applique un plan type à plusieurs athlètes : les assignations déjà
+    présentes sont ignorées, les autres sont ajoutées en une seule écriture
+    puis la vue hebdomadaire est mise à jour. Renvoie (ajoutées, ignorées).
+    """
+    prevues = deplier_modele(modele, athletes, lundi_debut)
+    if prevues.empty:
+        return 0, 0
+    nouvelles = anti_jointure(prevues, charger_assignations(assign_file))
+    if not nouvelles.empty:
+        a_ecrire = nouvelles.assign(Lundi=formater_lundis(nouvelles["Lundi"]).values)
+        inserer_lignes(a_ecrire.to_dict(orient="records"), assign_file)
+        mettre_a_jour_agregats_lot(nouvelles["Athlete"].unique(), nouvelles["Lundi"].unique(), fichiers)
+    return len(nouvelles), len(prevues) - len(nouvelles)
+
+
+# --- Édition groupée des assignations ---
+ACTIONS = ["Supprimer", "Déplacer", "Dupliquer"]
+
+
+def editer_assignations(selection, action, lundi_cible=None, assign_file=FICHIERS["assignations"],
+                        fichiers=FICHIERS):
+    """
+    Supprime, déplace ou duplique vers la semaine de `lundi_cible` les
+    assignations `selection` (Athlete, Seance, Lundi), en un seul lot
+    d'écriture. Une copie qui existerait déjà n'est pas recréée.
+    Renvoie (supprimées, ajoutées).
+    """
+    selection = selection[CLES_ASSIGNATION].drop_duplicates()
+    if selection.empty:
+        return 0, 0
+    selection = selection.assign(Lundi=lundi_semaine(selection["Lundi"]).values)
+    operations, touchees = [], set(selection["Lundi"])
+
+    if action in ("Supprimer", "Déplacer"):
+        cles = list(zip(selection["Athlete"], selection["Seance"], formater_lundis(selection["Lundi"])))
+        operations.append(("supprimer_cles", CLES_ASSIGNATION, cles))
+    if action in ("Déplacer", "Dupliquer"):
+        cible = lundi_semaine([lundi_cible]).iloc[0]
+        existantes = charger_assignations(assign_file)
+        if action == "Déplacer":
+            existantes = anti_jointure(existantes, selection)
+        copies = anti_jointure(selection.assign(Lundi=cible), existantes)
+        if not copies.empty:
+            operations.append(("inserer", copies.assign(
+                Semaine=formater_semaine(cible), Lundi=formater_lundis(copies["Lundi"]).values
+            )[["Athlete", "Seance", "Semaine", "Lundi"]].to_dict(orient="records")))
+        touchees.add(cible)
+
+    if not operations:
+        return 0, 0
+    resultats = dict(zip([op[0] for op in operations], appliquer_mutations(operations, assign_file)))
+    mettre_a_jour_agregats_lot(selection["Athlete"].unique(), list(touchees), fichiers)
+    return resultats.get("supprimer_cles", 0), resultats.get("inserer", 0)
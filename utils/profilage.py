@@ -0,0 +1,136 @@
+import atexit
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import ContextDecorator
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+import numpy as np
+import pandas as pd
+
+# --- Mesure des temps d'exécution ---
+# Chaque mesure est rattachée à l'exécution (rerun Streamlit) en cours dans
+# le thread, gardée en mémoire pour les percentiles et journalisée dans
+# logs/performance.log (fichier tournant) pour une analyse hors ligne.
+ACTIF = os.environ.get("PLATEFORME_PROFILAGE", "1") != "0"
+# Chemin relatif résolu depuis la racine du projet, quel que soit le dossier courant
+RACINE_PROJET = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOURNAL_PERF = os.environ.get("PLATEFORME_JOURNAL_PERF", os.path.join("logs", "performance.log"))
+if JOURNAL_PERF:
+    JOURNAL_PERF = os.path.join(RACINE_PROJET, JOURNAL_PERF)
+MAX_MESURES = 20000
+
+_mesures = deque(maxlen=MAX_MESURES)  # (execution, section, durée en ms)
+_local = threading.local()
+_compteur = itertools.count(1)
+_verrou = threading.Lock()
+_logger = logging.getLogger("plateforme.performance")
+_ecouteur = None
+
+
+def _configurer_journal():
+    """Écriture du journal dans un thread dédié : le rerun ne touche pas au disque"""
+    global _ecouteur
+    with _verrou:
+        if _ecouteur is not None or not JOURNAL_PERF:
+            return
+        try:
+            os.makedirs(os.path.dirname(JOURNAL_PERF) or ".", exist_ok=True)
+            fichier = RotatingFileHandler(JOURNAL_PERF, maxBytes=1_000_000, backupCount=5, encoding="utf-8")
+        except OSError:
+            _logger.addHandler(logging.NullHandler())
+            _ecouteur = False
+            return
+        fichier.setFormatter(logging.Formatter("%(asctime)s\t%(message)s"))
+        file_attente = queue.SimpleQueue()
+        _logger.addHandler(QueueHandler(file_attente))
+        _logger.setLevel(logging.INFO)
+        _logger.propagate = False
+        _ecouteur = QueueListener(file_attente, fichier)
+        _ecouteur.start()
+        atexit.register(_ecouteur.stop)
+
+
+def nouvelle_execution(nom="rerun"):
+    """Démarre une nouvelle exécution pour le thread courant (début de script)"""
+    _local.execution = (next(_compteur), nom)
+    _local.mesures = []
+
+
+def execution_courante():
+    return getattr(_local, "execution", (0, ""))
+
+
+class mesurer(ContextDecorator):
+    """
+    Chronomètre une section, en bloc `with` ou en décorateur :
+
+        with mesurer("agrégats"):
+            ...
+
+        @mesurer("graphique zones")
+        def figure(...):
+    """
+
+    def __init__(self, section):
+        self.section = section
+
+    def _recreate_cm(self):
+        # En décorateur, une instance neuve par appel : les appels concurrents
+        # (sessions, threads) ou imbriqués ne partagent pas leur heure de début
+        return type(self)(self.section)
+
+    def __enter__(self):
+        self._debut = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        enregistrer(self.section, (time.perf_counter() - self._debut) * 1000)
+        return False
+
+
+def enregistrer(section, duree_ms):
+    """Enregistre une mesure (ms) pour l'exécution courante"""
+    if not ACTIF:
+        return
+    execution, nom = execution_courante()
+    _mesures.append((execution, section, duree_ms))
+    if hasattr(_local, "mesures"):
+        _local.mesures.append((section, duree_ms))
+    if _ecouteur is None:
+        _configurer_journal()
+    _logger.info("%s\t%d\t%s\t%.3f", nom, execution, section, duree_ms)
+
+
+def mesures_execution():
+    """Mesures de l'exécution en cours dans ce thread : DataFrame (Section, Appels, Total ms)"""
+    df = pd.DataFrame(getattr(_local, "mesures", []), columns=["Section", "Duree"])
+    return (df.groupby("Section", sort=False)["Duree"].agg(Appels="count", Total="sum")
+            .rename(columns={"Total": "Total ms"}).reset_index()
+            .sort_values("Total ms", ascending=False, ignore_index=True))
+
+
+def statistiques():
+    """
+    p50 / p95 par section sur les dernières mesures, toutes exécutions
+    confondues : DataFrame (Section, Mesures, p50 ms, p95 ms, Max ms).
+    """
+    colonnes = ["Section", "Mesures", "p50 ms", "p95 ms", "Max ms"]
+    if not _mesures:
+        return pd.DataFrame(columns=colonnes)
+    df = pd.DataFrame(list(_mesures), columns=["Execution", "Section", "Duree"])
+    lignes = []
+    for section, durees in df.groupby("Section", sort=False)["Duree"]:
+        valeurs = durees.to_numpy()
+        p50, p95 = np.percentile(valeurs, [50, 95])
+        lignes.append((section, len(valeurs), p50, p95, valeurs.max()))
+    return pd.DataFrame(lignes, columns=colonnes).sort_values("p95 ms", ascending=False, ignore_index=True)
+
+
+def reinitialiser():
+    """Oublie les mesures en mémoire (le fichier journal est conservé)"""
+    _mesures.clear()
@@ -0,0 +1,81 @@
+import re
+from bisect import bisect_left
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from utils.io import cache_par_version
+from utils.modele import charger_seances
+from utils.calculs import normaliser_texte
+from utils.profilage import mesurer
+
+MOT = re.compile(r"[a-z0-9]+")
+
+
+def tokeniser(texte):
+    """Mots (minuscules, sans accents) d'un texte"""
+    return MOT.findall(normaliser_texte(texte)) if isinstance(texte, str) else []
+
+
+# --- Index inversé de la bibliothèque de séances ---
+class IndexSeances:
+    """
+    Index inversé mot -> séances sur le nom, le type et la description des
+    blocs. Le vocabulaire est trié et les listes de séances sont mises bout
+    à bout dans cet ordre : tous les mots commençant par un préfixe forment
+    une tranche contiguë, trouvée par bisection.
+    """
+
+    __slots__ = ("noms", "vocabulaire", "debuts", "seances", "charges", "volumes")
+
+    def __init__(self, seances_modele):
+        self.noms = np.asarray(list(seances_modele), dtype=object)
+        par_mot = defaultdict(list)
+        for i, s in enumerate(seances_modele.values()):
+            textes = [s.nom] + [b.type for b in s.blocs] + [b.description for b in s.blocs]
+            for mot in set(tokeniser(" ".join(t for t in textes if isinstance(t, str)))):
+                par_mot[mot].append(i)
+        self.vocabulaire = sorted(par_mot)
+        tailles = [len(par_mot[m]) for m in self.vocabulaire]
+        self.debuts = np.concatenate([[0], np.cumsum(tailles)]).astype(np.int64)
+        self.seances = np.fromiter((i for m in self.vocabulaire for i in par_mot[m]), dtype=np.int32,
+                                   count=int(self.debuts[-1]))
+        modeles = list(seances_modele.values())
+        self.charges = pd.to_numeric(pd.Series([s.charge_totale for s in modeles], dtype=object),
+                                     errors="coerce").to_numpy(dtype=float)
+        self.volumes = pd.to_numeric(pd.Series([s.volume_total for s in modeles], dtype=object),
+                                     errors="coerce").to_numpy(dtype=float)
+
+    def _prefixe(self, prefixe):
+        """Masque des séances contenant un mot qui commence par `prefixe`"""
+        debut = bisect_left(self.vocabulaire, prefixe)
+        fin = bisect_left(self.vocabulaire, prefixe + "\uffff")
+        masque = np.zeros(len(self.noms), dtype=bool)
+        masque[self.seances[self.debuts[debut]:self.debuts[fin]]] = True
+        return masque
+
+    def rechercher(self, requete="", duree=None, charge=None):
+        """
+        Noms des séances dont le texte contient, pour chaque mot de la
+        requête, un mot qui commence par lui ; `duree` et `charge` sont des
+        bornes (min, max) incluses sur Volume total et Charge totale.
+        """
+        masque = np.ones(len(self.noms), dtype=bool)
+        for mot in tokeniser(requete):
+            masque &= self._prefixe(mot)
+        if duree is not None:
+            masque &= (self.volumes >= duree[0]) & (self.volumes <= duree[1])
+        if charge is not None:
+            masque &= (self.charges >= charge[0]) & (self.charges <= charge[1])
+        return self.noms[masque]
+
+
+def _construire(filepath):
+    with mesurer("index de recherche des séances"):
+        return IndexSeances(charger_seances(filepath))
+
+
+def charger_index_seances(filepath):
+    """IndexSeances de seances_struct.csv, construit une fois par version du fichier"""
+    return cache_par_version("index_recherche", filepath, lambda: _construire(filepath))
@@ -0,0 +1,105 @@
+"""
+Modèle de vue de l'espace athlète : index construits une fois par version
+des fichiers et partagés entre les sessions, pour qu'afficher une semaine
+coûte O(séances de la semaine) et non O(feedbacks).
+"""
+import pandas as pd
+
+from utils.io import load_csv, cache_par_version
+from utils.journal import lire_feedbacks
+from utils.modele import charger_seances
+from utils.calculs import charger_assignations, parser_lundis
+from utils.zones import tables_allures
+from utils.profilage import mesurer
+
+FICHIERS_ATHLETE = {
+    "athletes": "data/athletes.csv",
+    "assignations": "data/assignments.csv",
+    "seances": "data/seances_struct.csv",
+    "feedbacks": "data/feedbacks.csv",
+    "journal": "data/feedbacks_journal.csv",
+}
+
+
+# --- Index partagés ---
+def _indexer_feedbacks(feedbacks):
+    """{(Athlete, Seance, Lundi): dernier feedback (dict)}"""
+    if feedbacks.empty:
+        return {}
+    feedbacks = feedbacks.assign(Lundi=parser_lundis(feedbacks["Semaine"]).values).dropna(subset=["Lundi"])
+    return {(f["Athlete"], f["Seance"], f["Lundi"]): f for f in feedbacks.to_dict(orient="records")}
+
+
+def index_feedbacks(feedbacks_file, journal_file):
+    """Dernier feedback par (Athlete, Seance, Lundi), reconstruit quand l'instantané ou le journal change"""
+    def construire():
+        with mesurer("index des feedbacks"):
+            return _indexer_feedbacks(lire_feedbacks(feedbacks_file, journal_file))
+    return cache_par_version("index_feedbacks", (feedbacks_file, journal_file), construire)
+
+
+def index_athletes(athletes_file):
+    """{Nom: ligne de athletes.csv (dict)} ; le premier athlète d'un nom l'emporte"""
+    def construire():
+        athletes = load_csv(athletes_file)
+        if athletes.empty:
+            return {}
+        return {a["Nom"]: a for a in reversed(athletes.to_dict(orient="records"))}
+    return cache_par_version("index_athletes", athletes_file, construire)
+
+
+def _plan_athlete(nom_athlete, assign_file):
+    """Assignations de l'athlète triées par semaine et {Lundi: [séances]}"""
+    assignations = charger_assignations(assign_file)
+    plan = assignations[(assignations["Athlete"] == nom_athlete) & assignations["Lundi"].notna()]
+    plan = plan.sort_values("Lundi", kind="stable").reset_index(drop=True)
+    return plan, {lundi: list(groupe) for lundi, groupe in plan.groupby("Lundi", sort=True)["Seance"]}
+
+
+# --- Vue d'un athlète ---
+class VueAthlete:
+    """
+    Données de l'espace d'un athlète : informations, allures par zone,
+    assignations et séances par semaine, modèle des séances et feedbacks
+    indexés. Partagée : ne pas la modifier.
+    """
+
+    __slots__ = ("nom", "info", "allures", "assignations", "seances_par_semaine", "seances", "_feedbacks")
+
+    def __init__(self, nom, info, allures, assignations, seances_par_semaine, seances, feedbacks):
+        self.nom = nom
+        self.info = info
+        self.allures = allures
+        self.assignations = assignations
+        self.seances_par_semaine = seances_par_semaine
+        self.seances = seances
+        self._feedbacks = feedbacks
+
+    @property
+    def semaines(self):
+        return list(self.seances_par_semaine)
+
+    @property
+    def a_des_feedbacks(self):
+        return bool(self._feedbacks)
+
+    def feedback(self, seance, lundi):
+        """Dernier feedback de l'athlète pour cette séance et cette semaine, ou None"""
+        return self._feedbacks.get((self.nom, seance, pd.Timestamp(lundi)))
+
+
+def charger_vue_athlete(nom_athlete, fichiers=FICHIERS_ATHLETE):
+    """VueAthlete assemblée depuis les index en cache (chacun suit la version de ses fichiers)"""
+    plan, par_semaine = cache_par_version(
+        f"plan_athlete:{nom_athlete}", fichiers["assignations"],
+        lambda: _plan_athlete(nom_athlete, fichiers["assignations"])
+    )
+    return VueAthlete(
+        nom_athlete,
+        index_athletes(fichiers["athletes"]).get(nom_athlete, {}),
+        tables_allures(fichiers["athletes"]).get(nom_athlete, {}).get("allures", {}),
+        plan,
+        par_semaine,
+        charger_seances(fichiers["seances"]),
+        index_feedbacks(fichiers["feedbacks"], fichiers["journal"]),
+    )
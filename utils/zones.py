@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+from utils.io import load_csv, cache_par_version
+from utils.modele import NB_ZONES
+from utils.analytics import age
+
+# --- Définition des zones 1 à 7 ---
+# Bornes basses des zones 2 à 7, en fraction de la FC max et de la vitesse
+# de référence (allure 10 km) de l'athlète ; la zone 1 est tout ce qui est
+# en dessous de la première borne.
+BORNES_FC = np.array([0.65, 0.75, 0.82, 0.89, 0.94, 0.97])
+BORNES_VITESSE = np.array([0.75, 0.85, 0.92, 1.00, 1.07, 1.15])
+
+# --- Prédictions de course (Riegel) ---
+DISTANCES_KM = {"5km": 5.0, "10km": 10.0, "Semi": 21.097, "Marathon": 42.195}
+EXPOSANT_RIEGEL = 1.06
+
+
+def fc_max(athlete):
+    """FC max d'une ligne de athletes.csv : colonne "FC max", sinon estimée depuis l'âge (Tanaka)"""
+    valeur = pd.to_numeric(athlete.get("FC max"), errors="coerce")
+    if pd.notna(valeur) and valeur > 0:
+        return float(valeur)
+    annees = age(athlete.get("Date de naissance"))
+    return 208 - 0.7 * annees if annees is not None else None
+
+
+def predire_temps(athletes, exposant=EXPOSANT_RIEGEL):
+    """
+    Temps prédits (min) sur chaque distance de record, pour tous les athlètes
+    d'un coup : T2 = T1 x (D2 / D1)^exposant depuis chaque record connu (> 0),
+    en gardant la meilleure prédiction. Index : athlètes, colonnes
+    "Prediction <distance>" ; NaN pour un athlète sans record.
+    """
+    distances = np.array(list(DISTANCES_KM.values()))
+    records = athletes.reindex(columns=[f"Record {d}" for d in DISTANCES_KM])
+    records = records.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    records[~(records > 0)] = np.nan
+    # predictions[i, r, c] : temps de l'athlète i sur la distance c prédit depuis son record r
+    facteurs = (distances[None, :] / distances[:, None]) ** exposant
+    predictions = np.fmin.reduce(records[:, :, None] * facteurs[None, :, :], axis=1)
+    return pd.DataFrame(predictions, index=athletes.index, columns=[f"Prediction {d}" for d in DISTANCES_KM])
+
+
+def vitesse_reference(athlete):
+    """
+    Vitesse (m/s) sur 10 km de l'athlète : prédite depuis ses records, sinon
+    son allure 10 km ; None si elle est inconnue.
+    """
+    temps = predire_temps(pd.DataFrame([athlete]))["Prediction 10km"].iloc[0]
+    if not temps > 0:
+        temps = pd.to_numeric(athlete.get("Allure 10km"), errors="coerce") * 10
+    return 10_000 / (temps * 60) if pd.notna(temps) and temps > 0 else None
+
+
+def seuils_athlete(athlete):
+    """
+    Bornes des zones 2 à 7 de l'athlète : (FC en bpm, vitesse en m/s), chacune
+    None si elle ne peut pas être déterminée.
+    """
+    fc, vitesse = fc_max(athlete), vitesse_reference(athlete)
+    return (BORNES_FC * fc if fc else None,
+            BORNES_VITESSE * vitesse if vitesse else None)
+
+
+def zones_depuis_valeurs(valeurs, bornes):
+    """Numéro de zone (1 à NB_ZONES) de chaque valeur, 0 si elle est manquante"""
+    valeurs = np.asarray(valeurs, dtype=float)
+    zones = np.digitize(valeurs, bornes) + 1
+    return np.where(np.isfinite(valeurs), np.minimum(zones, NB_ZONES), 0)
+
+
+# --- Allures par zone ---
+def allures_bornes(vitesses):
+    """Allures (min/km) aux bornes des zones 2 à 7 : tableau (athlètes, 6), de la plus lente à la plus rapide"""
+    return 1000 / 60 / (np.asarray(vitesses, dtype=float)[:, None] * BORNES_VITESSE[None, :])
+
+
+def _format_allures(allures):
+    """Allures (min/km) -> "m:ss", "" si inconnue"""
+    secondes = np.rint(np.asarray(allures, dtype=float) * 60)
+    return np.array([f"{int(s) // 60}:{int(s) % 60:02d}" if np.isfinite(s) else "" for s in secondes], dtype=object)
+
+
+def calculer_tables_allures(athletes):
+    """
+    Pour tous les athlètes d'un coup : temps prédits (Riegel) et plage d'allure
+    de chaque zone ("4:35–4:50 /km", "> 5:40 /km" en zone 1, "< 3:30 /km" en
+    zone 7), dérivée de la vitesse 10 km prédite. Index : athlètes.
+    """
+    table = predire_temps(athletes)
+    bornes = allures_bornes(10_000 / (table["Prediction 10km"].to_numpy() * 60))
+    textes = [_format_allures(bornes[:, k]) for k in range(NB_ZONES - 1)]
+    connue = np.isfinite(bornes[:, 0])
+    table["Zone 1"] = np.where(connue, "> " + textes[0] + " /km", "")
+    for z in range(2, NB_ZONES):
+        table[f"Zone {z}"] = np.where(connue, textes[z - 1] + "–" + textes[z - 2] + " /km", "")
+    table[f"Zone {NB_ZONES}"] = np.where(connue, "< " + textes[-1] + " /km", "")
+    return table
+
+
+def tables_allures(athletes_file):
+    """
+    {Nom: {"predictions": {distance: minutes}, "allures": {zone: plage}}},
+    calculé une fois par version du fichier des athlètes. Partagé : ne pas
+    le modifier.
+    """
+    def construire():
+        athletes = load_csv(athletes_file)
+        if athletes.empty:
+            return {}
+        athletes = athletes.drop_duplicates("Nom")
+        table = calculer_tables_allures(athletes)
+        tables = {}
+        for nom, ligne in zip(athletes["Nom"], table.to_dict(orient="records")):
+            tables[nom] = {
+                "predictions": {d: ligne[f"Prediction {d}"] for d in DISTANCES_KM},
+                "allures": {z: ligne[f"Zone {z}"] for z in range(1, NB_ZONES + 1) if ligne[f"Zone {z}"]},
+            }
+        return tables
+    return cache_par_version("tables_allures", athletes_file, construire)